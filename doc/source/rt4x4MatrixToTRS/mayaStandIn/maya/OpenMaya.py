@@ -0,0 +1,1214 @@
+# -----------------------------------------------------------------------------------
+# Stand-in for maya.OpenMaya ( Python API 1.0 )
+#
+# Only the parts of the API the rt4x4MatrixToTRS plugins use are here. Attributes,
+# data blocks and plugs are plain Python objects so compute() can be run and timed
+# on a machine without Maya. The MTransformationMatrix decomposition follows the
+# Maya documentation and is used as the reference for the original compute().
+# -----------------------------------------------------------------------------------
+
+import math
+import struct
+
+_floatStruct = struct.Struct( "f" )
+
+# round a python float to the nearest single precision value like a C++ float
+def _f32(value):
+	return _floatStruct.unpack( _floatStruct.pack( value ) )[0]
+
+
+# -----------------------------------------------------------------------------------
+# status codes
+# -----------------------------------------------------------------------------------
+class MStatus(object):
+	kSuccess = 0
+	kFailure = 1
+	kUnknownParameter = 5
+
+kUnknownParameter = MStatus.kUnknownParameter
+
+
+class MSpace(object):
+	kInvalid = 0
+	kTransform = 1
+	kPreTransform = 2
+	kPostTransform = 3
+	kWorld = 4
+	kObject = kPreTransform
+
+
+class MTypeId(object):
+	def __init__(self, *args):
+		self._id = args[-1] if args else 0
+
+	def id(self):
+		return self._id
+
+	def __eq__(self, other):
+		return isinstance(other, MTypeId) and self._id == other._id
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash(self._id)
+
+
+# -----------------------------------------------------------------------------------
+# MObject, a handle to an attribute, a data object or a node
+# -----------------------------------------------------------------------------------
+class MObject(object):
+	def __init__(self, other=None):
+		self._ref = other._ref if isinstance(other, MObject) else other
+
+	def isNull(self):
+		return self._ref is None
+
+	def __eq__(self, other):
+		if isinstance(other, MObject):
+			return self._ref is other._ref
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return id(self._ref)
+
+	@property
+	def attr(self):
+		return self._ref
+
+
+# -----------------------------------------------------------------------------------
+# math types
+# -----------------------------------------------------------------------------------
+class MVector(object):
+	def __init__(self, x=0.0, y=0.0, z=0.0):
+		if isinstance(x, (MVector, MFloatVector)):
+			x, y, z = x.x, x.y, x.z
+		self.x, self.y, self.z = float(x), float(y), float(z)
+
+	def __getitem__(self, i):
+		return (self.x, self.y, self.z)[i]
+
+	def __add__(self, other):
+		return MVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+	def __sub__(self, other):
+		return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+	def __mul__(self, other):
+		if isinstance(other, MVector):
+			return self.x * other.x + self.y * other.y + self.z * other.z
+		return MVector(self.x * other, self.y * other, self.z * other)
+
+	def __xor__(self, other):
+		return MVector(self.y * other.z - self.z * other.y,
+			self.z * other.x - self.x * other.z,
+			self.x * other.y - self.y * other.x)
+
+	def length(self):
+		return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+	def normalize(self):
+		length = self.length()
+		if length > 0.0:
+			self.x, self.y, self.z = self.x / length, self.y / length, self.z / length
+		return self
+
+	def normal(self):
+		return MVector(self).normalize()
+
+	def __repr__(self):
+		return "MVector(%r, %r, %r)" % (self.x, self.y, self.z)
+
+
+class MFloatVector(object):
+	def __init__(self, x=0.0, y=0.0, z=0.0):
+		if isinstance(x, (MVector, MFloatVector)):
+			x, y, z = x.x, x.y, x.z
+		self.x, self.y, self.z = _f32(x), _f32(y), _f32(z)
+
+	def __getitem__(self, i):
+		return (self.x, self.y, self.z)[i]
+
+	def __add__(self, other):
+		return MFloatVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+	def __sub__(self, other):
+		return MFloatVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+	def __eq__(self, other):
+		return isinstance(other, MFloatVector) and (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __repr__(self):
+		return "MFloatVector(%r, %r, %r)" % (self.x, self.y, self.z)
+
+
+class MMatrix(object):
+	def __init__(self, other=None):
+		if other is None:
+			self._rows = [ [1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0] ]
+		elif isinstance(other, MMatrix):
+			self._rows = [ list(row) for row in other._rows ]
+		else:
+			self._rows = [ [ float(v) for v in row ] for row in other ]
+
+	def __call__(self, row, column):
+		return self._rows[row][column]
+
+	def __mul__(self, other):
+		a, b = self._rows, other._rows
+		return MMatrix( [ [ sum( a[i][k] * b[k][j] for k in range(4) ) for j in range(4) ] for i in range(4) ] )
+
+	def __eq__(self, other):
+		return isinstance(other, MMatrix) and self._rows == other._rows
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def isEquivalent(self, other, tolerance=1.0e-10):
+		return all( abs(self._rows[i][j] - other._rows[i][j]) <= tolerance for i in range(4) for j in range(4) )
+
+	def transpose(self):
+		return MMatrix( [ [ self._rows[j][i] for j in range(4) ] for i in range(4) ] )
+
+	def inverse(self):
+		# gauss-jordan with partial pivoting
+		a = [ list(row) + [ 1.0 if i == j else 0.0 for j in range(4) ] for i, row in enumerate(self._rows) ]
+		for col in range(4):
+			pivot = max( range(col, 4), key=lambda r: abs(a[r][col]) )
+			if a[pivot][col] == 0.0:
+				return MMatrix()
+			a[col], a[pivot] = a[pivot], a[col]
+			p = a[col][col]
+			a[col] = [ v / p for v in a[col] ]
+			for r in range(4):
+				if r != col and a[r][col] != 0.0:
+					f = a[r][col]
+					a[r] = [ v - f * w for v, w in zip(a[r], a[col]) ]
+		return MMatrix( [ row[4:] for row in a ] )
+
+	def __repr__(self):
+		return "MMatrix(%r)" % (self._rows,)
+
+MMatrix.identity = MMatrix()
+
+
+class MFloatMatrix(MMatrix):
+	pass
+
+
+# rotation matrix ( row vectors ) of a single axis
+def _axisMatrix(axis, angle):
+	c, s = math.cos(angle), math.sin(angle)
+	if axis == 0:
+		return [ [1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c] ]
+	if axis == 1:
+		return [ [c, 0.0, -s], [0.0, 1.0, 0.0], [s, 0.0, c] ]
+	return [ [c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0] ]
+
+def _mult3(a, b):
+	return [ [ a[i][0] * b[0][j] + a[i][1] * b[1][j] + a[i][2] * b[2][j] for j in range(3) ] for i in range(3) ]
+
+
+class MEulerRotation(object):
+	kXYZ = 0
+	kYZX = 1
+	kZXY = 2
+	kXZY = 3
+	kYXZ = 4
+	kZYX = 5
+
+	# the axes in the order they are applied
+	_axes = ( (0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0) )
+
+	def __init__(self, x=0.0, y=0.0, z=0.0, order=0):
+		if isinstance(x, MEulerRotation):
+			x, y, z, order = x.x, x.y, x.z, x.order
+		self.x, self.y, self.z, self.order = float(x), float(y), float(z), order
+
+	def _matrix3(self):
+		angles = (self.x, self.y, self.z)
+		i, j, k = self._axes[self.order]
+		return _mult3( _mult3( _axisMatrix(i, angles[i]), _axisMatrix(j, angles[j]) ), _axisMatrix(k, angles[k]) )
+
+	def asMatrix(self):
+		m = self._matrix3()
+		return MMatrix( [ m[0] + [0.0], m[1] + [0.0], m[2] + [0.0], [0.0, 0.0, 0.0, 1.0] ] )
+
+	@staticmethod
+	def _fromMatrix3(m, order):
+		# the column vector form of the matrix, c = m transposed
+		i, j, k = MEulerRotation._axes[order]
+		parity = 1.0 if (i, j, k) in ( (0, 1, 2), (1, 2, 0), (2, 0, 1) ) else -1.0
+		c = lambda r, s: m[s][r]
+		cy = math.sqrt( c(i, i) * c(i, i) + c(j, i) * c(j, i) )
+		if cy > 1.0e-10:
+			a = math.atan2( parity * c(k, j), c(k, k) )
+			b = math.atan2( -parity * c(k, i), cy )
+			g = math.atan2( parity * c(j, i), c(i, i) )
+		else:
+			a = math.atan2( -parity * c(j, k), c(j, j) )
+			b = math.atan2( -parity * c(k, i), cy )
+			g = 0.0
+		angles = [0.0, 0.0, 0.0]
+		angles[i], angles[j], angles[k] = a, b, g
+		return MEulerRotation( angles[0], angles[1], angles[2], order )
+
+	def reorder(self, order):
+		return MEulerRotation._fromMatrix3( self._matrix3(), order )
+
+	def reorderIt(self, order):
+		result = self.reorder(order)
+		self.x, self.y, self.z, self.order = result.x, result.y, result.z, result.order
+		return self
+
+	def asQuaternion(self):
+		return MQuaternion._fromMatrix3( self._matrix3() )
+
+	def __repr__(self):
+		return "MEulerRotation(%r, %r, %r, %r)" % (self.x, self.y, self.z, self.order)
+
+
+class MQuaternion(object):
+	def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+		if isinstance(x, MQuaternion):
+			x, y, z, w = x.x, x.y, x.z, x.w
+		self.x, self.y, self.z, self.w = float(x), float(y), float(z), float(w)
+
+	@staticmethod
+	def _fromMatrix3(m):
+		trace = m[0][0] + m[1][1] + m[2][2]
+		if trace > 0.0:
+			s = 0.5 / math.sqrt( trace + 1.0 )
+			return MQuaternion( (m[1][2] - m[2][1]) * s, (m[2][0] - m[0][2]) * s, (m[0][1] - m[1][0]) * s, 0.25 / s )
+		if m[0][0] > m[1][1] and m[0][0] > m[2][2]:
+			s = 2.0 * math.sqrt( 1.0 + m[0][0] - m[1][1] - m[2][2] )
+			return MQuaternion( 0.25 * s, (m[1][0] + m[0][1]) / s, (m[2][0] + m[0][2]) / s, (m[1][2] - m[2][1]) / s )
+		if m[1][1] > m[2][2]:
+			s = 2.0 * math.sqrt( 1.0 + m[1][1] - m[0][0] - m[2][2] )
+			return MQuaternion( (m[1][0] + m[0][1]) / s, 0.25 * s, (m[2][1] + m[1][2]) / s, (m[2][0] - m[0][2]) / s )
+		s = 2.0 * math.sqrt( 1.0 + m[2][2] - m[0][0] - m[1][1] )
+		return MQuaternion( (m[2][0] + m[0][2]) / s, (m[2][1] + m[1][2]) / s, 0.25 * s, (m[0][1] - m[1][0]) / s )
+
+	def _matrix3(self):
+		x, y, z, w = self.x, self.y, self.z, self.w
+		return [ [ 1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y + z * w), 2.0 * (x * z - y * w) ],
+			[ 2.0 * (x * y - z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z + x * w) ],
+			[ 2.0 * (x * z + y * w), 2.0 * (y * z - x * w), 1.0 - 2.0 * (x * x + y * y) ] ]
+
+	def asMatrix(self):
+		m = self._matrix3()
+		return MMatrix( [ m[0] + [0.0], m[1] + [0.0], m[2] + [0.0], [0.0, 0.0, 0.0, 1.0] ] )
+
+	def asEulerRotation(self):
+		return MEulerRotation._fromMatrix3( self._matrix3(), MEulerRotation.kXYZ )
+
+	def __repr__(self):
+		return "MQuaternion(%r, %r, %r, %r)" % (self.x, self.y, self.z, self.w)
+
+
+class MTransformationMatrix(object):
+	def __init__(self, matrix=None):
+		self._matrix = MMatrix(matrix)
+		m = self._matrix
+		x = MVector( m(0, 0), m(0, 1), m(0, 2) )
+		y = MVector( m(1, 0), m(1, 1), m(1, 2) )
+		z = MVector( m(2, 0), m(2, 1), m(2, 2) )
+
+		# matrix = scale * shear * rotate, orthogonalize X then Y then Z
+		sx = x.length()
+		x.normalize()
+		xy = x * y
+		y = y - x * xy
+		sy = y.length()
+		y.normalize()
+		if sy > 0.0:
+			xy /= sy
+		xz = x * z
+		yz = y * z
+		z = z - x * xz - y * yz
+		sz = z.length()
+		z.normalize()
+		if sz > 0.0:
+			xz /= sz
+			yz /= sz
+		if ( x ^ y ) * z < 0.0:
+			sx, sy, sz = -sx, -sy, -sz
+			x, y, z = x * -1.0, y * -1.0, z * -1.0
+
+		self._translate = MVector( m(3, 0), m(3, 1), m(3, 2) )
+		self._scale = [ sx, sy, sz ]
+		self._shear = [ xy, xz, yz ]
+		self._rotation = [ [x.x, x.y, x.z], [y.x, y.y, y.z], [z.x, z.y, z.z] ]
+
+	def asMatrix(self):
+		return MMatrix(self._matrix)
+
+	def getTranslation(self, space):
+		return MVector(self._translate)
+
+	def rotation(self):
+		return MQuaternion._fromMatrix3( self._rotation )
+
+	def eulerRotation(self):
+		return self.rotation().asEulerRotation()
+
+	def getScale(self, ptr, space):
+		ptr[0:3] = self._scale
+
+	def getShear(self, ptr, space):
+		ptr[0:3] = self._shear
+
+
+class MScriptUtil(object):
+	def __init__(self, *args):
+		self._values = [0.0] * 4
+
+	def createFromList(self, values, count):
+		self._values = [ float(v) for v in values[:count] ]
+
+	def createFromDouble(self, *values):
+		self._values = [ float(v) for v in values ]
+
+	def asDoublePtr(self):
+		return self._values
+
+	def asFloatPtr(self):
+		return self._values
+
+	@staticmethod
+	def getDoubleArrayItem(ptr, index):
+		return ptr[index]
+
+	@staticmethod
+	def getFloatArrayItem(ptr, index):
+		return ptr[index]
+
+	@staticmethod
+	def createMatrixFromList(values, matrix):
+		values = [ float(v) for v in values ]
+		matrix._rows = [ values[0:4], values[4:8], values[8:12], values[12:16] ]
+
+
+# -----------------------------------------------------------------------------------
+# attributes
+# -----------------------------------------------------------------------------------
+class _Attribute(object):
+	def __init__(self, kind, name, shortName, default=None, dataType=None):
+		self.kind = kind
+		self.name = name
+		self.shortName = shortName
+		self.default = default
+		self.dataType = dataType
+		self.children = []
+		self.parent = None
+		self.fields = []
+		self.array = False
+		self.flags = { "writable": True, "readable": True, "storable": True, "keyable": False,
+			"hidden": False, "connectable": True, "cached": True }
+
+	def __repr__(self):
+		return "<attribute %s>" % self.name
+
+
+class MFnData(object):
+	kInvalid = 0
+	kNumeric = 1
+	kPlugin = 2
+	kPluginGeometry = 3
+	kString = 4
+	kMatrix = 5
+	kStringArray = 6
+	kDoubleArray = 7
+	kIntArray = 9
+	kPointArray = 10
+	kVectorArray = 11
+	kComponentList = 12
+	kDynArrayAttrs = 19
+
+
+class MFnNumericData(object):
+	kInvalid = 0
+	kBoolean = 1
+	kByte = 2
+	kChar = 3
+	kShort = 4
+	k2Short = 5
+	k3Short = 6
+	kLong = 7
+	kInt = kLong
+	k2Long = 8
+	k3Long = 9
+	kFloat = 10
+	k2Float = 11
+	k3Float = 12
+	kDouble = 13
+	k2Double = 14
+	k3Double = 15
+
+
+class MFnAttribute(object):
+	def __init__(self, obj=None):
+		self._attr = obj.attr if isinstance(obj, MObject) else None
+
+	def _new(self, attr):
+		self._attr = attr
+		return MObject(attr)
+
+	def object(self):
+		return MObject(self._attr)
+
+	def name(self):
+		return self._attr.name
+
+	def setWritable(self, state):
+		self._attr.flags["writable"] = state
+
+	def setReadable(self, state):
+		self._attr.flags["readable"] = state
+
+	def setStorable(self, state):
+		self._attr.flags["storable"] = state
+
+	def setKeyable(self, state):
+		self._attr.flags["keyable"] = state
+
+	def setHidden(self, state):
+		self._attr.flags["hidden"] = state
+
+	def setConnectable(self, state):
+		self._attr.flags["connectable"] = state
+
+	def setCached(self, state):
+		self._attr.flags["cached"] = state
+
+	def setUsedAsFilename(self, state):
+		self._attr.flags["usedAsFilename"] = state
+
+	def setArray(self, state):
+		self._attr.array = state
+
+	def setUsesArrayDataBuilder(self, state):
+		self._attr.flags["usesArrayDataBuilder"] = state
+
+	def setDisconnectBehavior(self, behavior):
+		self._attr.flags["disconnectBehavior"] = behavior
+
+	def isWritable(self):
+		return self._attr.flags["writable"]
+
+	def isReadable(self):
+		return self._attr.flags["readable"]
+
+	def isStorable(self):
+		return self._attr.flags["storable"]
+
+	def isKeyable(self):
+		return self._attr.flags["keyable"]
+
+	def isArray(self):
+		return self._attr.array
+
+	kNothing = 0
+	kReset = 1
+	kDelete = 2
+
+
+class MFnNumericAttribute(MFnAttribute):
+	# create( name, shortName, child1, child2, child3 ) makes a compound of three children
+	def create(self, name, shortName, dataType, default=0.0, child3=None):
+		if isinstance( dataType, MObject ):
+			parent = _Attribute( "compound", name, shortName, dataType=MFnNumericData.k3Float )
+			for child in ( dataType, default, child3 ):
+				if child is not None:
+					child.attr.parent = parent
+					parent.children.append( child.attr )
+			return self._new(parent)
+		return self._new( _Attribute( "numeric", name, shortName, default, dataType ) )
+
+	def _createTriple(self, name, shortName, dataType, suffixes):
+		parent = _Attribute( "compound", name, shortName, dataType=dataType )
+		for suffix in suffixes:
+			child = _Attribute( "numeric", name + suffix, shortName + suffix.lower(), 0.0, MFnNumericData.kFloat )
+			child.parent = parent
+			parent.children.append(child)
+		return self._new(parent)
+
+	def createPoint(self, name, shortName):
+		return self._createTriple( name, shortName, MFnNumericData.k3Float, ("X", "Y", "Z") )
+
+	def createColor(self, name, shortName):
+		return self._createTriple( name, shortName, MFnNumericData.k3Float, ("R", "G", "B") )
+
+	def setDefault(self, *values):
+		if self._attr.children:
+			for child, value in zip(self._attr.children, values):
+				child.default = value
+		else:
+			self._attr.default = values[0]
+
+	def setMin(self, *values):
+		self._attr.flags["min"] = values
+
+	def setMax(self, *values):
+		self._attr.flags["max"] = values
+
+	def setSoftMin(self, *values):
+		self._attr.flags["softMin"] = values
+
+	def setSoftMax(self, *values):
+		self._attr.flags["softMax"] = values
+
+
+class MFnEnumAttribute(MFnAttribute):
+	def create(self, name, shortName, default=0):
+		return self._new( _Attribute( "enum", name, shortName, default ) )
+
+	def addField(self, name, value):
+		self._attr.fields.append( (name, value) )
+
+
+class MFnMatrixAttribute(MFnAttribute):
+	kFloat = 0
+	kDouble = 1
+
+	def create(self, name, shortName, matrixType=kDouble):
+		return self._new( _Attribute( "matrix", name, shortName, MMatrix(), matrixType ) )
+
+
+class MFnUnitAttribute(MFnAttribute):
+	kInvalid = 0
+	kAngle = 1
+	kDistance = 2
+	kTime = 3
+
+	def create(self, name, shortName, unitType, default=0.0):
+		if isinstance(default, MTime):
+			default = default.value()
+		return self._new( _Attribute( "unit", name, shortName, float(default), unitType ) )
+
+
+class MFnCompoundAttribute(MFnAttribute):
+	def create(self, name, shortName):
+		return self._new( _Attribute( "compound", name, shortName ) )
+
+	def addChild(self, child):
+		child.attr.parent = self._attr
+		self._attr.children.append( child.attr )
+
+
+class MFnTypedAttribute(MFnAttribute):
+	def create(self, name, shortName, dataType, default=None):
+		if isinstance(default, MObject):
+			default = default.attr
+		return self._new( _Attribute( "typed", name, shortName, default, dataType ) )
+
+
+# -----------------------------------------------------------------------------------
+# data objects used by typed attributes
+# -----------------------------------------------------------------------------------
+class _ArrayType(list):
+	def length(self):
+		return len(self)
+
+	def setLength(self, length):
+		if length < len(self):
+			del self[length:]
+		else:
+			self.extend( [ self._default() ] * (length - len(self)) )
+
+	def append(self, value):
+		list.append( self, self._convert(value) )
+
+	def set(self, value, index):
+		self[index] = self._convert(value)
+
+	def clear(self):
+		del self[:]
+
+	def _convert(self, value):
+		return value
+
+	@staticmethod
+	def _default():
+		return 0.0
+
+
+class MDoubleArray(_ArrayType):
+	def _convert(self, value):
+		return float(value)
+
+
+class MIntArray(_ArrayType):
+	def _convert(self, value):
+		return int(value)
+
+	@staticmethod
+	def _default():
+		return 0
+
+
+class MVectorArray(_ArrayType):
+	def _convert(self, value):
+		return MVector(value)
+
+	@staticmethod
+	def _default():
+		return MVector()
+
+
+class MMatrixArray(_ArrayType):
+	def _convert(self, value):
+		return MMatrix(value)
+
+	@staticmethod
+	def _default():
+		return MMatrix()
+
+
+class MStringArray(_ArrayType):
+	@staticmethod
+	def _default():
+		return ""
+
+
+class _DataFn(object):
+	_type = MFnData.kInvalid
+	_arrayType = list
+
+	def __init__(self, obj=None):
+		self._value = obj.attr if isinstance(obj, MObject) else None
+
+	def create(self, value=None):
+		self._value = self._arrayType( value if value is not None else [] )
+		return MObject( self._value )
+
+	def array(self):
+		return self._value
+
+	def set(self, value):
+		self._value[:] = value
+
+	def length(self):
+		return len(self._value)
+
+
+class MFnDoubleArrayData(_DataFn):
+	_type = MFnData.kDoubleArray
+	_arrayType = MDoubleArray
+
+
+class MFnIntArrayData(_DataFn):
+	_type = MFnData.kIntArray
+	_arrayType = MIntArray
+
+
+class MFnVectorArrayData(_DataFn):
+	_type = MFnData.kVectorArray
+	_arrayType = MVectorArray
+
+
+class MFnMatrixArrayData(_DataFn):
+	_arrayType = MMatrixArray
+
+
+class _StringData(object):
+	def __init__(self, value):
+		self.value = value
+
+
+class MFnStringData(object):
+	def __init__(self, obj=None):
+		self._data = obj.attr if isinstance(obj, MObject) else None
+
+	def create(self, value=""):
+		self._data = _StringData(value)
+		return MObject(self._data)
+
+	def string(self):
+		return self._data.value
+
+	def set(self, value):
+		self._data.value = value
+
+
+class MFnMatrixData(object):
+	def __init__(self, obj=None):
+		self._matrix = obj.attr if isinstance(obj, MObject) else None
+
+	def create(self, matrix=None):
+		self._matrix = MMatrix(matrix)
+		return MObject(self._matrix)
+
+	def matrix(self):
+		return MMatrix(self._matrix)
+
+	def set(self, matrix):
+		self._matrix._rows = MMatrix(matrix)._rows
+
+
+class _ArrayAttrs(dict):
+	pass
+
+
+class MFnArrayAttrsData(object):
+	kInvalid = 0
+	kVectorArray = 1
+	kDoubleArray = 2
+	kIntArray = 3
+	kStringArray = 4
+
+	def __init__(self, obj=None):
+		self._data = obj.attr if isinstance(obj, MObject) else None
+
+	def create(self):
+		self._data = _ArrayAttrs()
+		return MObject(self._data)
+
+	def _array(self, name, arrayType):
+		if name not in self._data:
+			self._data[name] = arrayType()
+		return self._data[name]
+
+	def vectorArray(self, name):
+		return self._array(name, MVectorArray)
+
+	def doubleArray(self, name):
+		return self._array(name, MDoubleArray)
+
+	def intArray(self, name):
+		return self._array(name, MIntArray)
+
+	def list(self):
+		return MStringArray( sorted(self._data) )
+
+	def count(self):
+		return max( [ len(v) for v in self._data.values() ] or [0] )
+
+
+# -----------------------------------------------------------------------------------
+# time and context
+# -----------------------------------------------------------------------------------
+class MTime(object):
+	kInvalid = 0
+	kFilm = 6
+	kNTSCFrame = 8
+	uiUnit = staticmethod( lambda: MTime.kFilm )
+
+	def __init__(self, value=0.0, unit=None):
+		self._value = float(value)
+
+	def value(self):
+		return self._value
+
+	def asUnits(self, unit):
+		return self._value
+
+
+class MDGContext(object):
+	def __init__(self, time=None):
+		self._time = time
+
+	def isNormal(self):
+		return self._time is None
+
+	def getTime(self):
+		return self._time
+
+MDGContext.fsNormal = MDGContext()
+
+
+# -----------------------------------------------------------------------------------
+# plugs, data handles and the data block
+# -----------------------------------------------------------------------------------
+class MPlug(object):
+	def __init__(self, node=None, attribute=None, index=None):
+		self._node = node
+		self._attr = attribute.attr if isinstance(attribute, MObject) else attribute
+		self._index = index
+
+	def _owner(self):
+		return self._node.attr if self._node is not None else None
+
+	def attribute(self):
+		return MObject(self._attr)
+
+	def node(self):
+		return self._node
+
+	def isNull(self):
+		return self._attr is None
+
+	def partialName(self, *args):
+		return self._attr.shortName
+
+	def name(self):
+		return self._attr.name
+
+	def __eq__(self, other):
+		if isinstance(other, MPlug):
+			return self._attr is other._attr and self._index == other._index
+		if isinstance(other, MObject):
+			return self._attr is other.attr
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash( (id(self._attr), self._index) )
+
+	def isChild(self):
+		return self._attr.parent is not None
+
+	def parent(self):
+		return MPlug( self._node, self._attr.parent )
+
+	def isCompound(self):
+		return bool(self._attr.children)
+
+	def numChildren(self):
+		return len(self._attr.children)
+
+	def child(self, index):
+		if isinstance(index, MObject):
+			return MPlug( self._node, index )
+		return MPlug( self._node, self._attr.children[index] )
+
+	def isArray(self):
+		return self._attr.array and self._index is None
+
+	def isElement(self):
+		return self._index is not None
+
+	def logicalIndex(self):
+		return self._index
+
+	def elementByLogicalIndex(self, index):
+		return MPlug( self._node, self._attr, index )
+
+	def _connections(self):
+		owner = self._owner()
+		return getattr(owner, "_standInConnections", set()) if owner is not None else set()
+
+	def isConnected(self):
+		return self._attr in self._connections()
+
+	def numConnectedChildren(self):
+		connections = self._connections()
+		return len( [ child for child in self._attr.children if child in connections ] )
+
+	isSource = isConnected
+	isDestination = isConnected
+
+	def _value(self, context=None):
+		owner = self._owner()
+		return owner._standInValue( self._attr, self._index, context )
+
+	def asFloat(self, context=None):
+		return _f32( self._value(context) )
+
+	def asDouble(self, context=None):
+		return float( self._value(context) )
+
+	def asBool(self, context=None):
+		return bool( self._value(context) )
+
+	def asShort(self, context=None):
+		return int( self._value(context) )
+
+	asInt = asShort
+
+	def asString(self, context=None):
+		value = self._value(context)
+		return value.value if isinstance(value, _StringData) else (value or "")
+
+	def asMObject(self, context=None):
+		return MObject( self._value(context) )
+
+	# a handle on the value in a context, its children are read through the node
+	# like the plug is
+	def asMDataHandle(self, context=None):
+		return MDataHandle( _PlugReader( self._owner(), context ), self._attr, self._index )
+
+	def destructHandle(self, handle):
+		pass
+
+
+# the data block of a handle made by MPlug.asMDataHandle()
+class _PlugReader(object):
+	def __init__(self, owner, context):
+		self._owner = owner
+		self._context = context
+
+	def _get(self, attr, index=None):
+		return self._owner._standInValue( attr, index, self._context )
+
+	def _set(self, attr, value, index=None):
+		raise RuntimeError( "a plug handle is read only" )
+
+
+class MPlugArray(list):
+	def length(self):
+		return len(self)
+
+
+class MDataHandle(object):
+	def __init__(self, block, attr, index=None):
+		self._block = block
+		self._attr = attr
+		self._index = index
+
+	def _get(self):
+		return self._block._get( self._attr, self._index )
+
+	def _set(self, value):
+		self._block._set( self._attr, value, self._index )
+
+	def asFloat(self):
+		return _f32( self._get() )
+
+	def asDouble(self):
+		return float( self._get() )
+
+	def asBool(self):
+		return bool( self._get() )
+
+	def asShort(self):
+		return int( self._get() )
+
+	asInt = asShort
+	asLong = asShort
+	asChar = asShort
+
+	def asMatrix(self):
+		return MMatrix( self._get() )
+
+	def asFloatMatrix(self):
+		return MFloatMatrix( self._get() )
+
+	def asFloatVector(self):
+		x, y, z = [ self._block._get(child) for child in self._attr.children ]
+		return MFloatVector(x, y, z)
+
+	def asTime(self):
+		value = self._get()
+		return value if isinstance(value, MTime) else MTime( value )
+
+	def asVector(self):
+		x, y, z = [ self._block._get(child) for child in self._attr.children ]
+		return MVector(x, y, z)
+
+	def asString(self):
+		value = self._get()
+		return value.value if isinstance(value, _StringData) else (value or "")
+
+	def data(self):
+		return MObject( self._get() )
+
+	def child(self, attribute):
+		return MDataHandle( self._block, attribute.attr )
+
+	def setFloat(self, value):
+		self._set( _f32(value) )
+
+	def setDouble(self, value):
+		self._set( float(value) )
+
+	def setBool(self, value):
+		self._set( bool(value) )
+
+	def setShort(self, value):
+		self._set( int(value) )
+
+	setInt = setShort
+
+	def setMFloatVector(self, vector):
+		for child, value in zip( self._attr.children, (vector.x, vector.y, vector.z) ):
+			self._block._set( child, _f32(value) )
+
+	def setMVector(self, vector):
+		for child, value in zip( self._attr.children, (vector.x, vector.y, vector.z) ):
+			self._block._set( child, float(value) )
+
+	def set3Float(self, x, y, z):
+		self.setMFloatVector( MFloatVector(x, y, z) )
+
+	def set3Double(self, x, y, z):
+		self.setMVector( MVector(x, y, z) )
+
+	def setMMatrix(self, matrix):
+		self._set( MMatrix(matrix) )
+
+	def setMTime(self, time):
+		self._set( MTime( time.value() ) )
+
+	def setMFloatMatrix(self, matrix):
+		self._set( MMatrix(matrix) )
+
+	def setMObject(self, data):
+		self._set( data.attr )
+
+	def setString(self, value):
+		self._set( _StringData(value) )
+
+	def setClean(self):
+		self._block._clean.add( self._attr )
+
+
+class MArrayDataHandle(object):
+	def __init__(self, block, attr):
+		self._block = block
+		self._attr = attr
+		self._indices = sorted( block._arrayValues(attr) )
+		self._position = 0
+
+	def elementCount(self):
+		return len(self._indices)
+
+	def jumpToArrayElement(self, position):
+		self._position = position
+
+	def jumpToElement(self, index):
+		self._position = self._indices.index(index)
+
+	def elementIndex(self):
+		return self._indices[self._position]
+
+	def next(self):
+		self._position += 1
+		return self._position < len(self._indices)
+
+	def inputValue(self):
+		return MDataHandle( self._block, self._attr, self.elementIndex() )
+
+	outputValue = inputValue
+
+	# replace the elements with the ones of an MArrayDataBuilder
+	def set(self, builder):
+		self._block._values[self._attr] = dict( builder._elements )
+		self._indices = sorted( builder._elements )
+		self._position = 0
+
+	def builder(self):
+		builder = MArrayDataBuilder( self._block, MObject( self._attr ), len( self._indices ) )
+		builder._elements.update( self._block._arrayValues( self._attr ) )
+		return builder
+
+	def setAllClean(self):
+		self._block._clean.add( self._attr )
+
+	def setClean(self):
+		self._block._clean.add( self._attr )
+
+
+# the elements of a multi attribute being built, they replace the elements in the
+# data block when passed to MArrayDataHandle.set()
+class MArrayDataBuilder(object):
+	def __init__(self, block, attribute, count=0):
+		self._attr = attribute.attr
+		self._default = block._default( self._attr )
+		self._elements = {}
+
+	def _get(self, attr, index=None):
+		return self._elements.get( index, self._default )
+
+	def _set(self, attr, value, index=None):
+		self._elements[index] = value
+
+	def addElement(self, index):
+		self._elements.setdefault( index, self._default )
+		return MDataHandle( self, self._attr, index )
+
+	def removeElement(self, index):
+		self._elements.pop( index, None )
+
+	def elementCount(self):
+		return len( self._elements )
+
+
+class MDataBlock(object):
+	def __init__(self, owner):
+		self._owner = owner
+		self._values = {}
+		self._clean = set()
+		self.reads = 0
+
+	def _default(self, attr):
+		if attr.kind == "matrix":
+			return MMatrix()
+		return attr.default
+
+	def _get(self, attr, index=None):
+		self.reads += 1
+		if index is not None:
+			values = self._values.get(attr, {})
+			return values.get( index, self._default(attr) )
+		if attr in self._values:
+			return self._values[attr]
+		return self._default(attr)
+
+	def _set(self, attr, value, index=None):
+		if index is not None:
+			self._values.setdefault( attr, {} )[index] = value
+		else:
+			self._values[attr] = value
+
+	def _arrayValues(self, attr):
+		return self._values.get( attr, {} )
+
+	def inputValue(self, attribute):
+		attr = attribute.attr if isinstance(attribute, MObject) else attribute._attr
+		return MDataHandle( self, attr )
+
+	outputValue = inputValue
+
+	def inputArrayValue(self, attribute):
+		return MArrayDataHandle( self, attribute.attr )
+
+	outputArrayValue = inputArrayValue
+
+	def setClean(self, plug):
+		attr = plug.attr if isinstance(plug, MObject) else plug._attr
+		self._clean.add(attr)
+
+	def isClean(self, attribute):
+		attr = attribute.attr if isinstance(attribute, MObject) else attribute._attr
+		return attr in self._clean
+
+	def context(self):
+		return MDGContext.fsNormal
+
+
+class MGlobal(object):
+	@staticmethod
+	def displayInfo(message):
+		pass
+
+	@staticmethod
+	def displayWarning(message):
+		pass
+
+	@staticmethod
+	def displayError(message):
+		pass
+
+
+class MFnDependencyNode(object):
+	def __init__(self, obj=None):
+		self._node = obj.attr if isinstance(obj, MObject) else None
+
+	def name(self):
+		return self._node.name()
+
+	def typeName(self):
+		return getattr( self._node, "_standInTypeName", type(self._node).__name__ )
+
+	def userNode(self):
+		return self._node
@@ -0,0 +1,126 @@
+# -----------------------------------------------------------------------------------
+# Stand-in for maya.OpenMayaMPx ( Python API 1.0 )
+#
+# Nodes keep their attribute layout and attributeAffects table on the class and
+# own a stand-in MDataBlock so compute() can be called directly.
+# -----------------------------------------------------------------------------------
+
+import maya.OpenMaya as OpenMaya
+
+
+class MPxNode(object):
+	kDependNode = 0
+	kLocatorNode = 1
+
+	# scheduling types for the parallel evaluation manager
+	kDefaultScheduling = 0
+	kParallel = 1
+	kSerial = 2
+	kGloballySerial = 3
+	kUntrusted = 4
+
+	def __init__(self):
+		self._standInConnections = set()
+		self._standInBlock = OpenMaya.MDataBlock(self)
+		self._standInSampler = None
+
+	@classmethod
+	def _standInLayout(cls):
+		if "_standInAttributes" not in cls.__dict__:
+			cls._standInAttributes = []
+			cls._standInAffects = []
+		return cls
+
+	# reloading a plugin creates new attribute objects, they replace the old ones
+	@classmethod
+	def addAttribute(cls, attribute):
+		layout = cls._standInLayout()
+		layout._standInAttributes = [ attr for attr in layout._standInAttributes if attr.name != attribute.attr.name ]
+		layout._standInAttributes.append( attribute.attr )
+
+	@classmethod
+	def attributeAffects(cls, whenChanges, isAffected):
+		layout = cls._standInLayout()
+		pair = ( whenChanges.attr.name, isAffected.attr.name )
+		layout._standInAffects = [ affects for affects in layout._standInAffects if ( affects[0].name, affects[1].name ) != pair ]
+		layout._standInAffects.append( ( whenChanges.attr, isAffected.attr ) )
+
+	def thisMObject(self):
+		return OpenMaya.MObject(self)
+
+	def name(self):
+		return getattr( self, "_standInName", self.__class__.__name__ )
+
+	def postConstructor(self):
+		pass
+
+	def forceCache(self, context=None):
+		return self._standInBlock
+
+	def schedulingType(self):
+		return MPxNode.kDefaultScheduling
+
+	def setDependentsDirty(self, plug, plugArray):
+		return OpenMaya.MStatus.kSuccess
+
+	# values read through MPlug, an optional sampler function can answer
+	# reads made in a time context
+	def _standInValue(self, attr, index, context):
+		if context is not None and not context.isNormal() and self._standInSampler is not None:
+			return self._standInSampler( attr, index, context.getTime().value() )
+		return self._standInBlock._get( attr, index )
+
+
+class MPxCommand(object):
+	def __init__(self):
+		self._result = None
+
+	def doIt(self, args):
+		pass
+
+	def isUndoable(self):
+		return False
+
+	def setResult(self, value):
+		self._result = value
+
+	def appendToResult(self, value):
+		if self._result is None:
+			self._result = []
+		self._result.append(value)
+
+	clearResult = lambda self: setattr(self, "_result", None)
+
+
+def asMPxPtr(obj):
+	return obj
+
+
+class MFnPlugin(object):
+	# every node type and command registered by stand-in plugins
+	registeredNodes = {}
+	registeredCommands = {}
+
+	def __init__(self, mobject=None, vendor="", version="", apiVersion="Any"):
+		self._mobject = mobject
+
+	def registerNode(self, typeName, typeId, creator, initializer, nodeType=MPxNode.kDependNode, classification=None):
+		if typeName in MFnPlugin.registeredNodes:
+			raise RuntimeError( "node type %s is already registered" % typeName )
+		initializer()
+		MFnPlugin.registeredNodes[typeName] = ( typeId, creator )
+
+	def deregisterNode(self, typeId):
+		for typeName, (registeredId, creator) in list( MFnPlugin.registeredNodes.items() ):
+			if registeredId == typeId:
+				del MFnPlugin.registeredNodes[typeName]
+				return
+		raise RuntimeError( "node id is not registered" )
+
+	def registerCommand(self, name, creator, syntax=None):
+		if name in MFnPlugin.registeredCommands:
+			raise RuntimeError( "command %s is already registered" % name )
+		MFnPlugin.registeredCommands[name] = creator
+
+	def deregisterCommand(self, name):
+		del MFnPlugin.registeredCommands[name]
@@ -0,0 +1,247 @@
+# -----------------------------------------------------------------------------------
+# Stand-in for maya.api.OpenMaya ( Python API 2.0 )
+#
+# Built on the API 1.0 stand-in. The differences that matter to the plugins are
+# here: attribute flags and plug queries are properties, MMatrix is a sequence of
+# 16 values, MPxNode and MFnPlugin live in this module and compute() returns None.
+# -----------------------------------------------------------------------------------
+
+import maya.OpenMaya as _api1
+import maya.OpenMayaMPx as _mpx
+
+from maya.OpenMaya import MObject, MTypeId, MSpace, MVector, MFloatVector, MQuaternion, MEulerRotation, \
+	MFnData, MFnNumericData, MTime, MDGContext, MDoubleArray, MIntArray, MVectorArray, MPlugArray, \
+	MFnDependencyNode, MGlobal
+
+
+class MMatrix(_api1.MMatrix):
+	def __init__(self, other=None):
+		if other is not None and not isinstance(other, _api1.MMatrix):
+			values = list(other)
+			if len(values) == 16:
+				other = [ values[0:4], values[4:8], values[8:12], values[12:16] ]
+		_api1.MMatrix.__init__(self, other)
+
+	def __len__(self):
+		return 16
+
+	def __getitem__(self, index):
+		return self._rows[index // 4][index % 4]
+
+	def __iter__(self):
+		for row in self._rows:
+			for value in row:
+				yield value
+
+	def getElement(self, row, column):
+		return self._rows[row][column]
+
+	def __mul__(self, other):
+		return MMatrix( _api1.MMatrix.__mul__(self, other) )
+
+	def inverse(self):
+		return MMatrix( _api1.MMatrix.inverse(self) )
+
+	def transpose(self):
+		return MMatrix( _api1.MMatrix.transpose(self) )
+
+MMatrix.kIdentity = MMatrix()
+
+
+class MMatrixArray(_api1.MMatrixArray):
+	def _convert(self, value):
+		return MMatrix(value)
+
+
+class MTransformationMatrix(_api1.MTransformationMatrix):
+	def scale(self, space):
+		return list( self._scale )
+
+	def shear(self, space):
+		return list( self._shear )
+
+	def translation(self, space):
+		return MVector( self._translate )
+
+	def rotation(self, asQuaternion=False):
+		if asQuaternion:
+			return _api1.MTransformationMatrix.rotation(self)
+		return _api1.MTransformationMatrix.rotation(self).asEulerRotation()
+
+
+# -----------------------------------------------------------------------------------
+# attributes, the flags are properties in API 2.0
+# -----------------------------------------------------------------------------------
+def _flag(name):
+	def getter(self):
+		return self._attr.flags.get( name )
+	def setter(self, value):
+		self._attr.flags[name] = value
+	return property( getter, setter )
+
+
+class MFnAttribute(_api1.MFnAttribute):
+	writable = _flag( "writable" )
+	readable = _flag( "readable" )
+	storable = _flag( "storable" )
+	keyable = _flag( "keyable" )
+	hidden = _flag( "hidden" )
+	connectable = _flag( "connectable" )
+	cached = _flag( "cached" )
+	usesArrayDataBuilder = _flag( "usesArrayDataBuilder" )
+	disconnectBehavior = _flag( "disconnectBehavior" )
+	affectsAppearance = _flag( "affectsAppearance" )
+	usedAsFilename = _flag( "usedAsFilename" )
+
+	@property
+	def name(self):
+		return self._attr.name
+
+	def _getArray(self):
+		return self._attr.array
+
+	def _setArray(self, value):
+		self._attr.array = value
+
+	array = property( _getArray, _setArray )
+
+
+class MFnNumericAttribute(MFnAttribute, _api1.MFnNumericAttribute):
+	def _setDefault(self, value):
+		if isinstance(value, (tuple, list)):
+			_api1.MFnNumericAttribute.setDefault( self, *value )
+		else:
+			_api1.MFnNumericAttribute.setDefault( self, value )
+
+	default = property( lambda self: self._attr.default, _setDefault )
+	setMin = _api1.MFnNumericAttribute.setMin
+	setMax = _api1.MFnNumericAttribute.setMax
+
+
+class MFnEnumAttribute(MFnAttribute, _api1.MFnEnumAttribute):
+	pass
+
+
+class MFnMatrixAttribute(MFnAttribute, _api1.MFnMatrixAttribute):
+	def create(self, name, shortName, matrixType=_api1.MFnMatrixAttribute.kDouble):
+		return self._new( _api1._Attribute( "matrix", name, shortName, MMatrix(), matrixType ) )
+
+
+class MFnCompoundAttribute(MFnAttribute, _api1.MFnCompoundAttribute):
+	pass
+
+
+class MFnTypedAttribute(MFnAttribute, _api1.MFnTypedAttribute):
+	pass
+
+
+class MFnUnitAttribute(MFnAttribute, _api1.MFnUnitAttribute):
+	pass
+
+
+class MFnDoubleArrayData(_api1.MFnDoubleArrayData):
+	pass
+
+
+class MFnVectorArrayData(_api1.MFnVectorArrayData):
+	pass
+
+
+class MFnMatrixArrayData(_api1.MFnMatrixArrayData):
+	_arrayType = MMatrixArray
+
+
+class MFnArrayAttrsData(_api1.MFnArrayAttrsData):
+	pass
+
+
+class MFnStringData(_api1.MFnStringData):
+	pass
+
+
+class MFnMatrixData(_api1.MFnMatrixData):
+	def create(self, matrix=None):
+		self._matrix = MMatrix(matrix)
+		return MObject(self._matrix)
+
+	def matrix(self):
+		return MMatrix(self._matrix)
+
+
+# -----------------------------------------------------------------------------------
+# plugs, data handles and the data block
+# -----------------------------------------------------------------------------------
+class MPlug(_api1.MPlug):
+	isConnected = property( _api1.MPlug.isConnected )
+	isSource = property( _api1.MPlug.isSource )
+	isDestination = property( _api1.MPlug.isDestination )
+	isChild = property( _api1.MPlug.isChild )
+	isCompound = property( _api1.MPlug.isCompound )
+	isArray = property( _api1.MPlug.isArray )
+	isElement = property( _api1.MPlug.isElement )
+	isNull = property( _api1.MPlug.isNull )
+
+	def logicalIndex(self):
+		return self._index
+
+	def parent(self):
+		return MPlug( self._node, self._attr.parent )
+
+	def child(self, index):
+		if isinstance(index, MObject):
+			return MPlug( self._node, index )
+		return MPlug( self._node, self._attr.children[index] )
+
+	def elementByLogicalIndex(self, index):
+		return MPlug( self._node, self._attr, index )
+
+	def asMObject(self, context=None):
+		return MObject( self._value(context) )
+
+
+class MDataHandle(_api1.MDataHandle):
+	def asMatrix(self):
+		return MMatrix( self._get() )
+
+	def child(self, attribute):
+		return MDataHandle( self._block, attribute.attr )
+
+
+class MArrayDataHandle(_api1.MArrayDataHandle):
+	def __len__(self):
+		return len(self._indices)
+
+	def inputValue(self):
+		return MDataHandle( self._block, self._attr, self.elementIndex() )
+
+	outputValue = inputValue
+
+
+class MDataBlock(_api1.MDataBlock):
+	def inputValue(self, attribute):
+		attr = attribute.attr if isinstance(attribute, MObject) else attribute._attr
+		return MDataHandle( self, attr )
+
+	outputValue = inputValue
+
+	def inputArrayValue(self, attribute):
+		return MArrayDataHandle( self, attribute.attr )
+
+	outputArrayValue = inputArrayValue
+
+
+# -----------------------------------------------------------------------------------
+# proxy classes
+# -----------------------------------------------------------------------------------
+class MPxNode(_mpx.MPxNode):
+	def __init__(self):
+		_mpx.MPxNode.__init__(self)
+		self._standInBlock = MDataBlock(self)
+
+
+class MPxCommand(_mpx.MPxCommand):
+	pass
+
+
+class MFnPlugin(_mpx.MFnPlugin):
+	pass
@@ -0,0 +1 @@
+# stand-in for maya.api, see maya/api/OpenMaya.py
@@ -0,0 +1,134 @@
+# -----------------------------------------------------------------------------------
+# standInScene
+#
+# A tiny scene on top of the stand-in maya package so plugins can be loaded, their
+# nodes created and compute() called without Maya. Used by the benchmark and test
+# harness scripts next to the plugins.
+#
+#   import standInScene
+#   standInScene.install()            # put the stand-in maya package on sys.path
+#   import rt4x4MatrixToTRS
+#   standInScene.loadPlugin( rt4x4MatrixToTRS )
+#   node = standInScene.createNode( "rt4x4MatrixToTRS" )
+#   standInScene.setAttr( node, "in30", 1.0 )
+#   standInScene.computePlug( node, "outputTranslate" )
+#   print( standInScene.getAttr( node, "outputTranslate" ) )
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+
+kStandInPath = os.path.dirname( os.path.abspath( __file__ ) )
+
+# put the stand-in maya package in front of any real one and the plugin folder
+# on sys.path, returns the stand-in folder
+def install():
+	pluginPath = os.path.dirname( kStandInPath )
+	for path in ( pluginPath, kStandInPath ):
+		if path in sys.path:
+			sys.path.remove( path )
+		sys.path.insert( 0, path )
+	return kStandInPath
+
+install()
+
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaMPx as OpenMayaMPx
+import maya.api.OpenMaya as OpenMaya2
+
+
+def loadPlugin(module):
+	module.initializePlugin( OpenMaya.MObject() )
+
+def unloadPlugin(module):
+	module.uninitializePlugin( OpenMaya.MObject() )
+
+# create a node of a registered type, the returned object is the MPxNode itself
+def createNode(typeName, name=None):
+	typeId, creator = OpenMayaMPx.MFnPlugin.registeredNodes[typeName]
+	node = creator()
+	node._standInName = name or typeName
+	node._standInTypeName = typeName
+	node.postConstructor()
+	return node
+
+# the API module a node was written against
+def apiModule(node):
+	if isinstance( node, OpenMaya2.MPxNode ):
+		return OpenMaya2
+	return OpenMaya
+
+# find an attribute of a node by long or short name
+def findAttribute(node, name):
+	pending = list( type(node)._standInAttributes )
+	while pending:
+		attr = pending.pop(0)
+		if attr.name == name or attr.shortName == name:
+			return attr
+		pending.extend( attr.children )
+	raise KeyError( "%s has no attribute %s" % ( node.name(), name ) )
+
+def attributeObject(node, name):
+	return OpenMaya.MObject( findAttribute( node, name ) )
+
+# set an input value, vectors set the children of a compound and index sets
+# an element of a multi attribute, the outputs it affects are dirtied
+def setAttr(node, name, value, index=None):
+	attr = findAttribute( node, name )
+	block = node._standInBlock
+	if attr.kind == "compound" and attr.children and isinstance( value, (tuple, list) ):
+		for child, childValue in zip( attr.children, value ):
+			block._set( child, childValue )
+	else:
+		block._set( attr, value, index )
+	dirtyAffected( node, attr, index )
+
+# the value of an attribute in the data block, vectors come back as tuples
+def getAttr(node, name, index=None):
+	attr = findAttribute( node, name )
+	block = node._standInBlock
+	if attr.kind == "compound" and attr.children:
+		return tuple( [ block._get( child ) for child in attr.children ] )
+	return block._get( attr, index )
+
+# mark every output of a node dirty
+def dirty(node):
+	node._standInBlock._clean.clear()
+
+# mark the outputs a change of an attribute reaches dirty like Maya does, the
+# attributeAffects pairs of the attribute, its children and its parents give the
+# plugs and setDependentsDirty() of the node can change them, returns the plugs
+def dirtyAffected(node, attr, index=None):
+	api = apiModule( node )
+	changed = set( [ attr ] + attr.children )
+	parent = attr.parent
+	while parent is not None:
+		changed.add( parent )
+		parent = parent.parent
+
+	plugs = api.MPlugArray()
+	for source, output in getattr( type(node), "_standInAffects", () ):
+		plug = api.MPlug( node.thisMObject(), api.MObject( output ) )
+		if source in changed and plug not in plugs:
+			plugs.append( plug )
+	node.setDependentsDirty( api.MPlug( node.thisMObject(), api.MObject( attr ), index ), plugs )
+
+	clean = node._standInBlock._clean
+	for plug in plugs:
+		output = plug._attr
+		for dirtied in [ output, output.parent ] + output.children:
+			clean.discard( dirtied )
+	return plugs
+
+# pretend a plug has a connection
+def connectAttr(node, name):
+	node._standInConnections.add( findAttribute( node, name ) )
+
+def disconnectAttr(node, name):
+	node._standInConnections.discard( findAttribute( node, name ) )
+
+# call compute() for a plug like Maya does when it is pulled
+def computePlug(node, name, index=None):
+	api = apiModule( node )
+	plug = api.MPlug( node.thisMObject(), api.MObject( findAttribute( node, name ) ), index )
+	return node.compute( plug, node._standInBlock )
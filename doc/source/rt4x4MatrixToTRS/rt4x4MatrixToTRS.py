@@ -1,622 +1,982 @@
-# -----------------------------------------------------------------------------------
-# rt4x4MatrixToTRS Version 1.0
-# Author:  Ryan Trowbridge
-# Contact: admin@rtrowbridge.com 
-#
-# Please give credit where credit is due this is written by Ryan Trowbridge
-# with lots of experamentation to try to get python to work correctly.
-# 
-# This node is similar to a combination of two nodes that ship with Maya called fourByFourMatrix and the decomposeMatrix
-# It also has the attributes parentInverseMatrix, normalize, and offset TRS attributes
-# You can technicaly do what this node does with only Maya nodes but you would have to use several to mimic this one node
-#
-# To use this node:
-# Load this script as a plugin using the tool under the Main Menu Window\Settings Preferences\Plug-in Manager
-# Open the hypershade and navigate to general utilities
-# Select the rt4x4MatrixToTRS utility node in the menu to create it
-#
-# The user can connect, drive, or use expressions to create the 16 floats of a matrix for the input
-# The output of this node is the 16 floats turned into a matrix and converted into translate, euler rotation, and scale
-# There is a normalize option also that forces the matrix rotation vectors to be of unit length
-# -----------------------------------------------------------------------------------	
-
-import sys
-import math
-import maya.OpenMaya as OpenMaya
-import maya.OpenMayaMPx as OpenMayaMPx
-
-debug = False
-
-# -----------------------------------------------------------------------------------
-# define the node type name
-# define the node class
-# define the node unique id ( use: cmds.getClassification( 'nodeName' ) to find a nodes class)
-# -----------------------------------------------------------------------------------
-kMatrixUtilNodeTypeName = "rt4x4MatrixToTRS"
-kMatrixUtilNodeClassify = "utility/general"
-kMatrixUtilNodeId = OpenMaya.MTypeId(0x87105)
-#this is a non commercial plugin id, I might release one with a commercial id if requested
-
-
-# define a new matrixUtilNode class derived from the MPxNode class
-class rtMatrixUtilNode(OpenMayaMPx.MPxNode):
-
-	# class variables
-	
-	parentInverseMatrix = OpenMaya.MObject()
-	
-	matrixIn = OpenMaya.MObject()
-	
-	in00 = OpenMaya.MObject()
-	in01 = OpenMaya.MObject()
-	in02 = OpenMaya.MObject()
-	in03 = OpenMaya.MObject()
-	
-	in10 = OpenMaya.MObject()
-	in11 = OpenMaya.MObject()
-	in12 = OpenMaya.MObject()
-	in13 = OpenMaya.MObject()
-	
-	in20 = OpenMaya.MObject()
-	in21 = OpenMaya.MObject()
-	in22 = OpenMaya.MObject()
-	in23 = OpenMaya.MObject()
-	
-	in30 = OpenMaya.MObject()
-	in31 = OpenMaya.MObject()
-	in32 = OpenMaya.MObject()
-	in33 = OpenMaya.MObject()
-		
-	out_t = OpenMaya.MObject()
-	out_r = OpenMaya.MObject()
-	out_s = OpenMaya.MObject()
-	
-	offset_t = OpenMaya.MObject()
-	offset_r = OpenMaya.MObject()
-	offset_s = OpenMaya.MObject()
-	
-	eulRotateOrder = OpenMaya.MObject()
-	normalize = OpenMaya.MObject()
-
-	def __init__(self):
-		OpenMayaMPx.MPxNode.__init__(self)
-		
-	# arguments ( self, MPlug, MDataBlock) 
-	def compute(self, plug, dataBlock):
-		
-		# if these attributes are requested, recompute their values
-		if plug == rtMatrixUtilNode.out_t or \
-			rtMatrixUtilNode.out_r or rtMatrixUtilNode.out_s:
-		
-			if debug:
-				# print to the output window if in compute()
-				sys.__stdout__.write( "##compute()\n" )
-
-			# get MDataHandle's to attributes
-			#
-			
-			try:
-				pim_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.parentInverseMatrix )
-			except:
-				sys.stderr.write( "Failed to get inputValue parentInverseMatrix" )
-				raise
-			
-			###vector X
-			try:
-				in00_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in00 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in00" )
-				raise
-			try:
-				in01_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in01 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in01" )
-				raise
-			try:
-				in02_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in02 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in02" )
-				raise
-			try:
-				in03_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in03 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in03" )
-				raise
-			
-			###vector Y
-			try:
-				in10_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in10 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in10" )
-				raise
-			try:
-				in11_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in11 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in11" )
-				raise
-			try:
-				in12_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in12 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in12" )
-				raise
-			try:
-				in13_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in13 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in13" )
-				raise
-			
-			###vector Z
-			try:
-				in20_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in20 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in20" )
-				raise
-			try:
-				in21_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in21 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in21" )
-				raise
-			try:
-				in22_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in22 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in22" )
-				raise
-			try:
-				in23_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in23 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in23" )
-				raise
-			
-			###vector T
-			try:
-				in30_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in30 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in30" )
-				raise
-			try:
-				in31_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in31 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in31" )
-				raise
-			try:
-				in32_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in32 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in32" )
-				raise
-			try:
-				in33_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.in33 )
-			except:
-				sys.stderr.write( "Failed to get inputValue in33" )
-				raise
-				
-			###offset trs handles
-			try:
-				offset_t_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.offset_t )	
-			except:
-				sys.stderr.write( "Failed to get inputValue offset_t" )
-				raise
-
-			try:
-				offset_r_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.offset_r )
-			except:
-				sys.stderr.write( "Failed to get inputValue offset_r" )
-				raise
-
-			try:
-				offset_s_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.offset_s )
-			except:
-				sys.stderr.write( "Failed to get inputValue offset_s" )
-				raise
-				
-			### user option attributes
-			try:
-				normalize_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.normalize)
-			except:
-				sys.stderr.write( "Failed to get inputValue normalize" )
-				raise
-			
-			try:
-				rotOrder_dataHandle = dataBlock.inputValue( rtMatrixUtilNode.eulRotateOrder )
-			except:
-				sys.stderr.write( "Failed to get inputValue eulRotateOrder" )
-				raise
-			
-			###trs handles
-			try:
-				ot_dataHandle = dataBlock.outputValue( rtMatrixUtilNode.out_t )	
-			except:
-				sys.stderr.write( "Failed to get inputValue out_t" )
-				raise
-				
-			try:
-				or_dataHandle = dataBlock.outputValue( rtMatrixUtilNode.out_r )
-			except:
-				sys.stderr.write( "Failed to get inputValue out_r" )
-				raise
-				
-			try:
-				os_dataHandle = dataBlock.outputValue( rtMatrixUtilNode.out_s )
-			except:
-				sys.stderr.write( "Failed to get inputValue out_s" )
-				raise
-				
-				
-			# get values from dataHandles
-			#
-			pInvMatrix_value = pim_dataHandle.asMatrix()
-			
-			in00_value = in00_dataHandle.asFloat()
-			in01_value = in01_dataHandle.asFloat()
-			in02_value = in02_dataHandle.asFloat()
-			in03_value = in03_dataHandle.asFloat()
-			
-			in10_value = in10_dataHandle.asFloat()
-			in11_value = in11_dataHandle.asFloat()
-			in12_value = in12_dataHandle.asFloat()
-			in13_value = in13_dataHandle.asFloat()
-			
-			in20_value = in20_dataHandle.asFloat()
-			in21_value = in21_dataHandle.asFloat()
-			in22_value = in22_dataHandle.asFloat()
-			in23_value = in23_dataHandle.asFloat()
-			
-			in30_value = in30_dataHandle.asFloat()
-			in31_value = in31_dataHandle.asFloat()
-			in32_value = in32_dataHandle.asFloat()
-			in33_value = in33_dataHandle.asFloat()
-			
-			normalize_value = normalize_dataHandle.asBool()
-			
-			offset_t_value = offset_t_dataHandle.asFloatVector()
-			offset_r_value = offset_r_dataHandle.asFloatVector()
-			offset_s_value = offset_s_dataHandle.asFloatVector()
-
-			
-			# Note there is a Maya Python bug with enum attributes
-			# you must use MDataHandle.asShort() to get the proper value
-			rotOrder_value = rotOrder_dataHandle.asShort()
-			
-			# get the matrix as vectors
-			x_vector = OpenMaya.MVector(in00_value, in01_value, in02_value)
-			y_vector = OpenMaya.MVector(in10_value, in11_value, in12_value)
-			z_vector = OpenMaya.MVector(in20_value, in21_value, in22_value)
-			
-			# user option for normalizing the matrix rotation vectors
-			if normalize_value:
-				x_vector.normalize()
-				y_vector.normalize()
-				z_vector.normalize()
-			
-			# create a matrix from the input values
-			getMatrix = OpenMaya.MMatrix()
-			matrixList = (x_vector.x, x_vector.y, x_vector.z, in03_value,
-					y_vector.x, y_vector.y, y_vector.z, in13_value,
-					z_vector.x, z_vector.y, z_vector.z, in23_value,
-					in30_value, in31_value, in32_value, in33_value)
-						
-			OpenMaya.MScriptUtil().createMatrixFromList(matrixList, getMatrix)
-			
-			if debug:
-				#print matrix values
-				sys.__stdout__.write("matrix out: ( " + str(x_vector.x) + ", " + str(x_vector.y) + ", " + str(x_vector.z) + ", " + str(0.0) + ", \n" + \
-								str(y_vector.x) + ", " + str(y_vector.y) + ", " + str(y_vector.z) + ", " + str(0.0) + ", \n" + \
-								str(z_vector.x) + ", " + str(z_vector.y) + ", " + str(z_vector.z) + ", " + str(0.0) + ", \n" + \
-								str(in30_value) + ", " + str(in31_value) + ", " + str(in32_value) + ", " + str(1.0) + " )\n" )
-	
-			# Multiply parentInverseMatrix by the matrix created by the user
-			finalMatrix = ( getMatrix * pInvMatrix_value )
-	
-			# MTransformationMatrix
-			mTM = OpenMaya.MTransformationMatrix( finalMatrix)
-			
-			# Get the translation
-			trans = mTM.getTranslation( OpenMaya.MSpace.kTransform )
-			
-			# Get the rotation
-			mquat = mTM.rotation()
-			rot = mquat.asEulerRotation()
-			rot.reorderIt( rotOrder_value )
-			
-			# Get the scale
-			scaleDoubleArray = OpenMaya.MScriptUtil()
-			scaleDoubleArray.createFromList( [0.0, 0.0, 0.0], 3 )
-			scaleDoubleArrayPtr = scaleDoubleArray.asDoublePtr()
-			
-			mTM.getScale( scaleDoubleArrayPtr, OpenMaya.MSpace.kTransform)
-						
-			x_scale = OpenMaya.MScriptUtil().getDoubleArrayItem( scaleDoubleArrayPtr, 0 )
-			y_scale = OpenMaya.MScriptUtil().getDoubleArrayItem( scaleDoubleArrayPtr, 1 )
-			z_scale = OpenMaya.MScriptUtil().getDoubleArrayItem( scaleDoubleArrayPtr, 2 )
-			
-			if debug:
-				# print to the output window the output values that are to be set
-				sys.__stdout__.write( "rotate order: " + str( rotOrder_value ) + "\n" )
-				sys.__stdout__.write( "normalize: " + str( normalize_value ) + "\n" )
-				
-				sys.__stdout__.write( "trans.x: " + str(trans.x) + "\n" )
-				sys.__stdout__.write( "trans.y: " + str(trans.y) + "\n" )
-				sys.__stdout__.write( "trans.z: " + str(trans.z) + "\n" )
-
-				sys.__stdout__.write( "rot.x: " + str(math.degrees( rot.x )) + "\n" )
-				sys.__stdout__.write( "rot.y: " + str(math.degrees( rot.y )) + "\n" )
-				sys.__stdout__.write( "rot.z: " + str(math.degrees( rot.z )) + "\n" )
-				
-				sys.__stdout__.write( "x_scale: " + str(x_scale) + "\n" )
-				sys.__stdout__.write( "y_scale: " + str(y_scale) + "\n" )
-				sys.__stdout__.write( "z_scale: " + str(z_scale) + "\n" )
-
-			# get the final result vectors as a MFloatVector
-			resultTrans = OpenMaya.MFloatVector(trans.x, trans.y, trans.z)
-			resultRot = OpenMaya.MFloatVector(math.degrees( rot.x ), math.degrees( rot.y ), math.degrees( rot.z ))
-			resultScale = OpenMaya.MFloatVector( x_scale, y_scale, z_scale)
-
-			# set the output trs values
-			ot_dataHandle.setMFloatVector( (resultTrans + offset_t_value) )
-			or_dataHandle.setMFloatVector( (resultRot + offset_r_value) )
-			os_dataHandle.setMFloatVector( (resultScale + offset_s_value) )
-			
-			# set the plug clean so maya knows it can update
-			dataBlock.setClean(plug)
-	
-		else:
-			return OpenMaya.kUnknownParameter
-		
-		return OpenMaya.MStatus.kSuccess
-			
-def nodeCreator():
-
-	return OpenMayaMPx.asMPxPtr( rtMatrixUtilNode() )
-
-# create and initialize the attributes to the node
-def nodeInitializer():
-
-	nAttr = OpenMaya.MFnNumericAttribute()
-	eAttr = OpenMaya.MFnEnumAttribute()
-	nMAttr = OpenMaya.MFnMatrixAttribute()
-	cAttr = OpenMaya.MFnCompoundAttribute()
-	
-	# create input attributes
-	#
-	
-	rtMatrixUtilNode.parentInverseMatrix = nMAttr.create( "parentInverseMatrix", "pim", OpenMaya.MFnMatrixAttribute.kDouble )
-	nMAttr.setWritable(True)
-	nMAttr.setStorable(True)
-	nMAttr.setReadable(True)
-	nMAttr.setKeyable(True)
-	
-	# Vector X
-	rtMatrixUtilNode.in00 = nAttr.create("in00", "i00", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in01 = nAttr.create("in01", "i01", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in02 = nAttr.create("in02", "i02", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in03 = nAttr.create("in03", "i03", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	# Vector Y
-	rtMatrixUtilNode.in10 = nAttr.create("in10", "i10", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in11 = nAttr.create("in11", "i11", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in12 = nAttr.create("in12", "i12", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in13 = nAttr.create("in13", "i13", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	# Vector Z
-	rtMatrixUtilNode.in20 = nAttr.create("in20", "i20", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in21 = nAttr.create("in21", "i21", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in22 = nAttr.create("in22", "i22", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in23 = nAttr.create("in23", "i23", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	# Vector T
-	rtMatrixUtilNode.in30 = nAttr.create("in30", "i30", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in31 = nAttr.create("in31", "i31", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	rtMatrixUtilNode.in32 = nAttr.create("in32", "i32", OpenMaya.MFnNumericData.kFloat, 0.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.in33 = nAttr.create("in33", "i33", OpenMaya.MFnNumericData.kFloat, 1.0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-
-	# create TRS offset attributes
-	#
-	rtMatrixUtilNode.offset_t = nAttr.createPoint("offsetTranslate", "oft" )
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.offset_r = nAttr.createPoint("offsetRotate", "ofr" )
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	rtMatrixUtilNode.offset_s = nAttr.createPoint("offsetScale", "ofs" )
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-	
-	
-	# create TRS output attributes
-	#
-	rtMatrixUtilNode.out_t = nAttr.createPoint("outputTranslate", "ot" )
-	nAttr.setWritable(False)
-	nAttr.setStorable(False)
-	nAttr.setReadable(True)
-	
-	rtMatrixUtilNode.out_r = nAttr.createPoint("outputRotate", "or" )
-	nAttr.setWritable(False)
-	nAttr.setStorable(False)
-	nAttr.setReadable(True)
-	
-	rtMatrixUtilNode.out_s = nAttr.createPoint("outputScale", "os" )
-	nAttr.setWritable(False)
-	nAttr.setStorable(False)
-	nAttr.setReadable(True)
-	
-	# create rotate order enum attribute
-	rtMatrixUtilNode.eulRotateOrder = eAttr.create( "eulerRotateOrder", "ero", 0 )
-	eAttr.addField("XYZ", 0)
-	eAttr.addField("YZX", 1)
-	eAttr.addField("ZXY", 2)
-	eAttr.addField("XZY", 3)
-	eAttr.addField("YXZ", 4)
-	eAttr.addField("ZYX", 5)
-	eAttr.setWritable(True)
-	eAttr.setStorable(True)
-	eAttr.setReadable(True)
-	eAttr.setKeyable(False)
-	
-	# create normalize attribute
-	rtMatrixUtilNode.normalize = nAttr.create("normalize", "n", OpenMaya.MFnNumericData.kBoolean , 0)
-	nAttr.setWritable(True)
-	nAttr.setStorable(True)
-	nAttr.setReadable(True)
-	nAttr.setKeyable(True)
-
-	# create compound attribute
-	#
-	rtMatrixUtilNode.matrixIn = cAttr.create( "matrixIn", "mi" )
-	
-	cAttr.addChild( rtMatrixUtilNode.in00 )
-	cAttr.addChild( rtMatrixUtilNode.in01 )
-	cAttr.addChild( rtMatrixUtilNode.in02 )
-	cAttr.addChild( rtMatrixUtilNode.in03 )
-	
-	cAttr.addChild( rtMatrixUtilNode.in10 )
-	cAttr.addChild( rtMatrixUtilNode.in11 )
-	cAttr.addChild( rtMatrixUtilNode.in12 )
-	cAttr.addChild( rtMatrixUtilNode.in13 )
-	
-	cAttr.addChild( rtMatrixUtilNode.in20 )
-	cAttr.addChild( rtMatrixUtilNode.in21 )
-	cAttr.addChild( rtMatrixUtilNode.in22 )
-	cAttr.addChild( rtMatrixUtilNode.in23 )
-	
-	cAttr.addChild( rtMatrixUtilNode.in30 )
-	cAttr.addChild( rtMatrixUtilNode.in31 )
-	cAttr.addChild( rtMatrixUtilNode.in32 )
-	cAttr.addChild( rtMatrixUtilNode.in33 )
-
-
-	# add attribues
-	#
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.normalize )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.eulRotateOrder )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.parentInverseMatrix )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.matrixIn )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.offset_t )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.offset_r )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.offset_s )
-
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.out_t )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.out_r )
-	rtMatrixUtilNode.addAttribute( rtMatrixUtilNode.out_s )	
-	
-	# Setup which attributes affect each other	
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.matrixIn,  rtMatrixUtilNode.out_t )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.normalize,  rtMatrixUtilNode.out_t )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.eulRotateOrder,  rtMatrixUtilNode.out_t )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.parentInverseMatrix, rtMatrixUtilNode.out_t )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.offset_t, rtMatrixUtilNode.out_t )
-	
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.matrixIn,  rtMatrixUtilNode.out_r )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.normalize,  rtMatrixUtilNode.out_r )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.eulRotateOrder,  rtMatrixUtilNode.out_r )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.parentInverseMatrix, rtMatrixUtilNode.out_r )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.offset_r, rtMatrixUtilNode.out_r )
-	
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.matrixIn,  rtMatrixUtilNode.out_s )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.normalize,  rtMatrixUtilNode.out_s )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.eulRotateOrder,  rtMatrixUtilNode.out_s )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.parentInverseMatrix, rtMatrixUtilNode.out_s )
-	rtMatrixUtilNode.attributeAffects ( rtMatrixUtilNode.offset_s, rtMatrixUtilNode.out_s )
-	
-	
-# initialize the script plug-in
-def initializePlugin(mobject):
-	mplugin = OpenMayaMPx.MFnPlugin(mobject, "Autodesk", "1.0", "Any")
-	try:
-		mplugin.registerNode( kMatrixUtilNodeTypeName, kMatrixUtilNodeId, nodeCreator, nodeInitializer, OpenMayaMPx.MPxNode.kDependNode, kMatrixUtilNodeClassify)
-	except:
-		sys.stderr.write( "Failed to register node: %s" % kMatrixUtilNodeTypeName )
-		raise
-
-
-# uninitialize the script plug-in
-def uninitializePlugin(mobject):
-	mplugin = OpenMayaMPx.MFnPlugin(mobject)
-	try:
-		mplugin.deregisterNode( kMatrixUtilNodeId )
-	except:
-		sys.stderr.write( "Failed to deregister node: %s" % kMatrixUtilNodeTypeName )
-		raise
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS Version 1.0
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com 
+#
+# Please give credit where credit is due this is written by Ryan Trowbridge
+# with lots of experamentation to try to get python to work correctly.
+# 
+# This node is similar to a combination of two nodes that ship with Maya called fourByFourMatrix and the decomposeMatrix
+# It also has the attributes parentInverseMatrix, normalize, and offset TRS attributes
+# You can technicaly do what this node does with only Maya nodes but you would have to use several to mimic this one node
+#
+# To use this node:
+# Load this script as a plugin using the tool under the Main Menu Window\Settings Preferences\Plug-in Manager
+# Open the hypershade and navigate to general utilities
+# Select the rt4x4MatrixToTRS utility node in the menu to create it
+#
+# The user can connect, drive, or use expressions to create the 16 floats of a matrix for the input
+# The output of this node is the 16 floats turned into a matrix and converted into translate, euler rotation, and scale
+# There is a normalize option also that forces the matrix rotation vectors to be of unit length
+# -----------------------------------------------------------------------------------	
+
+import sys
+import math
+import weakref
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaMPx as OpenMayaMPx
+
+import rtMatrixKernel
+import rtMatrixCache
+import rtMatrixStats
+import rtNodeSpec
+import rtTRSCache
+
+# -----------------------------------------------------------------------------------
+# define the node type name
+# define the node class
+# define the node unique id ( use: cmds.getClassification( 'nodeName' ) to find a nodes class)
+# -----------------------------------------------------------------------------------
+kMatrixUtilNodeTypeName = rtNodeSpec.matrixToTRS.typeName
+kMatrixUtilNodeClassify = rtNodeSpec.matrixToTRS.classification
+kMatrixUtilNodeId = OpenMaya.MTypeId( rtNodeSpec.matrixToTRS.typeId )
+#this is a non commercial plugin id, I might release one with a commercial id if requested
+
+kMatrixArrayNodeTypeName = rtNodeSpec.matrixArrayToTRS.typeName
+kMatrixArrayNodeId = OpenMaya.MTypeId( rtNodeSpec.matrixArrayToTRS.typeId )
+
+kComposeNodeTypeName = rtNodeSpec.trsToMatrix.typeName
+kComposeNodeId = OpenMaya.MTypeId( rtNodeSpec.trsToMatrix.typeId )
+
+kComposeArrayNodeTypeName = rtNodeSpec.trsArrayToMatrix.typeName
+kComposeArrayNodeId = OpenMaya.MTypeId( rtNodeSpec.trsArrayToMatrix.typeId )
+
+kCacheReaderNodeTypeName = rtNodeSpec.trsCacheReader.typeName
+kCacheReaderNodeId = OpenMaya.MTypeId( rtNodeSpec.trsCacheReader.typeId )
+
+
+# the caches owned by rt4x4MatrixToTRS nodes with cacheMode set to Node
+nodeCaches = weakref.WeakKeyDictionary()
+
+# hits, misses and sizes of the shared cache and of every node cache that was used by node name
+def cacheStats():
+	stats = { "shared": rtMatrixCache.sharedCache.stats() }
+	for node, cache in list( nodeCaches.items() ):
+		if cache.hits or cache.misses:
+			stats[ OpenMaya.MFnDependencyNode( node.thisMObject() ).name() ] = cache.stats()
+	return stats
+
+# reset the hit and miss counters of every cache
+def resetCacheStats():
+	rtMatrixCache.sharedCache.resetCounters()
+	for cache in list( nodeCaches.values() ):
+		cache.resetCounters()
+
+
+# get the rows of an MMatrix as a list of lists for rtMatrixKernel
+def matrixToList(matrix):
+	return [ [ matrix(row, column) for column in range(4) ] for row in range(4) ]
+
+# get an MMatrix from the rows of a rtMatrixKernel matrix
+def listToMatrix(rows):
+	matrix = OpenMaya.MMatrix()
+	OpenMaya.MScriptUtil.createMatrixFromList( [ value for row in rows for value in row ], matrix )
+	return matrix
+
+# fill an MVectorArray with ( x, y, z ) rows, sized once instead of grown by append
+def setVectorArray(vectorArray, rows):
+	vectorArray.setLength( len( rows ) )
+	for i, row in enumerate( rows ):
+		vectorArray.set( OpenMaya.MVector( row[0], row[1], row[2] ), i )
+
+
+
+# define a new matrixUtilNode class derived from the MPxNode class
+class rtMatrixUtilNode(rtNodeSpec.rtMatrixToTRSCompute, OpenMayaMPx.MPxNode):
+
+	# class variables
+	
+	parentInverseMatrix = OpenMaya.MObject()
+	
+	inputMatrix = OpenMaya.MObject()
+	matrixIn = OpenMaya.MObject()
+	
+	in00 = OpenMaya.MObject()
+	in01 = OpenMaya.MObject()
+	in02 = OpenMaya.MObject()
+	in03 = OpenMaya.MObject()
+	
+	in10 = OpenMaya.MObject()
+	in11 = OpenMaya.MObject()
+	in12 = OpenMaya.MObject()
+	in13 = OpenMaya.MObject()
+	
+	in20 = OpenMaya.MObject()
+	in21 = OpenMaya.MObject()
+	in22 = OpenMaya.MObject()
+	in23 = OpenMaya.MObject()
+	
+	in30 = OpenMaya.MObject()
+	in31 = OpenMaya.MObject()
+	in32 = OpenMaya.MObject()
+	in33 = OpenMaya.MObject()
+		
+	out_t = OpenMaya.MObject()
+	out_r = OpenMaya.MObject()
+	out_s = OpenMaya.MObject()
+	out_sh = OpenMaya.MObject()
+	
+	out_shXY = OpenMaya.MObject()
+	out_shXZ = OpenMaya.MObject()
+	out_shYZ = OpenMaya.MObject()
+	
+	out_matrix = OpenMaya.MObject()
+	out_worldMatrix = OpenMaya.MObject()
+	out_quat = OpenMaya.MObject()
+	
+	out_quatX = OpenMaya.MObject()
+	out_quatY = OpenMaya.MObject()
+	out_quatZ = OpenMaya.MObject()
+	out_quatW = OpenMaya.MObject()
+	
+	offset_t = OpenMaya.MObject()
+	offset_r = OpenMaya.MObject()
+	offset_s = OpenMaya.MObject()
+	
+	eulRotateOrder = OpenMaya.MObject()
+	normalize = OpenMaya.MObject()
+	decompositionMode = OpenMaya.MObject()
+	
+	# the matrixIn and outputQuaternion children in order and the matrixIn children
+	# each output and setDependentsDirty() look at, filled in by nodeInitializer()
+	matrixInChildren = ()
+	out_quatChildren = ()
+	translateRow = ()
+	rotateRows = ()
+	translateColumn = ()
+
+	cacheMode = OpenMaya.MObject()
+	cacheSize = OpenMaya.MObject()
+
+	def __init__(self):
+		OpenMayaMPx.MPxNode.__init__(self)
+		
+		# the per node cache used with cacheMode set to Node, it is created here
+		# and not in compute() so evaluation never adds to the module level table
+		self.cache = rtMatrixCache.rtMatrixCache()
+		nodeCaches[self] = self.cache
+		
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kMatrixUtilNodeTypeName )
+	
+	# compute() only touches its own data block and node, the shared cache has
+	# its own lock, so the evaluation manager can run these nodes in parallel
+	def schedulingType(self):
+		return OpenMayaMPx.MPxNode.kParallel
+	
+	# Maya passes the plugs the node table says an input affects in plugArray, the
+	# ones a change can not reach are taken out so nothing downstream is dirtied.
+	# matrixIn is not read while inputMatrix is connected and in03, in13 and in23
+	# only reach the decomposition through the translation of parentInverseMatrix,
+	# the matrix outputs carry them as they are. When no input is connected, a
+	# setAttr or the Attribute Editor, the outputs are computed again and the ones
+	# that come out the same are taken out as well. Connected inputs always dirty
+	# their outputs, see rtNodeSpec.unchangedOutputs(). The evaluation manager builds
+	# its graph from the table and does not ask
+	def setDependentsDirty(self, plug, plugArray):
+		
+		if plug.isChild() and plug.parent() == rtMatrixUtilNode.matrixIn:
+			if self.isConnected( rtMatrixUtilNode.inputMatrix ):
+				plugArray.clear()
+			elif any( [ plug == attribute for attribute in rtMatrixUtilNode.translateColumn ] ) and not self.parentTranslated():
+				kept = [ plugArray[i] for i in range( plugArray.length() ) if plugArray[i] == rtMatrixUtilNode.out_matrix or
+						plugArray[i] == rtMatrixUtilNode.out_worldMatrix ]
+				plugArray.clear()
+				for dependent in kept:
+					plugArray.append( dependent )
+		
+		unchanged = self.unchangedOutputs( [ plugArray[i].attribute() for i in range( plugArray.length() ) ] )
+		if unchanged:
+			kept = [ plugArray[i] for i in range( plugArray.length() ) if not any( [ plugArray[i] == attribute for attribute in unchanged ] ) ]
+			plugArray.clear()
+			for dependent in kept:
+				plugArray.append( dependent )
+		return OpenMayaMPx.MPxNode.setDependentsDirty( self, plug, plugArray )
+	
+	# whether parentInverseMatrix has a translation, read from its plug and not kept
+	# from compute(). A connected one counts as translated, reading it would evaluate
+	# the nodes upstream in the middle of dirty propagation
+	def parentTranslated(self):
+		
+		plug = OpenMaya.MPlug( self.thisMObject(), rtMatrixUtilNode.parentInverseMatrix )
+		if plug.isConnected():
+			return True
+		row = matrixToList( OpenMaya.MFnMatrixData( plug.asMObject() ).matrix() )[3]
+		return row[0] != 0.0 or row[1] != 0.0 or row[2] != 0.0
+	
+	# arguments ( self, MPlug, MDataBlock), the outputs are computed by
+	# rtNodeSpec.rtMatrixToTRSCompute, shared with the API 2.0 version
+	def compute(self, plug, dataBlock):
+		
+		# a request for a child like outputTranslateX computes the whole vector
+		if plug.isChild():
+			plug = plug.parent()
+		if not self.computePlug( plug, dataBlock ):
+			return OpenMaya.kUnknownParameter
+		return OpenMaya.MStatus.kSuccess
+	
+	# True if an output is dirty and connected so it is going to be computed
+	def isPending(self, dataBlock, attribute):
+		if dataBlock.isClean( attribute ):
+			return False
+		outputPlug = OpenMaya.MPlug( self.thisMObject(), attribute )
+		return outputPlug.isConnected() or outputPlug.numConnectedChildren() > 0
+	
+	# True if the plug of an input attribute or one of its children is connected
+	def isConnected(self, attribute):
+		plug = OpenMaya.MPlug( self.thisMObject(), attribute )
+		return plug.isConnected() or plug.numConnectedChildren() > 0
+	
+	# the rows of an MMatrix
+	def matrixToList(self, matrix):
+		return matrixToList( matrix )
+	
+	# get an MDataHandle to an input attribute, a failure raises to Maya
+	# which reports it, compute() itself never writes to the output streams
+	def inputValue(self, dataBlock, attribute):
+		return dataBlock.inputValue( attribute )
+	
+	# get the values of a list of float attributes
+	def inputFloats(self, dataBlock, attributes):
+		return [ self.inputValue( dataBlock, attribute ).asFloat() for attribute in attributes ]
+	
+	# set a vector output plus its offset and clean the plug so maya knows it can update
+	def setOutput(self, dataBlock, attribute, value, offset=None):
+		outputHandle = dataBlock.outputValue( attribute )
+		if offset is None:
+			outputHandle.setMFloatVector( OpenMaya.MFloatVector( value[0], value[1], value[2] ) )
+		else:
+			outputHandle.setMFloatVector( OpenMaya.MFloatVector( value[0], value[1], value[2] ) + offset )
+		outputHandle.setClean()
+	
+	# set a matrix output from the rows of a rtMatrixKernel matrix
+	def setMatrix(self, dataBlock, attribute, rows):
+		outputHandle = dataBlock.outputValue( attribute )
+		outputHandle.setMMatrix( listToMatrix( rows ) )
+		outputHandle.setClean()
+	
+	# the scale, euler rotation in degrees and shear of the first three rows, taken from
+	# MTransformationMatrix like the node always did. rtMatrixKernel only takes over for
+	# the polar mode, it has not been checked against the output of Maya yet
+	def decomposeMatrix(self, matrix, mode_value, rotOrder_value, needRotation):
+		
+		if mode_value != rtMatrixKernel.kDecomposeTransformationMatrix:
+			return self.decomposeKernel( matrix, mode_value, rotOrder_value, needRotation )
+		
+		mTM = OpenMaya.MTransformationMatrix( listToMatrix( matrix + [ [ 0.0, 0.0, 0.0, 1.0 ] ] ) )
+		
+		rot = None
+		if needRotation:
+			eulerRotation = mTM.rotation().asEulerRotation()
+			eulerRotation.reorderIt( rotOrder_value )
+			rot = [ math.degrees( eulerRotation.x ), math.degrees( eulerRotation.y ), math.degrees( eulerRotation.z ) ]
+		
+		# get the scale and shear from MScriptUtil double pointers
+		scaleDoubleArray = OpenMaya.MScriptUtil()
+		scaleDoubleArray.createFromList( [ 0.0, 0.0, 0.0 ], 3 )
+		scaleDoubleArrayPtr = scaleDoubleArray.asDoublePtr()
+		mTM.getScale( scaleDoubleArrayPtr, OpenMaya.MSpace.kTransform )
+		scale = [ OpenMaya.MScriptUtil.getDoubleArrayItem( scaleDoubleArrayPtr, i ) for i in range(3) ]
+		
+		shearDoubleArray = OpenMaya.MScriptUtil()
+		shearDoubleArray.createFromList( [ 0.0, 0.0, 0.0 ], 3 )
+		shearDoubleArrayPtr = shearDoubleArray.asDoublePtr()
+		mTM.getShear( shearDoubleArrayPtr, OpenMaya.MSpace.kTransform )
+		shear = [ OpenMaya.MScriptUtil.getDoubleArrayItem( shearDoubleArrayPtr, i ) for i in range(3) ]
+		
+		return scale, rot, shear
+	
+def nodeCreator():
+
+	return OpenMayaMPx.asMPxPtr( rtMatrixUtilNode() )
+
+# create and initialize the attributes to the node
+def nodeInitializer():
+
+	rtNodeSpec.createAttributes( rtMatrixUtilNode, rtNodeSpec.matrixToTRS, OpenMaya )
+	
+	# the last row of the matrix gives the translation, the first three rows
+	# give the rotation and scale
+	rtMatrixUtilNode.translateRow = rtMatrixUtilNode.matrixInChildren[12:16]
+	rtMatrixUtilNode.rotateRows = rtMatrixUtilNode.matrixInChildren[0:12]
+	rtMatrixUtilNode.translateColumn = rtMatrixUtilNode.matrixInChildren[3:12:4]
+	
+	
+# -----------------------------------------------------------------------------------
+# array variant of the node
+# one node decomposes every matrix connected to the inputMatrix multi attribute
+# in a single vectorized pass of rtMatrixKernel.decompose(), all of them with the
+# same parentInverseMatrix, eulerRotateOrder, normalize and decompositionMode
+# -----------------------------------------------------------------------------------
+class rtMatrixArrayUtilNode(OpenMayaMPx.MPxNode):
+
+	# class variables
+	
+	inputMatrix = OpenMaya.MObject()
+	parentIndex = OpenMaya.MObject()
+	parentInverseMatrix = OpenMaya.MObject()
+	
+	eulRotateOrder = OpenMaya.MObject()
+	normalize = OpenMaya.MObject()
+	decompositionMode = OpenMaya.MObject()
+	
+	out_t = OpenMaya.MObject()
+	out_r = OpenMaya.MObject()
+	out_s = OpenMaya.MObject()
+	out_points = OpenMaya.MObject()
+
+	def __init__(self):
+		OpenMayaMPx.MPxNode.__init__(self)
+		
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kMatrixArrayNodeTypeName )
+		
+	# compute() keeps no state between calls
+	def schedulingType(self):
+		return OpenMayaMPx.MPxNode.kParallel
+		
+	# arguments ( self, MPlug, MDataBlock) 
+	def compute(self, plug, dataBlock):
+		
+		# the three vector arrays are always computed together, outputPoints on its
+		# own so a node that only drives an instancer never builds them
+		if plug == rtMatrixArrayUtilNode.out_points:
+			points = True
+		elif plug == rtMatrixArrayUtilNode.out_t or plug == rtMatrixArrayUtilNode.out_r or \
+			plug == rtMatrixArrayUtilNode.out_s:
+			points = False
+		else:
+			return OpenMaya.kUnknownParameter
+		
+		rtMatrixStats.measure( self.stats, self.computeOutputs, dataBlock, points )
+		return OpenMaya.MStatus.kSuccess
+	
+	# compute the three output arrays or outputPoints when points is True, stats is the
+	# node rtNodeStats while rtMatrixStats is enabled and None otherwise
+	def computeOutputs(self, dataBlock, points, stats):
+		
+		pInvMatrix_value = dataBlock.inputValue( rtMatrixArrayUtilNode.parentInverseMatrix ).asMatrix()
+		normalize_value = dataBlock.inputValue( rtMatrixArrayUtilNode.normalize ).asBool()
+		
+		# Note there is a Maya Python bug with enum attributes
+		# you must use MDataHandle.asShort() to get the proper value
+		rotOrder_value = dataBlock.inputValue( rtMatrixArrayUtilNode.eulRotateOrder ).asShort()
+		mode_value = dataBlock.inputValue( rtMatrixArrayUtilNode.decompositionMode ).asShort()
+		
+		# gather the 16 values of every input matrix in logical index order, the
+		# logical indices are the particle ids of outputPoints
+		matrices_arrayHandle = dataBlock.inputArrayValue( rtMatrixArrayUtilNode.inputMatrix )
+		matrixCount = matrices_arrayHandle.elementCount()
+		matrixValues = []
+		indices = []
+		for i in range( matrixCount ):
+			matrices_arrayHandle.jumpToArrayElement( i )
+			indices.append( matrices_arrayHandle.elementIndex() )
+			matrix = matrices_arrayHandle.inputValue().asMatrix()
+			matrixValues.extend( [ matrix(row, column) for row in range(4) for column in range(4) ] )
+		parents = self.inputParents( dataBlock, indices )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kInputReads )
+		
+		# every instance is decomposed in one vectorized pass, ( N,3 ) rows as lists
+		if matrixCount:
+			if parents is not None:
+				# the inputs are local matrices, the whole hierarchy is solved at once
+				matrixValues = rtMatrixKernel.hierarchyMatrices( matrixValues, parents )
+			trans, rot, scale = rtMatrixKernel.decompose( matrixValues, matrixToList( pInvMatrix_value ),
+								rotOrder_value, normalize_value, decompositionMode=mode_value )
+			rows = ( trans.tolist(), rot.tolist(), scale.tolist() )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kDecomposition )
+		else:
+			rows = ( [], [], [] )
+		
+		if points:
+			# the arrays an instancer reads from its inputPoints, rotation in degrees
+			# in the eulerRotateOrder of the node
+			pointsData = OpenMaya.MFnArrayAttrsData()
+			outputData = pointsData.create()
+			for name, values in zip( ( "position", "rotation", "scale" ), rows ):
+				setVectorArray( pointsData.vectorArray( name ), values )
+			ids = pointsData.doubleArray( "id" )
+			ids.setLength( matrixCount )
+			for i, index in enumerate( indices ):
+				ids.set( index, i )
+			outputHandle = dataBlock.outputValue( rtMatrixArrayUtilNode.out_points )
+			outputHandle.setMObject( outputData )
+			outputHandle.setClean()
+		else:
+			# set the output arrays and clean all three plugs
+			for attribute, values in zip( ( rtMatrixArrayUtilNode.out_t, rtMatrixArrayUtilNode.out_r, rtMatrixArrayUtilNode.out_s ), rows ):
+				vectorArray = OpenMaya.MVectorArray()
+				setVectorArray( vectorArray, values )
+				outputData = OpenMaya.MFnVectorArrayData().create( vectorArray )
+				outputHandle = dataBlock.outputValue( attribute )
+				outputHandle.setMObject( outputData )
+				outputHandle.setClean()
+		if stats is not None:
+			stats.lap( rtMatrixStats.kOutputWrites )
+	
+	# the position of the parent of every gathered matrix from parentIndex, which holds
+	# logical indices, -1 for a root. None when parentIndex is empty, the matrices are
+	# then decomposed as they are
+	def inputParents(self, dataBlock, indices):
+		data = dataBlock.inputValue( rtMatrixArrayUtilNode.parentIndex ).data()
+		if data.isNull():
+			return None
+		parentIndex = OpenMaya.MFnIntArrayData( data ).array()
+		count = parentIndex.length()
+		if not count:
+			return None
+		positions = dict( [ ( index, position ) for position, index in enumerate( indices ) ] )
+		parents = []
+		for index in indices:
+			parent = parentIndex[index] if index < count else -1
+			if parent < 0:
+				parents.append( -1 )
+			elif parent in positions:
+				parents.append( positions[parent] )
+			else:
+				raise ValueError( "%s: the parent %d of inputMatrix[%d] is not connected" % ( kMatrixArrayNodeTypeName, parent, index ) )
+		return parents
+
+def arrayNodeCreator():
+
+	return OpenMayaMPx.asMPxPtr( rtMatrixArrayUtilNode() )
+
+# create and initialize the attributes to the array node
+def arrayNodeInitializer():
+
+	rtNodeSpec.createAttributes( rtMatrixArrayUtilNode, rtNodeSpec.matrixArrayToTRS, OpenMaya )
+	
+	
+# -----------------------------------------------------------------------------------
+# compose node, the inverse of rt4x4MatrixToTRS
+# translate, rotate, scale and shear with the same offsets and rotate order go back
+# to a matrix, times an optional parentMatrix, as a matrix and as 16 floats.
+# The outputs of rt4x4MatrixToTRS connected with the same rotate order give back
+# the matrix that went in
+# -----------------------------------------------------------------------------------
+class rtTRSMatrixUtilNode(OpenMayaMPx.MPxNode):
+
+	# class variables
+	
+	in_t = OpenMaya.MObject()
+	in_r = OpenMaya.MObject()
+	in_s = OpenMaya.MObject()
+	in_sh = OpenMaya.MObject()
+	
+	in_shXY = OpenMaya.MObject()
+	in_shXZ = OpenMaya.MObject()
+	in_shYZ = OpenMaya.MObject()
+	
+	offset_t = OpenMaya.MObject()
+	offset_r = OpenMaya.MObject()
+	offset_s = OpenMaya.MObject()
+	
+	eulRotateOrder = OpenMaya.MObject()
+	parentMatrix = OpenMaya.MObject()
+	
+	out_matrix = OpenMaya.MObject()
+	matrixOut = OpenMaya.MObject()
+	
+	# the matrixOut children out00 to out33, filled in by composeNodeInitializer()
+	matrixOutChildren = ()
+
+	def __init__(self):
+		OpenMayaMPx.MPxNode.__init__(self)
+		
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kComposeNodeTypeName )
+		
+	# compute() keeps no state between calls
+	def schedulingType(self):
+		return OpenMayaMPx.MPxNode.kParallel
+		
+	# arguments ( self, MPlug, MDataBlock) 
+	def compute(self, plug, dataBlock):
+		
+		# a request for a child like out30 computes the whole matrix
+		if plug.isChild():
+			plug = plug.parent()
+		
+		# both outputs are always computed together
+		if plug != rtTRSMatrixUtilNode.out_matrix and plug != rtTRSMatrixUtilNode.matrixOut:
+			return OpenMaya.kUnknownParameter
+		
+		rtMatrixStats.measure( self.stats, self.computeOutputs, dataBlock )
+		return OpenMaya.MStatus.kSuccess
+	
+	# compute the matrix outputs, stats is the node rtNodeStats while rtMatrixStats
+	# is enabled and None otherwise
+	def computeOutputs(self, dataBlock, stats):
+		
+		translate = dataBlock.inputValue( rtTRSMatrixUtilNode.in_t ).asFloatVector()
+		rotate = dataBlock.inputValue( rtTRSMatrixUtilNode.in_r ).asFloatVector()
+		scale = dataBlock.inputValue( rtTRSMatrixUtilNode.in_s ).asFloatVector()
+		shear = dataBlock.inputValue( rtTRSMatrixUtilNode.in_sh ).asFloatVector()
+		offset_t_value = dataBlock.inputValue( rtTRSMatrixUtilNode.offset_t ).asFloatVector()
+		offset_r_value = dataBlock.inputValue( rtTRSMatrixUtilNode.offset_r ).asFloatVector()
+		offset_s_value = dataBlock.inputValue( rtTRSMatrixUtilNode.offset_s ).asFloatVector()
+		
+		# Note there is a Maya Python bug with enum attributes
+		# you must use MDataHandle.asShort() to get the proper value
+		rotOrder_value = dataBlock.inputValue( rtTRSMatrixUtilNode.eulRotateOrder ).asShort()
+		pMatrix_value = matrixToList( dataBlock.inputValue( rtTRSMatrixUtilNode.parentMatrix ).asMatrix() )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kInputReads )
+		
+		matrix = rtMatrixKernel.trsToMatrix( ( translate.x, translate.y, translate.z ), ( rotate.x, rotate.y, rotate.z ),
+						( scale.x, scale.y, scale.z ), ( shear.x, shear.y, shear.z ), rotOrder_value, pMatrix_value,
+						( offset_t_value.x, offset_t_value.y, offset_t_value.z ),
+						( offset_r_value.x, offset_r_value.y, offset_r_value.z ),
+						( offset_s_value.x, offset_s_value.y, offset_s_value.z ) )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kMatrixBuild )
+		
+		outputHandle = dataBlock.outputValue( rtTRSMatrixUtilNode.out_matrix )
+		outputHandle.setMMatrix( listToMatrix( matrix ) )
+		outputHandle.setClean()
+		
+		values = matrix[0] + matrix[1] + matrix[2] + matrix[3]
+		for attribute, value in zip( rtTRSMatrixUtilNode.matrixOutChildren, values ):
+			outputHandle = dataBlock.outputValue( attribute )
+			outputHandle.setFloat( value )
+			outputHandle.setClean()
+		dataBlock.outputValue( rtTRSMatrixUtilNode.matrixOut ).setClean()
+		if stats is not None:
+			stats.lap( rtMatrixStats.kOutputWrites )
+
+def composeNodeCreator():
+
+	return OpenMayaMPx.asMPxPtr( rtTRSMatrixUtilNode() )
+
+# create and initialize the attributes to the compose node
+def composeNodeInitializer():
+
+	rtNodeSpec.createAttributes( rtTRSMatrixUtilNode, rtNodeSpec.trsToMatrix, OpenMaya )
+	
+	
+# -----------------------------------------------------------------------------------
+# array variant of the compose node
+# the vector arrays of rt4x4MatrixArrayToTRS go back to one matrix per entry in a
+# single vectorized pass of rtMatrixKernel.compose()
+# -----------------------------------------------------------------------------------
+class rtTRSMatrixArrayUtilNode(OpenMayaMPx.MPxNode):
+
+	# class variables
+	
+	in_t = OpenMaya.MObject()
+	in_r = OpenMaya.MObject()
+	in_s = OpenMaya.MObject()
+	in_sh = OpenMaya.MObject()
+	
+	eulRotateOrder = OpenMaya.MObject()
+	parentMatrix = OpenMaya.MObject()
+	
+	out_matrix = OpenMaya.MObject()
+
+	def __init__(self):
+		OpenMayaMPx.MPxNode.__init__(self)
+		
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kComposeArrayNodeTypeName )
+		
+	# compute() keeps no state between calls
+	def schedulingType(self):
+		return OpenMayaMPx.MPxNode.kParallel
+		
+	# arguments ( self, MPlug, MDataBlock) 
+	def compute(self, plug, dataBlock):
+		
+		# every element of outputMatrix is computed together
+		if plug != rtTRSMatrixArrayUtilNode.out_matrix:
+			return OpenMaya.kUnknownParameter
+		
+		rtMatrixStats.measure( self.stats, self.computeOutputs, dataBlock )
+		return OpenMaya.MStatus.kSuccess
+	
+	# compute the outputMatrix elements, stats is the node rtNodeStats while rtMatrixStats
+	# is enabled and None otherwise
+	def computeOutputs(self, dataBlock, stats):
+		
+		translates = self.inputVectors( dataBlock, rtTRSMatrixArrayUtilNode.in_t )
+		rotates = self.inputVectors( dataBlock, rtTRSMatrixArrayUtilNode.in_r )
+		scales = self.inputVectors( dataBlock, rtTRSMatrixArrayUtilNode.in_s )
+		shears = self.inputVectors( dataBlock, rtTRSMatrixArrayUtilNode.in_sh )
+		rotOrder_value = dataBlock.inputValue( rtTRSMatrixArrayUtilNode.eulRotateOrder ).asShort()
+		pMatrix_value = matrixToList( dataBlock.inputValue( rtTRSMatrixArrayUtilNode.parentMatrix ).asMatrix() )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kInputReads )
+		
+		# there is one matrix per entry of the longest array, missing entries of the
+		# other arrays are identity values
+		matrixCount = max( len( translates ), len( rotates ), len( scales ), len( shears ) )
+		matrices = []
+		if matrixCount:
+			def padded(values, default):
+				return values + [ default ] * ( matrixCount - len( values ) )
+			matrices = rtMatrixKernel.compose( padded( translates, ( 0.0, 0.0, 0.0 ) ), padded( rotates, ( 0.0, 0.0, 0.0 ) ),
+							padded( scales, ( 1.0, 1.0, 1.0 ) ), padded( shears, ( 0.0, 0.0, 0.0 ) ),
+							rotOrder_value, pMatrix_value ).reshape( (-1, 16) ).tolist()
+		if stats is not None:
+			stats.lap( rtMatrixStats.kMatrixBuild )
+		
+		# replace the elements of outputMatrix and clean it
+		outputArrayHandle = dataBlock.outputArrayValue( rtTRSMatrixArrayUtilNode.out_matrix )
+		builder = OpenMaya.MArrayDataBuilder( dataBlock, rtTRSMatrixArrayUtilNode.out_matrix, matrixCount )
+		for i, values in enumerate( matrices ):
+			matrix = OpenMaya.MMatrix()
+			OpenMaya.MScriptUtil.createMatrixFromList( values, matrix )
+			builder.addElement( i ).setMMatrix( matrix )
+		outputArrayHandle.set( builder )
+		outputArrayHandle.setAllClean()
+		if stats is not None:
+			stats.lap( rtMatrixStats.kOutputWrites )
+	
+	# the ( x, y, z ) values of a vector array input, an unset array is empty
+	def inputVectors(self, dataBlock, attribute):
+		data = dataBlock.inputValue( attribute ).data()
+		if data.isNull():
+			return []
+		array = OpenMaya.MFnVectorArrayData( data ).array()
+		return [ ( array[i].x, array[i].y, array[i].z ) for i in range( array.length() ) ]
+
+def composeArrayNodeCreator():
+
+	return OpenMayaMPx.asMPxPtr( rtTRSMatrixArrayUtilNode() )
+
+# create and initialize the attributes to the compose array node
+def composeArrayNodeInitializer():
+
+	rtNodeSpec.createAttributes( rtTRSMatrixArrayUtilNode, rtNodeSpec.trsArrayToMatrix, OpenMaya )
+	
+	
+# -----------------------------------------------------------------------------------
+# cache reader node
+# plays back translate, rotate and scale of one node of a rtTRSCache file, the
+# values are read from the memory mapped file at the current time so nothing is
+# decomposed, every reader of a file shares one map of it. A time between two baked
+# frames gets the closest one
+# -----------------------------------------------------------------------------------
+class rtTRSCacheReaderNode(OpenMayaMPx.MPxNode):
+
+	# class variables
+	
+	cacheFile = OpenMaya.MObject()
+	cacheNode = OpenMaya.MObject()
+	time = OpenMaya.MObject()
+	
+	out_t = OpenMaya.MObject()
+	out_r = OpenMaya.MObject()
+	out_s = OpenMaya.MObject()
+
+	def __init__(self):
+		OpenMayaMPx.MPxNode.__init__(self)
+		
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kCacheReaderNodeTypeName )
+		
+		# the open file and the index of cacheNode in it as one tuple, set by
+		# resolve() outside of the evaluation and only read by compute()
+		self.cacheEntry = ( None, None )
+		self.cacheKey = None
+		
+	# compute() only reads the file resolve() found, through a read only memory map,
+	# so the evaluation manager can run these nodes in parallel
+	def schedulingType(self):
+		return OpenMayaMPx.MPxNode.kParallel
+		
+	# the file and node are looked up when cacheFile or cacheNode change, on the first
+	# dirty after the node was created or loaded and after rtTRSCache.refresh() or
+	# write() closed the file. A change of time dirties the outputs, so a file written
+	# again is picked up on the next frame
+	def setDependentsDirty(self, plug, plugArray):
+		
+		if plug == rtTRSCacheReaderNode.cacheFile or plug == rtTRSCacheReaderNode.cacheNode or \
+			self.cacheKey is None or self.cacheKey[2] != rtTRSCache.generation:
+			self.resolve()
+		return OpenMayaMPx.MPxNode.setDependentsDirty( self, plug, plugArray )
+	
+	# arguments ( self, MPlug, MDataBlock) 
+	def compute(self, plug, dataBlock):
+		
+		# a request for a child like outputTranslateX computes all three outputs
+		if plug.isChild():
+			plug = plug.parent()
+		
+		if plug != rtTRSCacheReaderNode.out_t and plug != rtTRSCacheReaderNode.out_r and \
+			plug != rtTRSCacheReaderNode.out_s:
+			return OpenMaya.kUnknownParameter
+		
+		rtMatrixStats.measure( self.stats, self.computeOutputs, dataBlock )
+		return OpenMaya.MStatus.kSuccess
+	
+	# open the cache file and find the node, an empty cacheNode plays the first node
+	# of the file, a file or node that can not be found plays zeros and is reported
+	# once with a warning. The strings are read from their plugs
+	def resolve(self):
+		
+		thisNode = self.thisMObject()
+		path = OpenMaya.MPlug( thisNode, rtTRSCacheReaderNode.cacheFile ).asString()
+		name = OpenMaya.MPlug( thisNode, rtTRSCacheReaderNode.cacheNode ).asString()
+		key = ( path, name, rtTRSCache.generation )
+		if key == self.cacheKey:
+			return
+		changed = self.cacheKey is None or key[:2] != self.cacheKey[:2]
+		self.cacheKey = key
+		self.cacheEntry = ( None, None )
+		if not path:
+			return
+		
+		try:
+			cache = rtTRSCache.openCache( path )
+		except ( IOError, OSError, ValueError ) as error:
+			message = str( error )
+		else:
+			index = cache.nodeIndex( name ) if name else 0
+			if index is not None and cache.names:
+				self.cacheEntry = ( cache, index )
+				return
+			message = "%s is not in %s" % ( name, path )
+		if changed:
+			OpenMaya.MGlobal.displayWarning( "%s %s: %s" % ( kCacheReaderNodeTypeName,
+							OpenMaya.MFnDependencyNode( thisNode ).name(), message ) )
+	
+	# read the cached values at the current time, stats is the node rtNodeStats while
+	# rtMatrixStats is enabled and None otherwise
+	def computeOutputs(self, dataBlock, stats):
+		
+		frame = dataBlock.inputValue( rtTRSCacheReaderNode.time ).asTime().asUnits( OpenMaya.MTime.uiUnit() )
+		cache, index = self.cacheEntry
+		if stats is not None:
+			stats.lap( rtMatrixStats.kInputReads )
+		
+		# a file closed by rtTRSCache plays zeros until the next dirty opens it again
+		if cache is None or cache.closed:
+			trans, rot, scale = ( 0.0, 0.0, 0.0 ), ( 0.0, 0.0, 0.0 ), ( 1.0, 1.0, 1.0 )
+		else:
+			trans, rot, scale = cache.sample( index, frame )
+		
+		for attribute, value in ( ( rtTRSCacheReaderNode.out_t, trans ),
+					( rtTRSCacheReaderNode.out_r, rot ),
+					( rtTRSCacheReaderNode.out_s, scale ) ):
+			outputHandle = dataBlock.outputValue( attribute )
+			outputHandle.setMFloatVector( OpenMaya.MFloatVector( value[0], value[1], value[2] ) )
+			outputHandle.setClean()
+		if stats is not None:
+			stats.lap( rtMatrixStats.kOutputWrites )
+
+def cacheReaderNodeCreator():
+
+	return OpenMayaMPx.asMPxPtr( rtTRSCacheReaderNode() )
+
+# create and initialize the attributes to the cache reader node
+def cacheReaderNodeInitializer():
+
+	rtNodeSpec.createAttributes( rtTRSCacheReaderNode, rtNodeSpec.trsCacheReader, OpenMaya )
+	
+	
+# -----------------------------------------------------------------------------------
+# sub frame sampling
+# motion blur needs the same nodes at many times around a frame, instead of pulling
+# every sample through the DG the inputs are read once per time in a time context
+# and all the samples of all the nodes are decomposed in one vectorized pass
+# -----------------------------------------------------------------------------------
+
+kSampleCommandName = "rt4x4MatrixToTRSSample"
+kTimeFlag = "-t"
+kTimeFlagLong = "-time"
+
+# the MObject of a rt4x4MatrixToTRS node given by name or as an MObject
+def matrixUtilNode(node):
+	
+	if not isinstance( node, OpenMaya.MObject ):
+		selection = OpenMaya.MSelectionList()
+		try:
+			selection.add( node )
+		except RuntimeError:
+			raise ValueError( "%s: no such node" % node )
+		node = OpenMaya.MObject()
+		selection.getDependNode( 0, node )
+	fnNode = OpenMaya.MFnDependencyNode( node )
+	if fnNode.typeName() != kMatrixUtilNodeTypeName:
+		raise ValueError( "%s is not a %s node" % ( fnNode.name(), kMatrixUtilNodeTypeName ) )
+	return node
+
+# the inputs of a rt4x4MatrixToTRS node at every time, each plug is read once per time,
+# compounds through one data handle. Returns the 16 matrix values, the
+# parentInverseMatrix rows, the three offsets and ( normalize, rotate order,
+# decompositionMode ) of every time
+def sampleInputs(node, times):
+	
+	matrixPlug = OpenMaya.MPlug( node, rtMatrixUtilNode.inputMatrix )
+	connected = matrixPlug.isConnected()
+	matrixInPlug = OpenMaya.MPlug( node, rtMatrixUtilNode.matrixIn )
+	pInvPlug = OpenMaya.MPlug( node, rtMatrixUtilNode.parentInverseMatrix )
+	offsetPlugs = [ OpenMaya.MPlug( node, attribute ) for attribute in
+			( rtMatrixUtilNode.offset_t, rtMatrixUtilNode.offset_r, rtMatrixUtilNode.offset_s ) ]
+	settingPlugs = [ OpenMaya.MPlug( node, attribute ) for attribute in
+			( rtMatrixUtilNode.normalize, rtMatrixUtilNode.eulRotateOrder, rtMatrixUtilNode.decompositionMode ) ]
+	
+	matrices = []
+	parentInverses = []
+	offsets = []
+	settings = []
+	for time in times:
+		context = OpenMaya.MDGContext( OpenMaya.MTime( time, OpenMaya.MTime.uiUnit() ) )
+		
+		# like compute(), a connected inputMatrix is used instead of the 16 floats
+		if connected:
+			matrix = OpenMaya.MFnMatrixData( matrixPlug.asMObject( context ) ).matrix()
+			matrices.append( [ matrix(row, column) for row in range(4) for column in range(4) ] )
+		else:
+			handle = matrixInPlug.asMDataHandle( context )
+			matrices.append( [ handle.child( child ).asFloat() for child in rtMatrixUtilNode.matrixInChildren ] )
+			matrixInPlug.destructHandle( handle )
+		parentInverses.append( matrixToList( OpenMaya.MFnMatrixData( pInvPlug.asMObject( context ) ).matrix() ) )
+		
+		values = []
+		for plug in offsetPlugs:
+			handle = plug.asMDataHandle( context )
+			vector = handle.asFloatVector()
+			values.append( ( vector.x, vector.y, vector.z ) )
+			plug.destructHandle( handle )
+		offsets.append( values )
+		settings.append( ( settingPlugs[0].asBool( context ), settingPlugs[1].asShort( context ), settingPlugs[2].asShort( context ) ) )
+	return matrices, parentInverses, offsets, settings
+
+# evaluate rt4x4MatrixToTRS nodes at many times in one call, nodes are names or
+# MObjects and times are in the current time unit. The samples of all the nodes are
+# decomposed in one rtMatrixKernel.decompose() call for each normalize, rotate order
+# and decompositionMode in use, usually one. Needs numpy.
+# returns a list of ( node, times, ( translate, rotate, scale ) ), each a (T,3) array
+# of the values the node outputs, like rt4x4MatrixToTRS_evaluate.evaluateScene()
+def sampleNodes(nodes, times):
+	
+	import numpy
+	
+	times = [ float( time ) for time in times ]
+	nodes = [ matrixUtilNode( node ) for node in nodes ]
+	matrices = []
+	parentInverses = []
+	offsets = []
+	settings = []
+	for node in nodes:
+		nodeMatrices, nodeParentInverses, nodeOffsets, nodeSettings = sampleInputs( node, times )
+		matrices.extend( nodeMatrices )
+		parentInverses.extend( nodeParentInverses )
+		offsets.extend( nodeOffsets )
+		settings.extend( nodeSettings )
+	
+	matrices = numpy.array( matrices, dtype=numpy.float64 ).reshape( ( -1, 4, 4 ) )
+	parentInverses = numpy.array( parentInverses, dtype=numpy.float64 ).reshape( ( -1, 4, 4 ) )
+	offsets = numpy.array( offsets, dtype=numpy.float64 ).reshape( ( -1, 3, 3 ) )
+	values = numpy.empty( ( 3, len( settings ), 3 ) )
+	for key in sorted( set( settings ) ):
+		normalize_value, rotOrder_value, mode_value = key
+		rows = [ index for index, setting in enumerate( settings ) if setting == key ]
+		values[:, rows] = rtMatrixKernel.decompose( matrices[rows], parentInverses[rows], rotOrder_value, normalize_value,
+							offsets[rows, 0], offsets[rows, 1], offsets[rows, 2], mode_value )
+	
+	# the outputs of the node are float vectors
+	values = values.astype( numpy.float32 ).astype( numpy.float64 )
+	count = len( times )
+	return [ ( OpenMaya.MFnDependencyNode( node ).name(), numpy.array( times ),
+			tuple( values[:, index * count:( index + 1 ) * count] ) ) for index, node in enumerate( nodes ) ]
+
+# rt4x4MatrixToTRSSample -t 0.75 -t 1.0 -t 1.25 rt4x4MatrixToTRS1 rt4x4MatrixToTRS2;
+# returns the translate, rotate and scale, 9 values, of every node at every time, node
+# by node in the order given, without -t at the current time
+class rtSampleCommand(OpenMayaMPx.MPxCommand):
+	
+	def __init__(self):
+		OpenMayaMPx.MPxCommand.__init__(self)
+	
+	def doIt(self, args):
+		
+		argData = OpenMaya.MArgDatabase( self.syntax(), args )
+		times = []
+		for use in range( argData.numberOfFlagUses( kTimeFlag ) ):
+			flagArgs = OpenMaya.MArgList()
+			argData.getFlagArgumentList( kTimeFlag, use, flagArgs )
+			times.append( flagArgs.asDouble( 0 ) )
+		if not times:
+			times.append( OpenMaya.MAnimControl.currentTime().asUnits( OpenMaya.MTime.uiUnit() ) )
+		names = OpenMaya.MStringArray()
+		argData.getObjects( names )
+		
+		try:
+			results = sampleNodes( [ names[i] for i in range( names.length() ) ], times )
+		except ValueError as error:
+			OpenMaya.MGlobal.displayError( "%s: %s" % ( kSampleCommandName, error ) )
+			raise
+		
+		values = OpenMaya.MDoubleArray()
+		for name, sampleTimes, channels in results:
+			for vectors in zip( *[ channel.tolist() for channel in channels ] ):
+				for vector in vectors:
+					for value in vector:
+						values.append( value )
+		self.setResult( values )
+
+def sampleCommandCreator():
+	
+	return OpenMayaMPx.asMPxPtr( rtSampleCommand() )
+
+def sampleCommandSyntax():
+	
+	syntax = OpenMaya.MSyntax()
+	syntax.addFlag( kTimeFlag, kTimeFlagLong, OpenMaya.MSyntax.kDouble )
+	syntax.makeFlagMultiUse( kTimeFlag )
+	syntax.setObjectType( OpenMaya.MSyntax.kStringObjects, 1 )
+	return syntax
+	
+	
+# the node types of the plugin, each with its rtNodeSpec table, creator and initializer
+kNodeTypes = ( ( rtNodeSpec.matrixToTRS, nodeCreator, nodeInitializer ),
+		( rtNodeSpec.matrixArrayToTRS, arrayNodeCreator, arrayNodeInitializer ),
+		( rtNodeSpec.trsToMatrix, composeNodeCreator, composeNodeInitializer ),
+		( rtNodeSpec.trsArrayToMatrix, composeArrayNodeCreator, composeArrayNodeInitializer ),
+		( rtNodeSpec.trsCacheReader, cacheReaderNodeCreator, cacheReaderNodeInitializer ) )
+
+# initialize the script plug-in
+def initializePlugin(mobject):
+	mplugin = OpenMayaMPx.MFnPlugin(mobject, "Autodesk", "1.0", "Any")
+	for spec, creator, initializer in kNodeTypes:
+		try:
+			mplugin.registerNode( spec.typeName, OpenMaya.MTypeId( spec.typeId ), creator, initializer, OpenMayaMPx.MPxNode.kDependNode, spec.classification )
+		except:
+			sys.stderr.write( "Failed to register node: %s" % spec.typeName )
+			raise
+	try:
+		mplugin.registerCommand( kSampleCommandName, sampleCommandCreator, sampleCommandSyntax )
+	except:
+		sys.stderr.write( "Failed to register command: %s" % kSampleCommandName )
+		raise
+
+
+# uninitialize the script plug-in
+def uninitializePlugin(mobject):
+	mplugin = OpenMayaMPx.MFnPlugin(mobject)
+	for spec, creator, initializer in kNodeTypes:
+		try:
+			mplugin.deregisterNode( OpenMaya.MTypeId( spec.typeId ) )
+		except:
+			sys.stderr.write( "Failed to deregister node: %s" % spec.typeName )
+			raise
+	try:
+		mplugin.deregisterCommand( kSampleCommandName )
+	except:
+		sys.stderr.write( "Failed to deregister command: %s" % kSampleCommandName )
+		raise
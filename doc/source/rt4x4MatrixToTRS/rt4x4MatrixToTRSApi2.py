@@ -0,0 +1,270 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS Version 1.0 ( Maya Python API 2.0 )
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# The rt4x4MatrixToTRS node written against maya.api.OpenMaya.
+#
+# It registers the same node type name, id and attribute layout as rt4x4MatrixToTRS.py,
+# both create their attributes from the rtNodeSpec.matrixToTRS table, so scenes saved
+# with either plugin open with the other. Load one or the other, both can not be
+# loaded at the same time. The compute is rtNodeSpec.rtMatrixToTRSCompute for both,
+# this file only has the calls that differ between the two APIs.
+#
+# API 2.0 hands values back as plain Python objects, a matrix is read as 16 doubles
+# in one call and there are no MScriptUtil pointers.
+#
+# rt4x4MatrixToTRS_bench.py times both versions against a stand-in OpenMaya, which
+# says little about which one is faster in Maya, rtMatrixStats times them in a scene.
+# -----------------------------------------------------------------------------------
+
+import sys
+import math
+import weakref
+import maya.api.OpenMaya as OpenMaya
+
+import rtMatrixKernel
+import rtMatrixCache
+import rtMatrixStats
+import rtNodeSpec
+
+# tell Maya this plugin uses the Python API 2.0
+def maya_useNewAPI():
+	pass
+
+# -----------------------------------------------------------------------------------
+# define the node type name
+# define the node class
+# define the node unique id ( use: cmds.getClassification( 'nodeName' ) to find a nodes class)
+# -----------------------------------------------------------------------------------
+kMatrixUtilNodeTypeName = rtNodeSpec.matrixToTRS.typeName
+kMatrixUtilNodeClassify = rtNodeSpec.matrixToTRS.classification
+kMatrixUtilNodeId = OpenMaya.MTypeId( rtNodeSpec.matrixToTRS.typeId )
+
+# the caches owned by nodes with cacheMode set to Node
+nodeCaches = weakref.WeakKeyDictionary()
+
+# hits, misses and sizes of the shared cache and of every node cache that was used by
+# node name, like rt4x4MatrixToTRS.cacheStats()
+def cacheStats():
+	stats = { "shared": rtMatrixCache.sharedCache.stats() }
+	for node, cache in list( nodeCaches.items() ):
+		if cache.hits or cache.misses:
+			stats[ OpenMaya.MFnDependencyNode( node.thisMObject() ).name() ] = cache.stats()
+	return stats
+
+# reset the hit and miss counters of every cache
+def resetCacheStats():
+	rtMatrixCache.sharedCache.resetCounters()
+	for cache in list( nodeCaches.values() ):
+		cache.resetCounters()
+
+
+# get the rows of an MMatrix as a list of lists for rtMatrixKernel
+def matrixToList(matrix):
+	values = list( matrix )
+	return [ values[0:4], values[4:8], values[8:12], values[12:16] ]
+
+# get an MMatrix from the rows of a rtMatrixKernel matrix
+def listToMatrix(rows):
+	return OpenMaya.MMatrix( [ value for row in rows for value in row ] )
+
+
+# define a new matrixUtilNode class derived from the MPxNode class
+class rtMatrixUtilNode(rtNodeSpec.rtMatrixToTRSCompute, OpenMaya.MPxNode):
+
+	# class variables
+
+	parentInverseMatrix = OpenMaya.MObject()
+
+	inputMatrix = OpenMaya.MObject()
+	matrixIn = OpenMaya.MObject()
+
+	out_t = OpenMaya.MObject()
+	out_r = OpenMaya.MObject()
+	out_s = OpenMaya.MObject()
+	out_sh = OpenMaya.MObject()
+
+	out_matrix = OpenMaya.MObject()
+	out_worldMatrix = OpenMaya.MObject()
+	out_quat = OpenMaya.MObject()
+
+	# the outputQuaternion children, filled in by nodeInitializer()
+	out_quatChildren = ()
+
+	offset_t = OpenMaya.MObject()
+	offset_r = OpenMaya.MObject()
+	offset_s = OpenMaya.MObject()
+
+	eulRotateOrder = OpenMaya.MObject()
+	normalize = OpenMaya.MObject()
+	decompositionMode = OpenMaya.MObject()
+
+	cacheMode = OpenMaya.MObject()
+	cacheSize = OpenMaya.MObject()
+
+	# the matrixIn children in00 to in33 and the ones each output and
+	# setDependentsDirty() look at, filled in by nodeInitializer()
+	matrixInChildren = ()
+	translateRow = ()
+	rotateRows = ()
+	translateColumn = ()
+
+	def __init__(self):
+		OpenMaya.MPxNode.__init__(self)
+
+		# the per node cache used with cacheMode set to Node, it is created here
+		# and not in compute() so evaluation never adds to the module level table
+		self.cache = rtMatrixCache.rtMatrixCache()
+		nodeCaches[self] = self.cache
+
+		# the evaluation counters, only written while rtMatrixStats is enabled
+		self.stats = rtMatrixStats.register( self, kMatrixUtilNodeTypeName )
+
+	# compute() only touches its own data block and node, the shared cache has
+	# its own lock, so the evaluation manager can run these nodes in parallel
+	def schedulingType(self):
+		return OpenMaya.MPxNode.kParallel
+
+	# Maya passes the plugs the node table says an input affects in plugArray, the
+	# ones a change can not reach are taken out so nothing downstream is dirtied.
+	# matrixIn is not read while inputMatrix is connected and in03, in13 and in23
+	# only reach the decomposition through the translation of parentInverseMatrix,
+	# the matrix outputs carry them as they are. When no input is connected, a
+	# setAttr or the Attribute Editor, the outputs are computed again and the ones
+	# that come out the same are taken out as well. Connected inputs always dirty
+	# their outputs, see rtNodeSpec.unchangedOutputs(). The evaluation manager builds
+	# its graph from the table and does not ask
+	def setDependentsDirty(self, plug, plugArray):
+
+		if plug.isChild and plug.parent() == rtMatrixUtilNode.matrixIn:
+			if self.isConnected( rtMatrixUtilNode.inputMatrix ):
+				plugArray.clear()
+			elif any( [ plug == attribute for attribute in rtMatrixUtilNode.translateColumn ] ) and not self.parentTranslated():
+				kept = [ plugArray[i] for i in range( len( plugArray ) ) if plugArray[i] == rtMatrixUtilNode.out_matrix or
+						plugArray[i] == rtMatrixUtilNode.out_worldMatrix ]
+				plugArray.clear()
+				for dependent in kept:
+					plugArray.append( dependent )
+
+		unchanged = self.unchangedOutputs( [ plugArray[i].attribute() for i in range( len( plugArray ) ) ] )
+		if unchanged:
+			kept = [ plugArray[i] for i in range( len( plugArray ) ) if not any( [ plugArray[i] == attribute for attribute in unchanged ] ) ]
+			plugArray.clear()
+			for dependent in kept:
+				plugArray.append( dependent )
+
+	# whether parentInverseMatrix has a translation, read from its plug and not kept
+	# from compute(). A connected one counts as translated, reading it would evaluate
+	# the nodes upstream in the middle of dirty propagation
+	def parentTranslated(self):
+
+		plug = OpenMaya.MPlug( self.thisMObject(), rtMatrixUtilNode.parentInverseMatrix )
+		if plug.isConnected:
+			return True
+		row = matrixToList( OpenMaya.MFnMatrixData( plug.asMObject() ).matrix() )[3]
+		return row[0] != 0.0 or row[1] != 0.0 or row[2] != 0.0
+
+	# arguments ( self, MPlug, MDataBlock ), the outputs are computed by
+	# rtNodeSpec.rtMatrixToTRSCompute, shared with the API 1.0 version
+	def compute(self, plug, dataBlock):
+
+		# a request for a child like outputTranslateX computes the whole vector
+		if plug.isChild:
+			plug = plug.parent()
+
+		# returning None for other plugs lets Maya handle them
+		self.computePlug( plug, dataBlock )
+		return None
+
+	# True if an output is dirty and connected so it is going to be computed
+	def isPending(self, dataBlock, attribute):
+		if dataBlock.isClean( attribute ):
+			return False
+		outputPlug = OpenMaya.MPlug( self.thisMObject(), attribute )
+		return outputPlug.isConnected or outputPlug.numConnectedChildren() > 0
+
+	# True if the plug of an input attribute or one of its children is connected
+	def isConnected(self, attribute):
+		plug = OpenMaya.MPlug( self.thisMObject(), attribute )
+		return plug.isConnected or plug.numConnectedChildren() > 0
+
+	# the rows of an MMatrix
+	def matrixToList(self, matrix):
+		return matrixToList( matrix )
+
+	# get an MDataHandle to an input attribute
+	def inputValue(self, dataBlock, attribute):
+		return dataBlock.inputValue( attribute )
+
+	# get the values of a list of float attributes
+	def inputFloats(self, dataBlock, attributes):
+		return [ dataBlock.inputValue( attribute ).asFloat() for attribute in attributes ]
+
+	# set a vector output plus its offset and clean the plug so maya knows it can update
+	def setOutput(self, dataBlock, attribute, value, offset=None):
+		outputHandle = dataBlock.outputValue( attribute )
+		if offset is None:
+			outputHandle.setMFloatVector( OpenMaya.MFloatVector( value[0], value[1], value[2] ) )
+		else:
+			outputHandle.setMFloatVector( OpenMaya.MFloatVector( value[0], value[1], value[2] ) + offset )
+		outputHandle.setClean()
+
+	# set a matrix output from the rows of a rtMatrixKernel matrix
+	def setMatrix(self, dataBlock, attribute, rows):
+		outputHandle = dataBlock.outputValue( attribute )
+		outputHandle.setMMatrix( listToMatrix( rows ) )
+		outputHandle.setClean()
+
+	# the scale, euler rotation in degrees and shear of the first three rows from
+	# MTransformationMatrix like the API 1.0 node, rtMatrixKernel only for the polar mode
+	def decomposeMatrix(self, matrix, mode_value, rotOrder_value, needRotation):
+
+		if mode_value != rtMatrixKernel.kDecomposeTransformationMatrix:
+			return self.decomposeKernel( matrix, mode_value, rotOrder_value, needRotation )
+
+		mTM = OpenMaya.MTransformationMatrix( listToMatrix( matrix + [ [ 0.0, 0.0, 0.0, 1.0 ] ] ) )
+
+		rot = None
+		if needRotation:
+			eulerRotation = mTM.rotation( True ).asEulerRotation()
+			eulerRotation.reorderIt( rotOrder_value )
+			rot = [ math.degrees( eulerRotation.x ), math.degrees( eulerRotation.y ), math.degrees( eulerRotation.z ) ]
+
+		return mTM.scale( OpenMaya.MSpace.kTransform ), rot, mTM.shear( OpenMaya.MSpace.kTransform )
+
+def nodeCreator():
+
+	return rtMatrixUtilNode()
+
+# create and initialize the attributes to the node, the same rtNodeSpec table as
+# the API 1.0 version so scenes open with either
+def nodeInitializer():
+
+	rtNodeSpec.createAttributes( rtMatrixUtilNode, rtNodeSpec.matrixToTRS, OpenMaya )
+
+	# the last row of the matrix gives the translation, the first three rows
+	# give the rotation and scale
+	rtMatrixUtilNode.translateRow = rtMatrixUtilNode.matrixInChildren[12:16]
+	rtMatrixUtilNode.rotateRows = rtMatrixUtilNode.matrixInChildren[0:12]
+	rtMatrixUtilNode.translateColumn = rtMatrixUtilNode.matrixInChildren[3:12:4]
+
+
+# initialize the script plug-in
+def initializePlugin(mobject):
+	mplugin = OpenMaya.MFnPlugin(mobject, "Autodesk", "1.0", "Any")
+	try:
+		mplugin.registerNode( kMatrixUtilNodeTypeName, kMatrixUtilNodeId, nodeCreator, nodeInitializer, OpenMaya.MPxNode.kDependNode, kMatrixUtilNodeClassify)
+	except:
+		sys.stderr.write( "Failed to register node: %s" % kMatrixUtilNodeTypeName )
+		raise
+
+
+# uninitialize the script plug-in
+def uninitializePlugin(mobject):
+	mplugin = OpenMaya.MFnPlugin(mobject)
+	try:
+		mplugin.deregisterNode( kMatrixUtilNodeId )
+	except:
+		sys.stderr.write( "Failed to deregister node: %s" % kMatrixUtilNodeTypeName )
+		raise
@@ -0,0 +1,368 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_bake
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# Bakes the rt4x4MatrixToTRS nodes of many Maya ASCII shots on all the cores of a
+# machine, without Maya, with the evaluator of rt4x4MatrixToTRS_evaluate.py.
+#
+# Every shot is split in work units of one node and a chunk of frames, and the
+# units of all shots go to a pool of worker processes. A worker reads a scene once
+# and keeps it for the other units of the shot it gets. Each finished unit is saved
+# as a part file in <output>/<shot>.parts, when all the units of a shot are there
+# they are merged into <output>/<shot>.npz, .csv or .trs and the parts are removed.
+#
+# A unit that fails is tried again up to --retries times. Units that still fail
+# are listed and their shots are not merged, running the same command again only
+# bakes the units that have no part file yet and skips the shots that were merged,
+# --force bakes everything again.
+#
+# usage: python rt4x4MatrixToTRS_bake.py shot010.ma shot020.ma ... -o bakes
+#                 [--shots shots.txt] [--workers 8] [--chunk 100] [--retries 2]
+#                 [--start 1 --end 100 --step 1] [--node rt4x4MatrixToTRS1 ...]
+#                 [--format npz | csv | trs] [--euler-filter]
+# a shots file has one scene per line, optionally followed by its start and end frame
+#
+# With --euler-filter every unit keeps its rotations continuous from frame to frame,
+# and when a shot is merged each chunk is moved to continue from the last frame of
+# the chunk before, so the bakes come out as one continuous curve per channel, the
+# same as evaluating the whole range in one go.
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import concurrent.futures
+
+import numpy
+
+import rtMayaAscii
+import rtMatrixKernel
+import rt4x4MatrixToTRS_evaluate
+import rtTRSCache
+
+kFormats = ( "npz", "csv", "trs" )
+kChannels = ( "translate", "rotate", "scale" )
+kOffsets = ( "offsetTranslate", "offsetRotate", "offsetScale" )
+
+# the scenes a worker process has read, path: ( modification time, names, scene )
+_scenes = {}
+
+
+# a scene to bake and the frames and nodes to bake, start or end are None for the
+# playback range of the scene and nodeNames None for all its rt4x4MatrixToTRS nodes
+class rtShot(object):
+
+	def __init__(self, path, start=None, end=None, step=1.0, nodeNames=None):
+		self.path = path
+		self.start = start
+		self.end = end
+		self.step = step
+		self.nodeNames = nodeNames
+		# filled in by planShot()
+		self.names = None
+		self.count = 0
+
+	def name(self):
+		return os.path.splitext( os.path.basename( self.path ) )[0]
+
+# one node of a shot over the frames first to last, last excluded
+class rtWorkUnit(object):
+
+	def __init__(self, shot, node, first, last):
+		self.path = shot.path
+		self.names = shot.names
+		self.start = shot.start
+		self.step = shot.step
+		self.node = node
+		self.first = first
+		self.last = last
+		self.attempts = 0
+
+	def key(self):
+		return "%s.%d-%d" % ( self.node, self.first, self.last )
+
+
+# -----------------------------------------------------------------------------------
+# workers
+# -----------------------------------------------------------------------------------
+
+# the nodes and frame range of a shot, runs in a worker so the scenes are scanned in parallel
+def planShot(shot):
+
+	scene = rtMayaAscii.rtMayaAsciiScene()
+	scene.scan( shot.path )
+	names = shot.nodeNames or sorted( scene.nodesOfType( rt4x4MatrixToTRS_evaluate.kNodeTypeName ) )
+	missing = [ name for name in names if scene.node( name ) is None ]
+	if missing:
+		raise ValueError( "%s: no node named %s" % ( shot.path, ", ".join( missing ) ) )
+	if shot.start is None or shot.end is None:
+		scene.load( shot.path, ( "sceneConfigurationScriptNode", ) )
+
+	shot.names = tuple( names )
+	shot.start, shot.end = rt4x4MatrixToTRS_evaluate.sceneFrames( scene, shot.start, shot.end )
+	shot.count = rt4x4MatrixToTRS_evaluate.frameCount( shot.start, shot.end, shot.step )
+	return shot
+
+# the scene of a unit, read once per worker while the file does not change
+def unitScene(unit):
+	modified = os.path.getmtime( unit.path )
+	cached = _scenes.get( unit.path )
+	if cached is None or cached[0] != modified or cached[1] != unit.names:
+		scene, names = rt4x4MatrixToTRS_evaluate.loadScene( unit.path, list( unit.names ) )
+		cached = ( modified, unit.names, scene )
+		_scenes[unit.path] = cached
+	return cached[2]
+
+# evaluate a unit and save it to a part file, returns the warnings. The part keeps
+# the values before the offsets are added and the offsets, a chunk of filtered
+# rotations can then still be moved to the other solution when it is merged
+def bakeUnit(unit, partPath, eulerFilter=False):
+
+	frames = unit.start + unit.step * numpy.arange( unit.first, unit.last )
+	evaluator = rt4x4MatrixToTRS_evaluate.rtSceneEvaluator( unitScene( unit ), frames )
+	values, offsets = evaluator.decomposeNode( unit.node, eulerFilter )
+	arrays = dict( zip( kChannels + kOffsets, list( values ) + list( offsets ) ) )
+
+	# write next to the part and rename so a killed worker never leaves half a part
+	temporary = partPath + ".tmp.npz"
+	numpy.savez( temporary, frames=frames, rotateOrder=evaluator.rotateOrder( unit.node ), **arrays )
+	os.replace( temporary, partPath )
+	return evaluator.warnings
+
+
+# -----------------------------------------------------------------------------------
+# batch
+# -----------------------------------------------------------------------------------
+
+def partsDirectory(output, shot):
+	return os.path.join( output, shot.name() + ".parts" )
+
+def partPath(output, shot, unit):
+	return os.path.join( partsDirectory( output, shot ), unit.key() + ".npz" )
+
+def shotPath(output, shot, outputFormat):
+	return os.path.join( output, "%s.%s" % ( shot.name(), outputFormat ) )
+
+# the work units of a shot, chunk frames per unit
+def shotUnits(shot, chunk):
+	units = []
+	for node in shot.names:
+		for first in range( 0, shot.count, chunk ):
+			units.append( rtWorkUnit( shot, node, first, min( first + chunk, shot.count ) ) )
+	return units
+
+# merge the part files of a shot into its output and remove them, with eulerFilter
+# the rotations of each part continue from the part before
+def mergeShot(output, shot, units, outputFormat, eulerFilter=False):
+
+	results = []
+	for node in shot.names:
+		parts = []
+		for unit in units:
+			if unit.node != node:
+				continue
+			archive = numpy.load( partPath( output, shot, unit ) )
+			try:
+				parts.append( dict( [ ( key, archive[key] ) for key in ( "frames", "rotateOrder" ) + kChannels + kOffsets ] ) )
+			finally:
+				archive.close()
+		# the rotate order is saved for every frame, a part only continues from the one
+		# before up to its first change of rotate order and when it starts in the same one
+		if eulerFilter:
+			for part, before in zip( parts[1:], parts ):
+				rotateOrder = part["rotateOrder"]
+				if rotateOrder[0] != before["rotateOrder"][-1]:
+					continue
+				changes = numpy.flatnonzero( numpy.diff( rotateOrder ) )
+				run = changes[0] + 1 if len( changes ) else len( rotateOrder )
+				part["rotate"][:run] = rtMatrixKernel.continueEulerArray( part["rotate"][:run], before["rotate"][-1], int( rotateOrder[0] ) )
+		frames = numpy.concatenate( [ part["frames"] for part in parts ] )
+		values = [ numpy.concatenate( [ part[channel] for part in parts ] ) for channel in kChannels ]
+		offsets = [ numpy.concatenate( [ part[channel] for part in parts ] ) for channel in kOffsets ]
+		results.append( ( node, frames, rt4x4MatrixToTRS_evaluate.addOffsets( values, offsets ) ) )
+
+	path = shotPath( output, shot, outputFormat )
+	if outputFormat == "npz":
+		rt4x4MatrixToTRS_evaluate.writeNpz( path, results )
+	elif outputFormat == "trs":
+		rtTRSCache.write( path, results )
+	else:
+		stream = open( path, "w" )
+		try:
+			rt4x4MatrixToTRS_evaluate.writeCsv( stream, results )
+		finally:
+			stream.close()
+
+	shutil.rmtree( partsDirectory( output, shot ) )
+
+# one line of progress on a stream that is a terminal, a line every tenth otherwise
+class rtProgress(object):
+
+	def __init__(self, total, done=0, stream=sys.stderr):
+		self.total = total
+		self.done = done
+		# units done by an earlier run, left out of the estimate
+		self.resumed = done
+		self.failed = 0
+		self.stream = stream
+		self.start = time.time()
+		self.interactive = hasattr( stream, "isatty" ) and stream.isatty()
+		self._reported = -1
+		self._written = None
+
+	def line(self):
+		elapsed = time.time() - self.start
+		baked = self.done - self.resumed
+		remaining = elapsed / baked * ( self.total - self.done ) if baked else 0.0
+		return "%d/%d units, %d failed, %.0fs, %.0fs left" % ( self.done, self.total, self.failed, elapsed, remaining )
+
+	def update(self, done=0, failed=0):
+		self.done += done
+		self.failed += failed
+		if self.interactive:
+			self.stream.write( "\r" + self.line().ljust( 60 ) )
+		elif self.total and self.done * 10 // self.total != self._reported:
+			self._reported = self.done * 10 // self.total
+			self._written = ( self.done, self.failed )
+			self.stream.write( self.line() + "\n" )
+		self.stream.flush()
+
+	def finish(self):
+		if self.interactive:
+			self.stream.write( "\n" )
+		elif self.total and self._written != ( self.done, self.failed ):
+			self.stream.write( self.line() + "\n" )
+
+# bake the shots into output with a pool of workers, returns the units that failed
+# as ( shot, unit, error ) and the warnings, shots that were merged by an earlier
+# run are skipped unless force is True
+def bake(shots, output, workers=None, chunk=100, retries=2, outputFormat="npz", force=False, stream=sys.stderr, eulerFilter=False):
+
+	if not os.path.isdir( output ):
+		os.makedirs( output )
+	names = [ shot.name() for shot in shots ]
+	duplicates = sorted( set( [ name for name in names if names.count( name ) > 1 ] ) )
+	if duplicates:
+		raise ValueError( "more than one shot is named %s" % ", ".join( duplicates ) )
+
+	if force:
+		for shot in shots:
+			if os.path.isdir( partsDirectory( output, shot ) ):
+				shutil.rmtree( partsDirectory( output, shot ) )
+	shots = [ shot for shot in shots if force or os.path.isdir( partsDirectory( output, shot ) ) or
+			not os.path.exists( shotPath( output, shot, outputFormat ) ) ]
+
+	warnings = []
+	failures = []
+	with concurrent.futures.ProcessPoolExecutor( max_workers=workers ) as pool:
+		planned = []
+		for shot, future in [ ( shot, pool.submit( planShot, shot ) ) for shot in shots ]:
+			try:
+				planned.append( future.result() )
+			except ( IOError, ValueError ) as error:
+				failures.append( ( shot, None, str( error ) ) )
+	shots = planned
+
+	# units with a part file are done from an earlier run
+	units = dict( [ ( shot.path, shotUnits( shot, chunk ) ) for shot in shots ] )
+	pending = []
+	for shot in shots:
+		directory = partsDirectory( output, shot )
+		if not os.path.isdir( directory ):
+			os.makedirs( directory )
+		pending.extend( [ ( shot, unit ) for unit in units[shot.path] if not os.path.exists( partPath( output, shot, unit ) ) ] )
+
+	total = sum( [ len( shotList ) for shotList in units.values() ] )
+	progress = rtProgress( total, total - len( pending ), stream )
+	progress.update()
+
+	# a pool whose worker died is broken, every round gets a new one
+	while pending:
+		retry = []
+		with concurrent.futures.ProcessPoolExecutor( max_workers=workers ) as pool:
+			futures = dict( [ ( pool.submit( bakeUnit, unit, partPath( output, shot, unit ), eulerFilter ), ( shot, unit ) ) for shot, unit in pending ] )
+			for future in concurrent.futures.as_completed( futures ):
+				shot, unit = futures[future]
+				try:
+					warnings.extend( future.result() )
+				except Exception as error:
+					unit.attempts += 1
+					if unit.attempts > retries:
+						failures.append( ( shot, unit, "%s: %s" % ( type( error ).__name__, error ) ) )
+						progress.update( failed=1 )
+					else:
+						retry.append( ( shot, unit ) )
+					continue
+				progress.update( done=1 )
+		pending = retry
+	progress.finish()
+
+	failed = set( [ shot.path for shot, unit, error in failures ] )
+	for shot in shots:
+		if shot.path not in failed:
+			mergeShot( output, shot, units[shot.path], outputFormat, eulerFilter )
+	return failures, sorted( set( warnings ) )
+
+# the shots of a shots file, one scene per line with an optional start and end frame
+def readShots(path, step=1.0, nodeNames=None):
+
+	shots = []
+	stream = open( path, "r" )
+	try:
+		for line in stream:
+			words = line.split( "#", 1 )[0].split()
+			if not words:
+				continue
+			if len( words ) not in ( 1, 3 ):
+				raise ValueError( "%s: expected a scene and an optional start and end frame: %s" % ( path, line.strip() ) )
+			frames = [ float( word ) for word in words[1:] ] or [ None, None ]
+			shots.append( rtShot( words[0], frames[0], frames[1], step, nodeNames ) )
+	finally:
+		stream.close()
+	return shots
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Bake the rt4x4MatrixToTRS nodes of many Maya ASCII shots with a pool of processes." )
+	parser.add_argument( "scenes", nargs="*", help="the .ma files" )
+	parser.add_argument( "-o", "--output", required=True, help="the folder for the baked shots" )
+	parser.add_argument( "--shots", help="a file with one scene per line and an optional start and end frame" )
+	parser.add_argument( "--workers", type=int, help="worker processes, one per core by default" )
+	parser.add_argument( "--chunk", type=int, default=100, help="frames per work unit" )
+	parser.add_argument( "--retries", type=int, default=2, help="times a failed unit is tried again" )
+	parser.add_argument( "--start", type=float, help="first frame, playbackOptions -min by default" )
+	parser.add_argument( "--end", type=float, help="last frame, playbackOptions -max by default" )
+	parser.add_argument( "--step", type=float, default=1.0, help="frame step" )
+	parser.add_argument( "--node", action="append", dest="nodes", help="a node to bake, all of them by default" )
+	parser.add_argument( "--format", choices=kFormats, default="npz", help="the format of the baked shots" )
+	parser.add_argument( "--force", action="store_true", help="bake the shots that were baked before again" )
+	parser.add_argument( "--euler-filter", action="store_true", help="keep the rotations continuous from frame to frame" )
+	args = parser.parse_args( argv )
+
+	if args.chunk < 1:
+		parser.error( "--chunk must be at least 1" )
+	try:
+		shots = [ rtShot( path, args.start, args.end, args.step, args.nodes ) for path in args.scenes ]
+		if args.shots:
+			shots.extend( readShots( args.shots, args.step, args.nodes ) )
+		if not shots:
+			parser.error( "no scenes to bake" )
+		failures, warnings = bake( shots, args.output, args.workers, args.chunk, args.retries, args.format, args.force,
+					eulerFilter=args.euler_filter )
+	except ( IOError, ValueError ) as error:
+		parser.error( str( error ) )
+
+	for warning in warnings:
+		sys.stderr.write( "# Warning: %s\n" % warning )
+	for shot, unit, error in failures:
+		sys.stderr.write( "# Error: %s%s: %s\n" % ( shot.path, "" if unit is None else " " + unit.key(), error ) )
+	if failures:
+		sys.stderr.write( "# %d units failed, run the same command again to bake only them\n" % len( failures ) )
+		return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
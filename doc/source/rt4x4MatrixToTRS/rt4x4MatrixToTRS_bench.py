@@ -0,0 +1,315 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_bench
+#
+# Benchmark suite for the API 1.0 plugin ( rt4x4MatrixToTRS.py ) and the API 2.0
+# plugin ( rt4x4MatrixToTRSApi2.py ) on the stand-in OpenMaya in mayaStandIn.
+#
+# For every scenario it reports the time per compute() and evaluations per second,
+# the share of compute() spent in each stage, the time to load the plugin and to
+# run nodeInitializer(), and the cold start time of a new Python process importing
+# the plugin and running initializePlugin(). The stages are:
+#   input reads     MDataBlock.inputValue() and the MDataHandle getters
+#   matrix build    MMatrix to rows, buildMatrix() and the rows times parentInverseMatrix
+#   decomposition   decomposeRows() without the above, scale, shear, euler rotation and the cache
+#   output writes   setOutput()
+#   other           the rest of compute(), mostly the plug tests
+# The stages are timed in a separate run with every stage call wrapped in a timer,
+# which slows compute() down, so only their shares are reported.
+#
+# The stand-in has no C++ behind it, so the numbers measure the Python side of
+# compute(): the calls into the API, the wrapper objects and the math. They are
+# good for comparing changes to one version, not as Maya timings and not to pick
+# the faster version, API 2.0 is often slower on the stand-in than in Maya. The
+# report says so above the table, rtMatrixStats times the nodes in a Maya scene.
+#
+# --save writes the timings to a JSON baseline, --baseline compares against one and
+# exits with 1 when a timing is more than --threshold percent slower. Baselines are
+# only comparable on the machine and Python they were made with.
+#
+# usage: python rt4x4MatrixToTRS_bench.py [--iterations 20000] [--repeat 5]
+#                 [--save baseline.json] [--baseline baseline.json] [--threshold 10]
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import json
+import random
+import subprocess
+import argparse
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "mayaStandIn" ) )
+import standInScene
+
+import rtMatrixKernel
+import rt4x4MatrixToTRS
+import rt4x4MatrixToTRSApi2
+
+kOutputs = ( "outputTranslate", "outputRotate", "outputScale" )
+
+kModules = ( ( "API 1.0", rt4x4MatrixToTRS ), ( "API 2.0", rt4x4MatrixToTRSApi2 ) )
+
+# ( label, connect inputMatrix, plug to pull, outputs connected )
+kScenarios = ( ( "matrixIn, all outputs", False, "outputTranslate", kOutputs ),
+		( "matrixIn, translate only", False, "outputTranslate", ( "outputTranslate", ) ),
+		( "inputMatrix, all outputs", True, "outputTranslate", kOutputs ),
+		( "inputMatrix, rotate only", True, "outputRotate", ( "outputRotate", ) ) )
+
+kStages = ( "input reads", "matrix build", "decomposition", "output writes", "other" )
+
+kHandleGetters = ( "asFloat", "asDouble", "asBool", "asShort", "asInt", "asMatrix", "asFloatVector", "asVector" )
+
+kDefaultThreshold = 10.0
+
+
+# a node of the plugin module with random inputs
+def buildNode(module, connectInputMatrix, connectedOutputs, seed=1):
+
+	standInScene.loadPlugin( module )
+	try:
+		node = standInScene.createNode( module.kMatrixUtilNodeTypeName )
+	finally:
+		standInScene.unloadPlugin( module )
+
+	generator = random.Random( seed )
+	values = [ generator.uniform( -2.0, 2.0 ) for i in range(16) ]
+	for index, value in enumerate( values ):
+		standInScene.setAttr( node, "in%d%d" % ( index // 4, index % 4 ), value )
+	standInScene.setAttr( node, "eulerRotateOrder", 2 )
+	standInScene.setAttr( node, "offsetRotate", ( 10.0, 0.0, -5.0 ) )
+
+	api = standInScene.apiModule( node )
+	if connectInputMatrix:
+		standInScene.setAttr( node, "inputMatrix", api.MMatrix( [ values[0:4], values[4:8], values[8:12], values[12:16] ] ) )
+		standInScene.connectAttr( node, "inputMatrix" )
+	for output in connectedOutputs:
+		standInScene.connectAttr( node, output )
+	return node
+
+# best time per call of a function over a number of repeats, in seconds
+def bestTime(function, iterations, repeat):
+
+	best = None
+	for r in range( repeat ):
+		start = time.perf_counter()
+		for i in range( iterations ):
+			function()
+		elapsed = ( time.perf_counter() - start ) / iterations
+		if best is None or elapsed < best:
+			best = elapsed
+	return best
+
+# a function that dirties a node and calls compute() for a plug like Maya does
+def computeCall(node, plugName):
+
+	api = standInScene.apiModule( node )
+	plug = api.MPlug( node.thisMObject(), standInScene.attributeObject( node, plugName ) )
+	dataBlock = node._standInBlock
+	clean = dataBlock._clean
+	compute = node.compute
+
+	def call():
+		clean.clear()
+		compute( plug, dataBlock )
+	return call
+
+# best time per compute() over a number of repeats, in seconds
+def timeCompute(node, plugName, iterations, repeat):
+	return bestTime( computeCall( node, plugName ), iterations, repeat )
+
+
+# times the calls of the functions it wraps by stage, the time of a call made
+# inside another wrapped call only counts for the inner stage
+class rtStageTimer(object):
+
+	def __init__(self):
+		self.totals = dict( [ ( stage, 0.0 ) for stage in kStages ] )
+		self._stack = []
+		self._patched = []
+
+	# replace owner.name, a module, class or instance attribute, with a timed version
+	def wrap(self, owner, name, stage):
+
+		original = getattr( owner, name )
+		timer = self
+		clock = time.perf_counter
+
+		def timed(*args, **kwargs):
+			stack = timer._stack
+			stack.append( 0.0 )
+			start = clock()
+			try:
+				return original( *args, **kwargs )
+			finally:
+				elapsed = clock() - start
+				inner = stack.pop()
+				timer.totals[stage] += elapsed - inner
+				if stack:
+					stack[-1] += elapsed
+
+		# methods of an instance come from its class and are put back by deleting the wrapper
+		self._patched.append( ( owner, name, original, name in vars( owner ) ) )
+		setattr( owner, name, timed )
+
+	# put every wrapped function back
+	def restore(self):
+		for owner, name, original, hadOwn in reversed( self._patched ):
+			if hadOwn:
+				setattr( owner, name, original )
+			else:
+				delattr( owner, name )
+		self._patched = []
+
+# the share of compute() time spent in each stage, as a dictionary of fractions
+def timeStages(module, node, plugName, iterations):
+
+	call = computeCall( node, plugName )
+	dataBlock = node._standInBlock
+
+	timer = rtStageTimer()
+	timer.wrap( dataBlock, "inputValue", "input reads" )
+	for getter in kHandleGetters:
+		if hasattr( standInScene.OpenMaya.MDataHandle, getter ):
+			timer.wrap( standInScene.OpenMaya.MDataHandle, getter, "input reads" )
+	timer.wrap( node, "isPending", "input reads" )
+	timer.wrap( module, "matrixToList", "matrix build" )
+	timer.wrap( rtMatrixKernel, "buildMatrix", "matrix build" )
+	timer.wrap( rtMatrixKernel, "multRow", "matrix build" )
+	timer.wrap( node, "decomposeRows", "decomposition" )
+	timer.wrap( node, "setOutput", "output writes" )
+
+	try:
+		start = time.perf_counter()
+		for i in range( iterations ):
+			call()
+		total = time.perf_counter() - start
+	finally:
+		timer.restore()
+
+	timed = sum( timer.totals.values() )
+	timer.totals["other"] = max( total - timed, 0.0 )
+	return dict( [ ( stage, timer.totals[stage] / total ) for stage in kStages ] )
+
+# best time to load the plugin and to run nodeInitializer() alone, in seconds
+def timeLoad(module, iterations, repeat):
+
+	def load():
+		standInScene.loadPlugin( module )
+		standInScene.unloadPlugin( module )
+
+	return bestTime( load, iterations, repeat ), bestTime( module.nodeInitializer, iterations, repeat )
+
+# best time for a new Python process to import the plugin and run initializePlugin(),
+# what a Maya session pays once. It is timed inside the process so the start of the
+# interpreter and the stand-in are left out
+def timeColdStart(module, repeat):
+
+	script = "\n".join( [ "import sys, time",
+				"sys.path.insert( 0, %r )" % standInScene.kStandInPath,
+				"import standInScene",
+				"start = time.perf_counter()",
+				"import %s" % module.__name__,
+				"%s.initializePlugin( standInScene.OpenMaya.MObject() )" % module.__name__,
+				"sys.stdout.write( repr( time.perf_counter() - start ) )" ] )
+	times = []
+	for i in range( repeat ):
+		output = subprocess.check_output( [ sys.executable, "-c", script ], cwd=os.path.dirname( os.path.abspath( module.__file__ ) ) )
+		times.append( float( output ) )
+	return min( times )
+
+
+# run the suite, returns a dictionary that can be saved as a baseline
+#   compute: { scenario: { api: seconds per compute() } }
+#   stages:  { scenario: { api: { stage: fraction } } }
+#   load:    { api: { "initializePlugin": seconds, "nodeInitializer": seconds, "coldStart": seconds } }
+def run(iterations=20000, repeat=5):
+
+	results = { "compute": {}, "stages": {}, "load": {} }
+	for label, connectInputMatrix, plugName, connectedOutputs in kScenarios:
+		results["compute"][label] = {}
+		results["stages"][label] = {}
+		for apiLabel, module in kModules:
+			node = buildNode( module, connectInputMatrix, connectedOutputs )
+			results["compute"][label][apiLabel] = timeCompute( node, plugName, iterations, repeat )
+			results["stages"][label][apiLabel] = timeStages( module, node, plugName, max( iterations // 4, 1 ) )
+
+	loadIterations = max( iterations // 20, 1 )
+	for apiLabel, module in kModules:
+		pluginTime, initializerTime = timeLoad( module, loadIterations, repeat )
+		results["load"][apiLabel] = { "initializePlugin": pluginTime, "nodeInitializer": initializerTime,
+						"coldStart": timeColdStart( module, repeat ) }
+	return results
+
+# the timings of a result that are slower than a baseline by more than threshold
+# percent, as a list of ( name, baseline seconds, seconds )
+def regressions(results, baseline, threshold=kDefaultThreshold):
+
+	found = []
+	limit = 1.0 + threshold / 100.0
+	for section in ( "compute", "load" ):
+		for group, timings in sorted( baseline.get( section, {} ).items() ):
+			for name, old in sorted( timings.items() ):
+				new = results.get( section, {} ).get( group, {} ).get( name )
+				if new is not None and new > old * limit:
+					found.append( ( "%s / %s / %s" % ( section, group, name ), old, new ) )
+	return found
+
+def report(results, stream=sys.stdout):
+
+	stream.write( "stand-in OpenMaya, not representative of Maya: compare changes, not API 1.0 and API 2.0\n\n" )
+	stream.write( "%-28s %12s %12s %12s %12s\n" % ( "scenario", "API 1.0 us", "API 1.0 ev/s", "API 2.0 us", "API 2.0 ev/s" ) )
+	for label, connectInputMatrix, plugName, connectedOutputs in kScenarios:
+		timings = results["compute"][label]
+		stream.write( "%-28s" % label )
+		for apiLabel, module in kModules:
+			stream.write( " %12.2f %12.0f" % ( timings[apiLabel] * 1.0e6, 1.0 / timings[apiLabel] ) )
+		stream.write( "\n" )
+
+	stream.write( "\n%-28s %-8s %s\n" % ( "stage share", "api", " ".join( [ "%14s" % stage for stage in kStages ] ) ) )
+	for label, connectInputMatrix, plugName, connectedOutputs in kScenarios:
+		for apiLabel, module in kModules:
+			shares = results["stages"][label][apiLabel]
+			stream.write( "%-28s %-8s %s\n" % ( label, apiLabel, " ".join( [ "%13.1f%%" % ( shares[stage] * 100.0 ) for stage in kStages ] ) ) )
+
+	stream.write( "\n%-28s %12s %12s %12s\n" % ( "plugin load", "load us", "init us", "cold us" ) )
+	for apiLabel, module in kModules:
+		timings = results["load"][apiLabel]
+		stream.write( "%-28s %12.1f %12.1f %12.1f\n" % ( apiLabel, timings["initializePlugin"] * 1.0e6, timings["nodeInitializer"] * 1.0e6,
+									timings["coldStart"] * 1.0e6 ) )
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Benchmark rt4x4MatrixToTRS for API 1.0 and API 2.0 on the stand-in OpenMaya." )
+	parser.add_argument( "--iterations", type=int, default=20000, help="compute() calls per timing" )
+	parser.add_argument( "--repeat", type=int, default=5, help="timings per scenario, the best is kept" )
+	parser.add_argument( "--save", help="write the timings to this JSON baseline" )
+	parser.add_argument( "--baseline", help="compare the timings against this JSON baseline" )
+	parser.add_argument( "--threshold", type=float, default=kDefaultThreshold, help="percent slower than the baseline that fails" )
+	args = parser.parse_args( argv )
+
+	results = run( args.iterations, args.repeat )
+	report( results )
+
+	if args.save:
+		stream = open( args.save, "w" )
+		try:
+			json.dump( results, stream, indent=1, sort_keys=True )
+		finally:
+			stream.close()
+
+	if args.baseline:
+		stream = open( args.baseline, "r" )
+		try:
+			baseline = json.load( stream )
+		finally:
+			stream.close()
+		found = regressions( results, baseline, args.threshold )
+		sys.stdout.write( "\n%d timings more than %.1f%% slower than %s\n" % ( len( found ), args.threshold, args.baseline ) )
+		for name, old, new in found:
+			sys.stdout.write( "    %-60s %10.2f us -> %10.2f us  %+6.1f%%\n" % ( name, old * 1.0e6, new * 1.0e6, ( new / old - 1.0 ) * 100.0 ) )
+		if found:
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
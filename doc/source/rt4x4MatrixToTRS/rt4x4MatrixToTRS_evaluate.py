@@ -0,0 +1,532 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_evaluate
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# Evaluates the rt4x4MatrixToTRS nodes of a Maya ASCII scene over a frame range
+# without Maya and writes their translate, rotate and scale to a CSV, NPZ or rtTRSCache
+# file, a .trs file can be played back by rt4x4TRSCacheReader nodes.
+#
+# The scene is streamed twice with rtMayaAscii, once for the nodes and connections
+# and once for the saved values of the nodes upstream of the rt4x4MatrixToTRS
+# nodes, so large scenes are never loaded whole. Every node is then evaluated for
+# all frames at once with rtMatrixKernel.decompose().
+#
+# The inputs of a node can come from:
+#   saved setAttr values of the node
+#   animCurveTL, TA, TU and TT nodes, also through unitConversion nodes
+#   the translate, rotate and scale of transforms and joints, saved or animated
+#   the matrix, parentMatrix, worldMatrix and their inverses of transforms and joints
+#   the constraintTranslate of point and parent constraints
+#   time1
+# normalize, eulerRotateOrder and decompositionMode come from the same sources, frame
+# by frame, like the matrix. Anything else, constraint rotations or expressions for
+# example, is not evaluated, the value saved in the scene is used and a warning is
+# printed. Transform matrices use translate, rotate, scale, rotateAxis and jointOrient,
+# pivots and shear are ignored. Weighted and fixed tangents are treated as spline
+# tangents. The frame range is the playback range saved in the scene unless --start
+# and --end are given.
+#
+# --match checks two nodes give the same values, rt4x4MatrixToTRS_evaluate_test.ma
+# lists the commands that check keyed settings with it.
+#
+# usage: python rt4x4MatrixToTRS_evaluate.py scene.ma [-o out.csv | out.npz | out.trs]
+#                 [--start 1 --end 100 --step 1] [--node rt4x4MatrixToTRS1 ...]
+#                 [--euler-filter] [--match NODE REFERENCE]
+# --euler-filter gives every frame the rotation closest to the frame before, so the
+# curves do not flip at +-180 or near gimbal lock and need no euler filter afterwards.
+# -----------------------------------------------------------------------------------
+
+import os
+import re
+import sys
+import argparse
+
+import numpy
+
+import rtMayaAscii
+import rtMatrixKernel
+import rtTRSCache
+
+kNodeTypeName = "rt4x4MatrixToTRS"
+
+# ( short name, long name, default ) of the 16 matrixIn floats
+kMatrixInAttributes = tuple( [ ( "i%d%d" % ( index // 4, index % 4 ), "in%d%d" % ( index // 4, index % 4 ), 1.0 if index == 15 else 0.0 )
+				for index in range(16) ] )
+
+kOffsetAttributes = ( ( "oft", "offsetTranslate" ), ( "ofr", "offsetRotate" ), ( "ofs", "offsetScale" ) )
+
+# transform channels, ( short name, long name, default, unit ) where unit is the
+# kind of value saved in the file
+kTransformChannels = { "t": ( "translate", 0.0, "linear" ), "r": ( "rotate", 0.0, "angle" ), "s": ( "scale", 1.0, None ),
+			"ra": ( "rotateAxis", 0.0, "angle" ), "jo": ( "jointOrient", 0.0, "angle" ) }
+kAxes = "xyz"
+kLongAxes = "XYZ"
+
+# matrix outputs of transforms
+kTransformMatrices = { "m": "matrix", "im": "inverseMatrix", "pm": "parentMatrix", "pim": "parentInverseMatrix",
+			"wm": "worldMatrix", "wim": "worldInverseMatrix" }
+
+# constraints whose constraintTranslate is evaluated
+kConstraintTypes = ( "pointConstraint", "parentConstraint" )
+kConstraintTranslate = { "ctx": 0, "cty": 1, "ctz": 2, "constraintTranslateX": 0, "constraintTranslateY": 1, "constraintTranslateZ": 2 }
+_targetPattern = re.compile( r"^(?:tg|target)\[(\d+)\]\." )
+
+# below this depth a chain of connections is treated as a cycle
+kMaxDepth = 64
+
+
+class rtSceneEvaluator(object):
+
+	def __init__(self, scene, frames):
+		self.scene = scene
+		self.frames = numpy.asarray( frames, dtype=numpy.float64 )
+		self.warnings = []
+		self._curves = {}
+		self._matrices = {}
+		self._constraints = {}
+
+	def warn(self, message):
+		if message not in self.warnings:
+			self.warnings.append( message )
+
+	def _constant(self, value):
+		return numpy.full( self.frames.shape, float( value ) )
+
+	def _unitFactor(self, unit):
+		if unit == "linear":
+			return rtMayaAscii.kLinearUnits.get( self.scene.linearUnit, 1.0 )
+		if unit == "angle":
+			return rtMayaAscii.kAngleUnits.get( self.scene.angleUnit, 1.0 )
+		return 1.0
+
+	# the names a transform channel like tx can be saved or connected as
+	def _channelNames(self, attribute):
+		if attribute in kTransformChannels:
+			return ( attribute, kTransformChannels[attribute][0] ), None, None
+		if attribute[-1:] in kAxes and attribute[:-1] in kTransformChannels:
+			parent = attribute[:-1]
+			longName = kTransformChannels[parent][0]
+			axis = kAxes.index( attribute[-1] )
+			return ( attribute, longName + kLongAxes[axis] ), ( parent, longName ), axis
+		for short, ( longName, default, unit ) in kTransformChannels.items():
+			if attribute[:-1] == longName and attribute[-1:] in kLongAxes:
+				axis = kLongAxes.index( attribute[-1] )
+				return ( short + kAxes[axis], attribute ), ( short, longName ), axis
+		return ( attribute, ), None, None
+
+	# the value of a float attribute of a node for every frame
+	# names are the short and long name, parent the names of the compound it is a
+	# child of and axis its index there, unit the kind of value saved in the file
+	def floatValue(self, name, names, default=0.0, parent=None, axis=None, unit=None, depth=0):
+
+		plug = self.scene.source( name, names )
+		if plug is not None:
+			return self.plugValue( plug, depth + 1 )
+		if parent is not None:
+			plug = self.scene.source( name, parent )
+			if plug is not None:
+				return self.plugComponent( plug, axis, depth + 1 )
+
+		node = self.scene.node( name )
+		if node is not None:
+			words = node.value( names )
+			if words:
+				return self._constant( rtMayaAscii.toFloat( words[0] ) * self._unitFactor( unit ) )
+			if parent is not None:
+				words = node.value( parent )
+				if words and len( words ) > axis:
+					return self._constant( rtMayaAscii.toFloat( words[axis] ) * self._unitFactor( unit ) )
+		return self._constant( default )
+
+	# the value of a transform channel like tx or rotateY for every frame
+	def channelValue(self, name, attribute, depth=0):
+		names, parent, axis = self._channelNames( attribute )
+		short = parent[0] if parent else names[0]
+		longName, default, unit = kTransformChannels.get( short, ( None, 0.0, None ) )
+		return self.floatValue( name, names, default, parent, axis, unit, depth )
+
+	# the value of a source plug for every frame
+	def plugValue(self, plug, depth=0):
+
+		if depth > kMaxDepth:
+			self.warn( "%s: too many connections in a row, using 0" % plug )
+			return self._constant( 0.0 )
+
+		nodeName, attribute = rtMayaAscii.splitPlug( plug )
+		nodeName = self.scene.nodeName( nodeName )
+		node = self.scene.node( nodeName )
+
+		if nodeName.lstrip( ":" ) == "time1" or ( node is not None and node.typeName == "time" ):
+			return self.frames.copy()
+
+		if node is None:
+			self.warn( "%s: %s is not in the scene, using 0" % ( plug, nodeName ) )
+			return self._constant( 0.0 )
+
+		if node.typeName.startswith( "animCurveT" ):
+			curve = self._curves.get( nodeName )
+			if curve is None:
+				curve = rtMayaAscii.rtAnimCurve.fromNode( node, self.scene.curveUnitFactor( node.typeName ) )
+				self._curves[nodeName] = curve
+			return curve.evaluate( self.frames )
+
+		if node.typeName == "unitConversion":
+			words = node.value( ( "cf", "conversionFactor" ) )
+			factor = rtMayaAscii.toFloat( words[0] ) if words else 1.0
+			return self.floatValue( nodeName, ( "i", "input" ), 0.0, depth=depth ) * factor
+
+		if node.typeName in kConstraintTypes and attribute in kConstraintTranslate:
+			translate = self.constraintTranslate( nodeName, depth )
+			if translate is not None:
+				return translate[:, kConstraintTranslate[attribute]]
+
+		names, parent, axis = self._channelNames( attribute )
+		if parent is not None or attribute in kTransformChannels:
+			return self.channelValue( nodeName, attribute, depth )
+
+		# not something that can be evaluated here, use the value saved in the scene
+		self.warn( "%s: %s nodes are not evaluated, using the saved value" % ( plug, node.typeName ) )
+		words = node.value( ( attribute, ) )
+		return self._constant( rtMayaAscii.toFloat( words[0] ) if words else 0.0 )
+
+	# one component of a source plug with three children like translate
+	def plugComponent(self, plug, axis, depth=0):
+
+		nodeName, attribute = rtMayaAscii.splitPlug( plug )
+		nodeName = self.scene.nodeName( nodeName )
+		for short, ( longName, default, unit ) in kTransformChannels.items():
+			if attribute in ( short, longName ):
+				return self.channelValue( nodeName, short + kAxes[axis], depth )
+
+		node = self.scene.node( nodeName )
+		if node is not None:
+			self.warn( "%s: %s nodes are not evaluated, using the saved value" % ( plug, node.typeName ) )
+			words = node.value( ( attribute, ) )
+			if words and len( words ) > axis:
+				return self._constant( rtMayaAscii.toFloat( words[axis] ) )
+		return self._constant( 0.0 )
+
+	# the weight of a constraint target for every frame, the weights are dynamic
+	# attributes of the constraint that default to 1
+	def targetWeight(self, name, index, depth=0):
+		names = ( "tg[%d].tw" % index, "tg[%d].targetWeight" % index )
+		plug = self.scene.source( name, names )
+		if plug is None:
+			return self.floatValue( name, names, 1.0, depth=depth )
+		nodeName, attribute = rtMayaAscii.splitPlug( plug )
+		if self.scene.nodeName( nodeName ) == name:
+			return self.floatValue( name, ( attribute, ), 1.0, depth=depth )
+		return self.plugValue( plug, depth + 1 )
+
+	# the constraintTranslate of a point or parent constraint for every frame as an
+	# (F,3) array or None when it has no targets, the targets are blended linearly
+	def constraintTranslate(self, name, depth=0):
+
+		if name in self._constraints:
+			return self._constraints[name]
+
+		node = self.scene.node( name )
+		indices = set()
+		for destination, path in self.scene.connections:
+			match = _targetPattern.match( path ) if destination == name else None
+			if match is not None:
+				indices.add( int( match.group(1) ) )
+
+		linear = self._unitFactor( "linear" )
+		total = numpy.zeros( ( len( self.frames ), 3 ) )
+		weights = numpy.zeros( len( self.frames ) )
+		for index in sorted( indices ):
+			plug = self.scene.source( name, ( "tg[%d].tt" % index, "tg[%d].targetTranslate" % index ) )
+			if plug is None:
+				continue
+			world = self.worldMatrix( self.scene.nodeName( rtMayaAscii.splitPlug( plug )[0] ), depth + 1 )
+			point = world[:, 3, :3].copy()
+			if node.typeName == "parentConstraint":
+				# the offset is a point in the space of the target
+				words = node.value( ( "tg[%d].tot" % index, "tg[%d].targetOffsetTranslate" % index ) )
+				if words:
+					offset = numpy.array( [ rtMayaAscii.toFloat( word ) * linear for word in words[:3] ] )
+					point += numpy.matmul( offset, world[:, :3, :3] )
+			weight = self.targetWeight( name, index, depth )
+			total += weight[:, numpy.newaxis] * point
+			weights += weight
+
+		if not indices:
+			self._constraints[name] = None
+			return None
+
+		world = total / numpy.where( weights > 0.0, weights, 1.0 )[:, numpy.newaxis]
+		parentInverse = numpy.broadcast_to( self.matrixValue( name, ( "cpim", "constraintParentInverseMatrix" ) ),
+							( len( self.frames ), 4, 4 ) )
+		translate = numpy.matmul( world[:, numpy.newaxis, :], parentInverse[:, :3, :3] )[:, 0, :] + parentInverse[:, 3, :3]
+		if node.typeName == "pointConstraint":
+			words = node.value( ( "o", "offset" ) )
+			if words:
+				translate += numpy.array( [ rtMayaAscii.toFloat( word ) * linear for word in words[:3] ] )
+		self._constraints[name] = translate
+		return translate
+
+	# the local matrix of a transform or joint for every frame as an (F,4,4) array
+	def localMatrix(self, name, depth=0):
+
+		def vectors(short):
+			return numpy.stack( [ self.channelValue( name, short + axis, depth ) for axis in kAxes ], axis=1 )
+
+		node = self.scene.node( name )
+		words = node.value( ( "ro", "rotateOrder" ) ) if node is not None else None
+		rotateOrder = int( rtMayaAscii.toFloat( words[0] ) ) if words else rtMatrixKernel.kXYZ
+
+		# scale * rotateAxis * rotate * jointOrient, rotateAxis and jointOrient are always XYZ
+		rotation = numpy.matmul( rtMatrixKernel.rotationMatrixArray( vectors( "ra" ) ),
+					rtMatrixKernel.rotationMatrixArray( vectors( "r" ), rotateOrder ) )
+		if node is not None and node.typeName == "joint":
+			rotation = numpy.matmul( rotation, rtMatrixKernel.rotationMatrixArray( vectors( "jo" ) ) )
+
+		matrices = numpy.zeros( ( len( self.frames ), 4, 4 ) )
+		matrices[:, :3, :3] = vectors( "s" )[:, :, numpy.newaxis] * rotation
+		matrices[:, 3, :3] = vectors( "t" )
+		matrices[:, 3, 3] = 1.0
+		return matrices
+
+	# the world matrix of a DAG node for every frame
+	def worldMatrix(self, name, depth=0):
+
+		if name in self._matrices:
+			return self._matrices[name]
+		matrices = self.localMatrix( name, depth )
+		parent = self.scene.node( name ).parent
+		if parent is not None and self.scene.node( parent ) is not None:
+			matrices = numpy.matmul( matrices, self.worldMatrix( self.scene.nodeName( parent ), depth + 1 ) )
+		self._matrices[name] = matrices
+		return matrices
+
+	# the parent world matrix of a DAG node for every frame
+	def parentMatrix(self, name, depth=0):
+		parent = self.scene.node( name ).parent
+		if parent is not None and self.scene.node( parent ) is not None:
+			return self.worldMatrix( self.scene.nodeName( parent ), depth + 1 )
+		return numpy.tile( numpy.eye(4), ( len( self.frames ), 1, 1 ) )
+
+	# the saved matrix of an attribute or None
+	def savedMatrix(self, name, names):
+		node = self.scene.node( name )
+		words = node.value( names ) if node is not None else None
+		if words and len( words ) >= 16 and words[0] != "xform":
+			return numpy.array( [ rtMayaAscii.toFloat( word ) for word in words[:16] ] ).reshape( (1, 4, 4) )
+		return None
+
+	# the value of a matrix attribute as an (F,4,4) or (1,4,4) array
+	def matrixValue(self, name, names):
+
+		plug = self.scene.source( name, names )
+		if plug is None:
+			saved = self.savedMatrix( name, names )
+			return saved if saved is not None else numpy.eye(4).reshape( (1, 4, 4) )
+
+		nodeName, attribute = rtMayaAscii.splitPlug( plug )
+		nodeName = self.scene.nodeName( nodeName )
+		if self.scene.node( nodeName ) is not None:
+			for short, longName in kTransformMatrices.items():
+				if attribute in ( short, longName ):
+					if short in ( "m", "im" ):
+						matrices = self.localMatrix( nodeName )
+					elif short in ( "pm", "pim" ):
+						matrices = self.parentMatrix( nodeName )
+					else:
+						matrices = self.worldMatrix( nodeName )
+					if short in ( "im", "pim", "wim" ):
+						matrices = numpy.linalg.inv( matrices )
+					return matrices
+
+		self.warn( "%s: the matrix is not evaluated, using the saved value" % plug )
+		saved = self.savedMatrix( nodeName, ( attribute, ) )
+		return saved if saved is not None else numpy.eye(4).reshape( (1, 4, 4) )
+
+	# an enum or bool of a node for every frame, saved or connected like the floats
+	def intValue(self, name, names, default=0):
+		return numpy.rint( self.floatValue( name, names, default ) ).astype( int )
+
+	# translate, rotate and scale of an rt4x4MatrixToTRS node for every frame as (F,3)
+	# arrays, with eulerFilter the rotation of every frame is the one closest to the
+	# frame before instead of the one closest to zero
+	def evaluateNode(self, name, eulerFilter=False):
+		values, offsets = self.decomposeNode( name, eulerFilter )
+		return addOffsets( values, offsets )
+
+	# the eulerRotateOrder of a node for every frame
+	def rotateOrder(self, name):
+		return self.intValue( name, ( "ero", "eulerRotateOrder" ) )
+
+	# the ( translate, rotate, scale ) of an rt4x4MatrixToTRS node before its offsets
+	# are added and the ( offsetTranslate, offsetRotate, offsetScale ), all (F,3) arrays
+	def decomposeNode(self, name, eulerFilter=False):
+
+		# the node reads inputMatrix when it is connected and the 16 floats otherwise
+		if self.scene.source( name, ( "imat", "inputMatrix" ) ) is not None:
+			matrices = self.matrixValue( name, ( "imat", "inputMatrix" ) )
+			matrices = numpy.broadcast_to( matrices, ( len( self.frames ), 4, 4 ) ).copy()
+		else:
+			columns = [ self.floatValue( name, ( short, longName ), default )
+					for short, longName, default in kMatrixInAttributes ]
+			# matrixIn is made of floats, round like the node does
+			matrices = numpy.stack( columns, axis=1 ).astype( numpy.float32 ).astype( numpy.float64 ).reshape( (-1, 4, 4) )
+
+		offsets = []
+		for short, longName in kOffsetAttributes:
+			offsets.append( numpy.stack( [ self.floatValue( name, ( short + axis, longName + kLongAxes[index] ), 0.0,
+							( short, longName ), index ) for index, axis in enumerate( kAxes ) ], axis=1 ) )
+
+		# normalize, eulerRotateOrder and decompositionMode can be keyed or connected too,
+		# the frames are decomposed in one call for each combination of them
+		rotateOrder = self.rotateOrder( name )
+		settings = numpy.stack( [ rotateOrder, self.intValue( name, ( "n", "normalize" ) ) != 0,
+					self.intValue( name, ( "dcm", "decompositionMode" ) ) ], axis=1 )
+		parentInverse = self.matrixValue( name, ( "pim", "parentInverseMatrix" ) )
+		trans, rot, scale = [ numpy.empty( ( len( self.frames ), 3 ) ) for index in range(3) ]
+		for order, normalize, mode in numpy.unique( settings, axis=0 ):
+			rows = numpy.all( settings == ( order, normalize, mode ), axis=1 )
+			values = rtMatrixKernel.decompose( matrices[rows], parentInverse if len( parentInverse ) == 1 else parentInverse[rows],
+							int( order ), bool( normalize ), decompositionMode=int( mode ) )
+			for array, value in zip( ( trans, rot, scale ), values ):
+				array[rows] = value
+
+		# the two solutions of a rotation are only the same without the offset, the
+		# frames are filtered in runs of the same rotate order
+		if eulerFilter:
+			for run in numpy.split( numpy.arange( len( self.frames ) ), numpy.flatnonzero( numpy.diff( rotateOrder ) ) + 1 ):
+				rot[run] = rtMatrixKernel.filterEulerArray( rot[run], int( rotateOrder[run[0]] ) )
+		return ( trans, rot, scale ), offsets
+
+
+# the outputs are float vectors, the offsets are added in float like the node does
+def addOffsets(values, offsets):
+	return [ ( value.astype( numpy.float32 ) + offset.astype( numpy.float32 ) ).astype( numpy.float64 )
+		for value, offset in zip( values, offsets ) ]
+
+
+# the frame range of playbackOptions saved in the scene or None
+def sceneFrameRange(scene):
+	node = scene.node( "sceneConfigurationScriptNode" )
+	words = node.value( ( "b", "before" ) ) if node is not None else None
+	if not words:
+		return None
+	options = rtMayaAscii.splitStatement( words[0] )
+	start = rtMayaAscii.flagValue( options, ( "-min", "-minTime" ) )
+	end = rtMayaAscii.flagValue( options, ( "-max", "-maxTime" ) )
+	if start is None or end is None:
+		return None
+	return float( start ), float( end )
+
+# write ( node, frames, ( translate, rotate, scale ) ) results as CSV rows
+def writeCsv(stream, results):
+	stream.write( "node,frame,translateX,translateY,translateZ,rotateX,rotateY,rotateZ,scaleX,scaleY,scaleZ\n" )
+	for name, frames, values in results:
+		table = numpy.concatenate( values, axis=1 )
+		for frame, row in zip( frames, table ):
+			stream.write( "%s,%.9g,%s\n" % ( name, frame, ",".join( [ "%.9g" % value for value in row ] ) ) )
+
+# write ( node, frames, ( translate, rotate, scale ) ) results to an NPZ file with
+# the arrays frames, <node>.translate, <node>.rotate and <node>.scale
+def writeNpz(path, results):
+	arrays = {}
+	for name, frames, values in results:
+		arrays["frames"] = frames
+		for channel, value in zip( ( "translate", "rotate", "scale" ), values ):
+			arrays["%s.%s" % ( name, channel )] = value
+	numpy.savez( path, **arrays )
+
+# read the rt4x4MatrixToTRS nodes of a scene and everything upstream of them, all
+# of them without nodeNames, returns the scene and the node names
+def loadScene(path, nodeNames=None):
+
+	scene = rtMayaAscii.rtMayaAsciiScene()
+	scene.scan( path )
+	names = nodeNames or sorted( scene.nodesOfType( kNodeTypeName ) )
+	missing = [ name for name in names if scene.node( name ) is None ]
+	if missing:
+		raise ValueError( "%s: no node named %s" % ( path, ", ".join( missing ) ) )
+
+	needed = scene.upstream( names )
+	needed.add( "sceneConfigurationScriptNode" )
+	scene.load( path, needed )
+	return scene, names
+
+# the number of frames from start to end, end included when a step lands on it
+def frameCount(start, end, step=1.0):
+	return max( int( numpy.floor( ( end - start ) / step + 1.0e-9 ) ) + 1, 1 )
+
+# the start and end of a frame range, the playback range saved in the scene fills
+# in the ones that are None
+def sceneFrames(scene, start=None, end=None):
+	if start is None or end is None:
+		frameRange = sceneFrameRange( scene ) or ( 1.0, 24.0 )
+		start = frameRange[0] if start is None else start
+		end = frameRange[1] if end is None else end
+	return start, end
+
+# evaluate the rt4x4MatrixToTRS nodes of a scene, returns a list of
+# ( node, frames, ( translate, rotate, scale ) ) and the warnings, with eulerFilter
+# the rotations are continuous from frame to frame
+def evaluateScene(path, start=None, end=None, step=1.0, nodeNames=None, eulerFilter=False):
+
+	scene, names = loadScene( path, nodeNames )
+	start, end = sceneFrames( scene, start, end )
+	frames = start + step * numpy.arange( frameCount( start, end, step ) )
+
+	evaluator = rtSceneEvaluator( scene, frames )
+	results = [ ( name, frames, evaluator.evaluateNode( name, eulerFilter ) ) for name in names ]
+	return results, evaluator.warnings
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Evaluate the rt4x4MatrixToTRS nodes of a Maya ASCII scene without Maya." )
+	parser.add_argument( "scene", help="the .ma file" )
+	parser.add_argument( "-o", "--output", help="a .csv, .npz or .trs file, CSV goes to stdout without it" )
+	parser.add_argument( "--start", type=float, help="first frame, playbackOptions -min by default" )
+	parser.add_argument( "--end", type=float, help="last frame, playbackOptions -max by default" )
+	parser.add_argument( "--step", type=float, default=1.0, help="frame step" )
+	parser.add_argument( "--node", action="append", dest="nodes", help="a node to evaluate, all of them by default" )
+	parser.add_argument( "--euler-filter", action="store_true", help="keep the rotations continuous from frame to frame" )
+	parser.add_argument( "--match", nargs=2, action="append", default=[], metavar=( "NODE", "REFERENCE" ),
+				help="exit with 1 when the two nodes differ on a frame" )
+	args = parser.parse_args( argv )
+
+	nodes = args.nodes
+	if nodes:
+		nodes = nodes + [ name for pair in args.match for name in pair if name not in nodes ]
+	try:
+		results, warnings = evaluateScene( args.scene, args.start, args.end, args.step, nodes, args.euler_filter )
+	except ( IOError, ValueError ) as error:
+		parser.error( str( error ) )
+	for warning in warnings:
+		sys.stderr.write( "# Warning: %s\n" % warning )
+
+	if args.output is None:
+		writeCsv( sys.stdout, results )
+	elif os.path.splitext( args.output )[1].lower() == ".npz":
+		writeNpz( args.output, results )
+	elif os.path.splitext( args.output )[1].lower() == ".trs":
+		rtTRSCache.write( args.output, results )
+	else:
+		stream = open( args.output, "w" )
+		try:
+			writeCsv( stream, results )
+		finally:
+			stream.close()
+
+	values = dict( [ ( name, ( frames, numpy.concatenate( nodeValues, axis=1 ) ) ) for name, frames, nodeValues in results ] )
+	failed = False
+	for name, reference in args.match:
+		for node in ( name, reference ):
+			if node not in values:
+				parser.error( "--match: %s is not an %s node" % ( node, kNodeTypeName ) )
+		frames, table = values[name]
+		different = ~numpy.all( numpy.isclose( table, values[reference][1], rtol=1.0e-6, atol=1.0e-6 ), axis=1 )
+		for frame in frames[different]:
+			sys.stderr.write( "# Error: %s and %s differ on frame %g\n" % ( name, reference, frame ) )
+		failed = failed or different.any()
+	return 1 if failed else 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,612 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_golden
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# A golden reference corpus for the decomposition paths and a harness that checks
+# every implementation against it and times it in the same run, so a faster path is
+# only switched on once it is known to give the same curves.
+#
+# The reference is the compute() of the first version of the node: the 16 floats,
+# the rotation rows normalized when normalize is on, times parentInverseMatrix,
+# MTransformationMatrix for translate, rotate and scale, the euler rotation reordered
+# with MEulerRotation.reorderIt() and the offsets added to float outputs. --generate
+# runs it on the maya.OpenMaya of Maya, under a mayapy with numpy, and refuses the
+# stand-in in mayaStandIn, whose MTransformationMatrix is a copy and not the
+# reference. The corpus is not shipped, generate it once next to this file:
+#   mayapy rt4x4MatrixToTRS_golden.py --generate
+# The check runs the nodes on the stand-in, and the reference on it as the
+# MTransformationMatrix row, so the stand-in is measured against Maya as well.
+#
+# No corpus has been recorded in Maya yet. Until one is, nothing here compares a path
+# with the output of Maya: the stand-in MTransformationMatrix follows the same steps
+# as rtMatrixKernel, so a check against it can only catch a path that disagrees with
+# the kernel. The node keeps MTransformationMatrix for that reason, the kernel, the
+# array node, the rt4x4MatrixToTRSSample command and the bake and evaluate scripts
+# are not validated against Maya.
+#
+# The corpus is generated from a seed and covers all six rotate orders with
+# normalize on and off, a non identity parentInverseMatrix and nonzero offsets on
+# every case:
+#   random      random rotate, scale with negative and tiny values and a little shear
+#   gimbal      the middle angle of the rotate order at +-90 degrees and just off it
+#   flip        angles at and around +-180 degrees
+#   degenerate  zero and parallel rows, a zero or tiny 3x3, a reflection, huge scale
+#
+# The file is little endian, a header of the magic "RTGOLD01", the version and the
+# case count as uint32, then one 268 byte record per case: category, rotate order,
+# normalize and flags bytes, the 16 matrix values as float32, the parentInverseMatrix
+# as 16 float64, the offsetTranslate, offsetRotate and offsetScale as 9 float32 and the
+# reference translate, rotate and scale as 9 float32 like the outputs of the node.
+#
+# A case passes when translate and scale are within --tolerance, absolute or relative,
+# and every angle is within --angle-tolerance degrees, whole turns apart count as the
+# same. At gimbal lock the first and last angle are not unique, a gimbal case whose
+# scale and angles give the same matrix within --tolerance passes and is counted as
+# equivalent. A singular matrix, flag kSingular, has no rotation to match and the sign
+# of its scale is rounding, only its translate and the size of its scale are checked.
+#
+# Then the nodes and the kernel decompose the matrices of the cases once in each
+# decompositionMode and their translate, rotate, scale and shear are composed again
+# with rtMatrixKernel.compose() in the same mode. A case passes when that is the
+# matrix it came from within --tolerance relative to its largest value, singular
+# cases are left out. --rebuild runs only this check on new cases, without a corpus,
+# it shows a path is consistent with itself and not that it matches Maya.
+# The harness exits with 1 when a case fails.
+#
+# usage: python rt4x4MatrixToTRS_golden.py [--corpus rt4x4MatrixToTRS_golden.bin]
+#                 [--impl "API 1.0" ...] [--tolerance 1e-4] [--angle-tolerance 1e-3]
+#        python rt4x4MatrixToTRS_golden.py --rebuild [--count 1024] [--seed 1]
+#        python rt4x4MatrixToTRS_golden.py --generate [--count 1024] [--seed 1]
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import math
+import struct
+import argparse
+
+import numpy
+
+import rtMatrixKernel
+import rtMatrixCache
+
+# the OpenMaya of Maya for --generate, or the stand-in and the plugins on top of it
+# for the check, imported once the mode is known
+OpenMaya = None
+standInScene = None
+rt4x4MatrixToTRS = None
+rt4x4MatrixToTRSApi2 = None
+
+kStandInPath = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "mayaStandIn" )
+
+kMagic = b"RTGOLD01"
+kVersion = 1
+
+kDefaultCorpus = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "rt4x4MatrixToTRS_golden.bin" )
+
+kRandom = 0
+kGimbal = 1
+kFlip = 2
+kDegenerate = 3
+kCategories = ( "random", "gimbal", "flip", "degenerate" )
+
+# the rows of the matrix do not span 3 axes, any rotation is as good as another
+kSingular = 1
+
+_header = struct.Struct( "<8sII" )
+
+kCaseType = numpy.dtype( [ ( "category", "u1" ), ( "rotateOrder", "u1" ), ( "normalize", "u1" ), ( "flags", "u1" ),
+			( "matrix", "<f4", ( 16, ) ), ( "parentInverse", "<f8", ( 16, ) ),
+			( "offsets", "<f4", ( 9, ) ), ( "reference", "<f4", ( 9, ) ) ] )
+
+kOutputs = ( "outputTranslate", "outputRotate", "outputScale" )
+
+# the decompositionMode enum names
+kModeNames = ( "transformationMatrix", "polar" )
+
+kDefaultTolerance = 1.0e-4
+kDefaultAngleTolerance = 1.0e-3
+
+
+# True if an OpenMaya module is the one of the stand-in
+def isStandIn(module):
+	return os.path.abspath( module.__file__ ).startswith( kStandInPath + os.sep )
+
+# import the OpenMaya of Maya to generate the reference with, a mayapy session
+# is started when there is none yet
+def importMaya():
+	global OpenMaya
+
+	try:
+		import maya.standalone
+		try:
+			maya.standalone.initialize()
+		except RuntimeError:
+			# already inside a Maya session
+			pass
+	except ImportError:
+		pass
+	try:
+		import maya.OpenMaya as module
+	except ImportError:
+		raise ImportError( "the reference needs the maya.OpenMaya of Maya, run --generate with mayapy" )
+	if isStandIn( module ):
+		raise ImportError( "maya.OpenMaya is the stand-in in %s, run --generate with mayapy" % kStandInPath )
+	OpenMaya = module
+
+# import the stand-in and the two plugins on top of it to check them
+def importStandIn():
+	global OpenMaya, standInScene, rt4x4MatrixToTRS, rt4x4MatrixToTRSApi2
+
+	if kStandInPath not in sys.path:
+		sys.path.insert( 0, kStandInPath )
+	import standInScene as scene
+	import maya.OpenMaya as module
+	import rt4x4MatrixToTRS as plugin
+	import rt4x4MatrixToTRSApi2 as pluginApi2
+	OpenMaya, standInScene, rt4x4MatrixToTRS, rt4x4MatrixToTRSApi2 = module, scene, plugin, pluginApi2
+
+
+# -----------------------------------------------------------------------------------
+# the corpus
+# -----------------------------------------------------------------------------------
+
+# the angles that put the middle axis of a rotate order at angle degrees
+def _middleAngles(generator, rotateOrder, angle):
+	angles = generator.uniform( -180.0, 180.0, 3 )
+	angles[rtMatrixKernel.kRotateOrderAxes[rotateOrder][1]] = angle
+	return angles
+
+# the 16 values and flags of a case of a category
+def _caseMatrix(generator, category, rotateOrder, index):
+
+	translate = generator.uniform( -100.0, 100.0, 3 )
+	scale = generator.uniform( 0.2, 3.0, 3 )
+	shear = numpy.zeros( 3 )
+	if category == kRandom:
+		rotate = generator.uniform( -180.0, 180.0, 3 )
+		if index % 5 == 0:
+			scale = scale * generator.choice( ( -1.0, 1.0 ), 3 )
+		if index % 7 == 0:
+			scale[index % 3] = 1.0e-4
+		if index % 3 == 0:
+			shear = generator.uniform( -0.3, 0.3, 3 )
+	elif category == kGimbal:
+		offset = ( 0.0, 1.0e-6, 1.0e-4, 1.0e-2, 0.5 )[index % 5]
+		rotate = _middleAngles( generator, rotateOrder, generator.choice( ( -90.0, 90.0 ) ) + generator.choice( ( -offset, offset ) ) )
+	elif category == kFlip:
+		rotate = generator.uniform( -180.0, 180.0, 3 )
+		axis = index % 3
+		rotate[axis] = generator.choice( ( -180.0, 180.0 ) ) + generator.uniform( -1.0e-3, 1.0e-3 ) * ( index % 2 )
+	else:
+		rotate = generator.uniform( -180.0, 180.0, 3 )
+
+	matrix = rtMatrixKernel.compose( translate, rotate, scale, shear, rotateOrder )[0]
+	flags = 0
+	if category == kDegenerate:
+		kind = index % 6
+		if kind <= 2:
+			flags |= kSingular
+		if kind == 0:
+			matrix[index % 3, :3] = 0.0
+		elif kind == 1:
+			matrix[( index + 1 ) % 3, :3] = matrix[index % 3, :3] * 2.0
+		elif kind == 2:
+			matrix[:3, :3] = 0.0
+		elif kind == 3:
+			matrix[:3, :3] *= 1.0e-6
+		elif kind == 4:
+			matrix[:3, :3] = numpy.diag( ( -1.0, 1.0, 1.0 ) )
+		else:
+			matrix[:3, :3] *= 1.0e5
+	return matrix.reshape( 16 ), flags
+
+# generate the cases of a corpus without their reference outputs, count cases split
+# over the categories, random first
+def generateCases(count, seed=1):
+
+	generator = numpy.random.RandomState( seed )
+	shares = ( count // 2, count // 6, count // 6 )
+	categories = [ kRandom ] * shares[0] + [ kGimbal ] * shares[1] + [ kFlip ] * shares[2]
+	categories += [ kDegenerate ] * ( count - len( categories ) )
+
+	cases = numpy.zeros( count, dtype=kCaseType )
+	counters = [ 0 ] * len( kCategories )
+	for number, category in enumerate( categories ):
+		index = counters[category]
+		counters[category] += 1
+		rotateOrder = number % 6
+		case = cases[number]
+		case["category"] = category
+		case["rotateOrder"] = rotateOrder
+		case["normalize"] = ( number // 6 ) % 2
+		case["matrix"], case["flags"] = _caseMatrix( generator, category, rotateOrder, index )
+		parentInverse = rtMatrixKernel.compose( generator.uniform( -10.0, 10.0, 3 ), generator.uniform( -180.0, 180.0, 3 ),
+							generator.uniform( 0.5, 2.0, 3 ), rotateOrder=generator.randint( 0, 6 ) )[0]
+		case["parentInverse"] = parentInverse.reshape( 16 )
+		case["offsets"] = numpy.concatenate( ( generator.uniform( -5.0, 5.0, 3 ), generator.uniform( -45.0, 45.0, 3 ),
+							generator.uniform( -0.5, 0.5, 3 ) ) )
+	return cases
+
+def write(path, cases):
+	stream = open( path, "wb" )
+	try:
+		stream.write( _header.pack( kMagic, kVersion, len( cases ) ) )
+		stream.write( cases.astype( kCaseType ).tobytes() )
+	finally:
+		stream.close()
+
+def read(path):
+	stream = open( path, "rb" )
+	try:
+		data = stream.read()
+	finally:
+		stream.close()
+	if len( data ) < _header.size:
+		raise IOError( "%s: not a golden corpus" % path )
+	magic, version, count = _header.unpack_from( data )
+	if magic != kMagic or version != kVersion:
+		raise IOError( "%s: not a version %d golden corpus" % ( path, kVersion ) )
+	if len( data ) != _header.size + count * kCaseType.itemsize:
+		raise IOError( "%s: expected %d cases" % ( path, count ) )
+	return numpy.frombuffer( data, dtype=kCaseType, offset=_header.size ).copy()
+
+
+# -----------------------------------------------------------------------------------
+# implementations, each returns the (N,9) outputs of the cases and the seconds spent
+# decomposing them
+# -----------------------------------------------------------------------------------
+
+# the compute() of the first version of the node for one case
+def referenceCase(case):
+
+	values = [ float( value ) for value in case["matrix"] ]
+	x_vector = OpenMaya.MVector( values[0], values[1], values[2] )
+	y_vector = OpenMaya.MVector( values[4], values[5], values[6] )
+	z_vector = OpenMaya.MVector( values[8], values[9], values[10] )
+	if case["normalize"]:
+		x_vector.normalize()
+		y_vector.normalize()
+		z_vector.normalize()
+
+	getMatrix = OpenMaya.MMatrix()
+	OpenMaya.MScriptUtil().createMatrixFromList( ( x_vector.x, x_vector.y, x_vector.z, values[3],
+							y_vector.x, y_vector.y, y_vector.z, values[7],
+							z_vector.x, z_vector.y, z_vector.z, values[11],
+							values[12], values[13], values[14], values[15] ), getMatrix )
+	pInvMatrix = OpenMaya.MMatrix()
+	OpenMaya.MScriptUtil().createMatrixFromList( [ float( value ) for value in case["parentInverse"] ], pInvMatrix )
+
+	mTM = OpenMaya.MTransformationMatrix( getMatrix * pInvMatrix )
+	trans = mTM.getTranslation( OpenMaya.MSpace.kTransform )
+	rot = mTM.rotation().asEulerRotation()
+	rot.reorderIt( int( case["rotateOrder"] ) )
+
+	scaleDoubleArray = OpenMaya.MScriptUtil()
+	scaleDoubleArray.createFromList( [ 0.0, 0.0, 0.0 ], 3 )
+	scaleDoubleArrayPtr = scaleDoubleArray.asDoublePtr()
+	mTM.getScale( scaleDoubleArrayPtr, OpenMaya.MSpace.kTransform )
+	scale = [ OpenMaya.MScriptUtil().getDoubleArrayItem( scaleDoubleArrayPtr, i ) for i in range(3) ]
+
+	offsets = [ float( value ) for value in case["offsets"] ]
+	values = [ trans.x, trans.y, trans.z, math.degrees( rot.x ), math.degrees( rot.y ), math.degrees( rot.z ) ] + scale
+	return [ value + offset for value, offset in zip( values, offsets ) ]
+
+def runReference(cases):
+	outputs = numpy.empty( ( len( cases ), 9 ) )
+	start = time.perf_counter()
+	for index, case in enumerate( cases ):
+		outputs[index] = referenceCase( case )
+	elapsed = time.perf_counter() - start
+	# the outputs of the node are float vectors
+	return outputs.astype( numpy.float32 ).astype( numpy.float64 ), elapsed
+
+# a node of a plugin module set to a case
+def _setCase(node, case, connectInputMatrix):
+	values = [ float( value ) for value in case["matrix"] ]
+	api = standInScene.apiModule( node )
+	if connectInputMatrix:
+		standInScene.setAttr( node, "inputMatrix", api.MMatrix( [ values[0:4], values[4:8], values[8:12], values[12:16] ] ) )
+	else:
+		for index, value in enumerate( values ):
+			standInScene.setAttr( node, "in%d%d" % ( index // 4, index % 4 ), value )
+	parentInverse = [ float( value ) for value in case["parentInverse"] ]
+	standInScene.setAttr( node, "parentInverseMatrix", api.MMatrix( [ parentInverse[0:4], parentInverse[4:8], parentInverse[8:12], parentInverse[12:16] ] ) )
+	standInScene.setAttr( node, "eulerRotateOrder", int( case["rotateOrder"] ) )
+	standInScene.setAttr( node, "normalize", bool( case["normalize"] ) )
+	offsets = [ float( value ) for value in case["offsets"] ]
+	for index, name in enumerate( ( "offsetTranslate", "offsetRotate", "offsetScale" ) ):
+		standInScene.setAttr( node, name, tuple( offsets[index * 3:index * 3 + 3] ) )
+
+# compute() of a plugin for every case, with a cacheMode every case is computed twice
+# and the second, cached, evaluation is the one checked and timed
+def runNode(module, cases, connectInputMatrix=False, cacheMode=None):
+
+	standInScene.loadPlugin( module )
+	try:
+		node = standInScene.createNode( module.kMatrixUtilNodeTypeName )
+	finally:
+		standInScene.unloadPlugin( module )
+	if connectInputMatrix:
+		standInScene.connectAttr( node, "inputMatrix" )
+	for output in kOutputs:
+		standInScene.connectAttr( node, output )
+	if cacheMode is not None:
+		standInScene.setAttr( node, "cacheMode", cacheMode )
+	api = standInScene.apiModule( node )
+	plugs = [ api.MPlug( node.thisMObject(), standInScene.attributeObject( node, output ) ) for output in kOutputs ]
+	dataBlock = node._standInBlock
+
+	outputs = numpy.empty( ( len( cases ), 9 ) )
+	elapsed = 0.0
+	for index, case in enumerate( cases ):
+		_setCase( node, case, connectInputMatrix )
+		for evaluation in range( 1 if cacheMode is None else 2 ):
+			standInScene.dirty( node )
+			start = time.perf_counter()
+			for plug in plugs:
+				if not dataBlock.isClean( plug.attribute() ):
+					node.compute( plug, dataBlock )
+			if evaluation == 0 and cacheMode is not None:
+				continue
+			elapsed += time.perf_counter() - start
+		outputs[index] = [ value for output in kOutputs for value in standInScene.getAttr( node, output ) ]
+	if cacheMode is not None:
+		rtMatrixCache.sharedCache.clear()
+	return outputs, elapsed
+
+# rtMatrixKernel.matrixToTRS() one case at a time
+def runKernel(cases):
+	outputs = numpy.empty( ( len( cases ), 9 ) )
+	start = time.perf_counter()
+	for index, case in enumerate( cases ):
+		parentInverse = case["parentInverse"].tolist()
+		offsets = case["offsets"].tolist()
+		trans, rot, scale = rtMatrixKernel.matrixToTRS( case["matrix"].tolist(), [ parentInverse[0:4], parentInverse[4:8], parentInverse[8:12], parentInverse[12:16] ],
+								int( case["rotateOrder"] ), bool( case["normalize"] ), offsets[0:3], offsets[3:6], offsets[6:9] )
+		outputs[index] = list( trans ) + list( rot ) + list( scale )
+	return outputs, time.perf_counter() - start
+
+# rtMatrixKernel.decompose() in one call per rotate order and normalize
+def runKernelArray(cases):
+	outputs = numpy.empty( ( len( cases ), 9 ) )
+	start = time.perf_counter()
+	for rotateOrder in range( 6 ):
+		for normalize in ( 0, 1 ):
+			rows = numpy.nonzero( ( cases["rotateOrder"] == rotateOrder ) & ( cases["normalize"] == normalize ) )[0]
+			if not rows.size:
+				continue
+			offsets = cases["offsets"][rows].astype( numpy.float64 )
+			values = rtMatrixKernel.decompose( cases["matrix"][rows], cases["parentInverse"][rows], rotateOrder, bool( normalize ),
+								offsets[:, 0:3], offsets[:, 3:6], offsets[:, 6:9] )
+			outputs[rows] = numpy.concatenate( values, axis=1 )
+	return outputs, time.perf_counter() - start
+
+# ( name, function of the cases ) of every implementation
+kImplementations = ( ( "MTransformationMatrix", runReference ),
+		( "API 1.0", lambda cases: runNode( rt4x4MatrixToTRS, cases ) ),
+		( "API 1.0 inputMatrix", lambda cases: runNode( rt4x4MatrixToTRS, cases, connectInputMatrix=True ) ),
+		( "API 1.0 node cache", lambda cases: runNode( rt4x4MatrixToTRS, cases, cacheMode=rtMatrixCache.kCacheNode ) ),
+		( "API 1.0 shared cache", lambda cases: runNode( rt4x4MatrixToTRS, cases, cacheMode=rtMatrixCache.kCacheShared ) ),
+		( "API 2.0", lambda cases: runNode( rt4x4MatrixToTRSApi2, cases ) ),
+		( "API 2.0 shared cache", lambda cases: runNode( rt4x4MatrixToTRSApi2, cases, cacheMode=rtMatrixCache.kCacheShared ) ),
+		( "kernel matrixToTRS", runKernel ),
+		( "kernel decompose", runKernelArray ) )
+
+
+# -----------------------------------------------------------------------------------
+# checking
+# -----------------------------------------------------------------------------------
+
+# compare outputs with the reference of the cases, returns the failed and equivalent
+# masks and the worst ( translate, rotate, scale ) errors of the values checked
+def compare(cases, outputs, tolerance=kDefaultTolerance, angleTolerance=kDefaultAngleTolerance):
+
+	reference = cases["reference"].astype( numpy.float64 )
+	singular = ( cases["flags"] & kSingular ) != 0
+
+	# the sign of the determinant of a singular matrix is rounding, compare the size
+	# of its scale
+	if singular.any():
+		offsetScale = cases["offsets"][singular, 6:9].astype( numpy.float64 )
+		outputs = outputs.copy()
+		reference = reference.copy()
+		outputs[singular, 6:9] = numpy.abs( outputs[singular, 6:9] - offsetScale ) + offsetScale
+		reference[singular, 6:9] = numpy.abs( reference[singular, 6:9] - offsetScale ) + offsetScale
+	linear = numpy.abs( outputs - reference )
+	linearLimit = tolerance * numpy.maximum( numpy.abs( reference ), 1.0 )
+	linearFailed = ( linear[:, [0, 1, 2, 6, 7, 8]] > linearLimit[:, [0, 1, 2, 6, 7, 8]] ).any( axis=1 )
+
+	angles = numpy.abs( numpy.remainder( outputs[:, 3:6] - reference[:, 3:6] + 180.0, 360.0 ) - 180.0 )
+	angleFailed = ( angles > angleTolerance ).any( axis=1 ) | ~numpy.isfinite( outputs ).all( axis=1 )
+
+	# at gimbal lock compare the scale and rotation matrices the outputs and the
+	# reference give
+	equivalent = numpy.zeros( len( cases ), dtype=bool )
+	candidates = numpy.nonzero( angleFailed & ~linearFailed & ( cases["category"] == kGimbal ) )[0]
+	for index in candidates:
+		offsets = cases["offsets"][index].astype( numpy.float64 )
+		rotateOrder = int( cases["rotateOrder"][index] )
+		matrices = rtMatrixKernel.compose( ( 0.0, 0.0, 0.0 ), numpy.array( [ outputs[index, 3:6], reference[index, 3:6] ] ) - offsets[3:6],
+						numpy.array( [ outputs[index, 6:9], reference[index, 6:9] ] ) - offsets[6:9], rotateOrder=rotateOrder )
+		equivalent[index] = numpy.abs( matrices[0] - matrices[1] ).max() <= tolerance * max( numpy.abs( matrices[1] ).max(), 1.0 )
+	failed = linearFailed | ( angleFailed & ~equivalent & ~singular )
+
+	checked = angles[~equivalent & ~singular]
+	worst = ( linear[:, 0:3].max() if len( cases ) else 0.0, checked.max() if checked.size else 0.0,
+		linear[:, 6:9].max() if len( cases ) else 0.0 )
+	return failed, equivalent, worst
+
+def check(cases, names=None, tolerance=kDefaultTolerance, angleTolerance=kDefaultAngleTolerance):
+	results = []
+	for name, function in kImplementations:
+		if names and name not in names:
+			continue
+		outputs, elapsed = function( cases )
+		failed, equivalent, worst = compare( cases, outputs, tolerance, angleTolerance )
+		results.append( { "name": name, "cases": len( cases ), "failed": failed, "equivalent": equivalent,
+				"worst": worst, "seconds": elapsed } )
+	return results
+
+
+# -----------------------------------------------------------------------------------
+# rebuilding, in both decompositionModes the outputs have to give back the matrix
+# they came from, translate, rotate, scale and shear composed in the same mode
+# -----------------------------------------------------------------------------------
+
+# the matrices the cases decompose, after normalize and parentInverseMatrix
+def caseMatrices(cases):
+	matrices = rtMatrixKernel.asMatrixArray( cases["matrix"] ).copy()
+	normalized = cases["normalize"] != 0
+	matrices[normalized] = rtMatrixKernel.normalizeRows( matrices[normalized] )
+	return numpy.matmul( matrices, cases["parentInverse"].astype( numpy.float64 ).reshape( (-1, 4, 4) ) )
+
+# the (N,12) translate, rotate, scale and shear outputs of a node for every case
+def rebuildNode(module, cases, decompositionMode):
+
+	standInScene.loadPlugin( module )
+	try:
+		node = standInScene.createNode( module.kMatrixUtilNodeTypeName )
+	finally:
+		standInScene.unloadPlugin( module )
+	outputs = kOutputs + ( "outputShear", )
+	for output in outputs:
+		standInScene.connectAttr( node, output )
+	standInScene.setAttr( node, "decompositionMode", decompositionMode )
+
+	values = numpy.empty( ( len( cases ), 12 ) )
+	for index, case in enumerate( cases ):
+		_setCase( node, case, False )
+		for output in outputs:
+			standInScene.computePlug( node, output )
+		values[index] = [ value for output in outputs for value in standInScene.getAttr( node, output ) ]
+	values[:, 0:9] -= cases["offsets"].astype( numpy.float64 )
+	return values
+
+# the (N,12) translate, rotate, scale and shear of rtMatrixKernel.splitMatrixArray()
+def rebuildKernel(cases, decompositionMode):
+
+	matrices = caseMatrices( cases )
+	values = numpy.empty( ( len( cases ), 12 ) )
+	scale, shear, rotation = rtMatrixKernel.splitMatrixArray( matrices, decompositionMode )
+	for rotateOrder in range( 6 ):
+		rows = cases["rotateOrder"] == rotateOrder
+		values[rows, 3:6] = numpy.degrees( rtMatrixKernel.eulerRotationArray( rotation[rows], rotateOrder ) )
+	values[:, 0:3] = matrices[:, 3, :3]
+	values[:, 6:9] = scale
+	values[:, 9:12] = shear
+	return values
+
+# ( name, function of the cases and decompositionMode ) of every implementation rebuilt
+kRebuildImplementations = ( ( "API 1.0", lambda cases, mode: rebuildNode( rt4x4MatrixToTRS, cases, mode ) ),
+		( "API 2.0", lambda cases, mode: rebuildNode( rt4x4MatrixToTRSApi2, cases, mode ) ),
+		( "kernel splitMatrixArray", rebuildKernel ) )
+
+# compose the outputs of every implementation in both modes and compare them with
+# the matrices of the cases, singular cases have no rotation to rebuild and are left
+# out. Returns ( name, decompositionMode, failed mask, worst relative error ) tuples
+def rebuild(cases, tolerance=kDefaultTolerance):
+
+	matrices = caseMatrices( cases )
+	checked = ( cases["flags"] & kSingular ) == 0
+	size = numpy.maximum( numpy.abs( matrices ).max( axis=( 1, 2 ) ), 1.0 )
+	results = []
+	for name, function in kRebuildImplementations:
+		for mode in ( rtMatrixKernel.kDecomposeTransformationMatrix, rtMatrixKernel.kDecomposePolar ):
+			values = function( cases, mode )
+			rebuilt = numpy.empty( matrices.shape )
+			for rotateOrder in range( 6 ):
+				rows = cases["rotateOrder"] == rotateOrder
+				rebuilt[rows] = rtMatrixKernel.compose( values[rows, 0:3], values[rows, 3:6], values[rows, 6:9], values[rows, 9:12],
+									rotateOrder, decompositionMode=mode )
+			error = numpy.abs( rebuilt - matrices ).max( axis=( 1, 2 ) ) / size
+			error[~numpy.isfinite( error )] = numpy.inf
+			error[~checked] = 0.0
+			results.append( ( name, mode, error > tolerance, error.max() if len( cases ) else 0.0 ) )
+	return results
+
+def report(cases, results, stream=sys.stdout):
+
+	singular = ( cases["flags"] & kSingular ) != 0
+	stream.write( "%-24s %7s %7s %7s %8s %11s %11s %11s %11s %12s\n" % ( "implementation", "cases", "failed", "equiv", "singular",
+				"translate", "rotate", "scale", "us/matrix", "matrices/s" ) )
+	for result in results:
+		seconds = result["seconds"]
+		stream.write( "%-24s %7d %7d %7d %8d %11.3g %11.3g %11.3g %11.2f %12.0f\n" % ( result["name"], result["cases"],
+					result["failed"].sum(), result["equivalent"].sum(), singular.sum(), result["worst"][0], result["worst"][1],
+					result["worst"][2], seconds / max( result["cases"], 1 ) * 1.0e6,
+					result["cases"] / seconds if seconds > 0.0 else 0.0 ) )
+	for result in results:
+		for index in numpy.nonzero( result["failed"] )[0][:5]:
+			case = cases[index]
+			stream.write( "  %s: case %d %s rotate order %d normalize %d\n" % ( result["name"], index, kCategories[case["category"]],
+						case["rotateOrder"], case["normalize"] ) )
+
+def reportRebuild(cases, results, stream=sys.stdout):
+
+	if isStandIn( OpenMaya ):
+		stream.write( "stand-in OpenMaya: a round trip of every path, not a comparison with Maya\n" )
+	stream.write( "%-24s %-21s %7s %7s %11s\n" % ( "rebuild", "decompositionMode", "cases", "failed", "worst" ) )
+	for name, mode, failed, worst in results:
+		stream.write( "%-24s %-21s %7d %7d %11.3g\n" % ( name, kModeNames[mode], len( cases ), failed.sum(), worst ) )
+	for name, mode, failed, worst in results:
+		for index in numpy.nonzero( failed )[0][:5]:
+			case = cases[index]
+			stream.write( "  %s %s: case %d %s rotate order %d normalize %d\n" % ( name, kModeNames[mode], index,
+						kCategories[case["category"]], case["rotateOrder"], case["normalize"] ) )
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Check the rt4x4MatrixToTRS decomposition paths against a golden corpus and time them." )
+	parser.add_argument( "--corpus", default=kDefaultCorpus, help="the corpus file" )
+	parser.add_argument( "--generate", action="store_true", help="write a new corpus with the reference outputs and exit" )
+	parser.add_argument( "--rebuild", action="store_true",
+				help="only check that the outputs rebuild the matrices of new cases in both decompositionModes, no corpus needed" )
+	parser.add_argument( "--count", type=int, default=1024, help="cases of a new corpus" )
+	parser.add_argument( "--seed", type=int, default=1, help="the seed of a new corpus" )
+	parser.add_argument( "--impl", action="append", dest="names", choices=[ name for name, function in kImplementations ],
+				help="an implementation to check, all of them by default" )
+	parser.add_argument( "--tolerance", type=float, default=kDefaultTolerance, help="translate and scale, absolute or relative" )
+	parser.add_argument( "--angle-tolerance", type=float, default=kDefaultAngleTolerance, help="rotate in degrees" )
+	args = parser.parse_args( argv )
+
+	if args.generate:
+		if args.count < 6:
+			parser.error( "--count must be at least 6" )
+		try:
+			importMaya()
+		except ImportError as error:
+			parser.error( str( error ) )
+		cases = generateCases( args.count, args.seed )
+		cases["reference"] = runReference( cases )[0]
+		try:
+			write( args.corpus, cases )
+		except IOError as error:
+			parser.error( str( error ) )
+		sys.stdout.write( "%d cases written to %s\n" % ( len( cases ), args.corpus ) )
+		return 0
+
+	importStandIn()
+	if args.rebuild:
+		cases = generateCases( max( args.count, 6 ), args.seed )
+		rebuilt = rebuild( cases, args.tolerance )
+		reportRebuild( cases, rebuilt )
+		return 1 if any( [ failed.any() for name, mode, failed, worst in rebuilt ] ) else 0
+
+	if not os.path.exists( args.corpus ):
+		parser.error( "%s: no corpus, generate it with mayapy rt4x4MatrixToTRS_golden.py --generate or run --rebuild" % args.corpus )
+	try:
+		cases = read( args.corpus )
+	except IOError as error:
+		parser.error( str( error ) )
+	results = check( cases, args.names, args.tolerance, args.angle_tolerance )
+	report( cases, results )
+	rebuilt = rebuild( cases, args.tolerance )
+	reportRebuild( cases, rebuilt )
+	failed = [ result["failed"].any() for result in results ] + [ failed.any() for name, mode, failed, worst in rebuilt ]
+	return 1 if any( failed ) else 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
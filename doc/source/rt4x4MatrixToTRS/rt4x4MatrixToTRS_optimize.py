@@ -0,0 +1,656 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_optimize
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# Replaces the multMatrix + decomposeMatrix that take the parent inverse out of a
+# fourByFourMatrix by one rt4x4MatrixToTRS node each. A chain is
+#
+#   fourByFourMatrix.output -> multMatrix.matrixIn[0], X -> multMatrix.matrixIn[1],
+#       multMatrix.matrixSum -> decomposeMatrix.inputMatrix
+#
+# The rt4x4MatrixToTRS node takes the name of the decomposeMatrix node and its output
+# connections. fourByFourMatrix.output is connected to inputMatrix, so its double
+# inputs are not squeezed into the float matrixIn children and the fourByFourMatrix
+# stays in the scene. matrixIn[1] of the multMatrix becomes parentInverseMatrix and
+# inputRotateOrder becomes eulerRotateOrder, connected or set. outputRotate of
+# rt4x4MatrixToTRS is in degrees so its connections to angle attributes go through a
+# unitConversion node. A decomposeMatrix fed by a fourByFourMatrix directly has no
+# node to remove and is skipped, as are chains whose multMatrix is used by anything
+# else or whose nodes are referenced or locked.
+#
+# In Maya, with the plugin loaded, it works on the open scene and can be undone:
+#   import rt4x4MatrixToTRS_optimize
+#   rt4x4MatrixToTRS_optimize.optimizeScene()
+#
+# Without Maya it rewrites a Maya ASCII file, everything but the chains is copied
+# as it is:
+# usage: python rt4x4MatrixToTRS_optimize.py scene.ma -o optimized.ma [--dry-run]
+# -----------------------------------------------------------------------------------
+
+import os
+import re
+import sys
+import math
+import argparse
+
+import rtMayaAscii
+
+kNodeTypeName = "rt4x4MatrixToTRS"
+kPluginName = "rt4x4MatrixToTRS.py"
+
+# ( short name, long name ) of the attributes of the chain nodes
+kFourByFourOutput = ( "o", "output" )
+kMultInput = ( "i", "matrixIn" )
+kMultOutput = ( "o", "matrixSum" )
+kDecomposeInput = ( "imat", "inputMatrix" )
+kDecomposeRotateOrder = ( "ro", "inputRotateOrder" )
+
+# the outputs of decomposeMatrix by short and long name and the rt4x4MatrixToTRS
+# output that replaces each, the shear children go from x, y, z to xy, xz, yz
+kOutputAttributes = { "msg": "msg", "message": "msg" }
+for _short, _long, _target, _children in ( ( "ot", "outputTranslate", "ot", ( "X", "Y", "Z" ) ),
+						( "or", "outputRotate", "or", ( "X", "Y", "Z" ) ),
+						( "os", "outputScale", "os", ( "X", "Y", "Z" ) ),
+						( "osh", "outputShear", "osh", ( "X", "Y", "Z" ) ),
+						( "oq", "outputQuat", "oq", ( "X", "Y", "Z", "W" ) ) ):
+	kOutputAttributes[_short] = kOutputAttributes[_long] = _target
+	for _index, _axis in enumerate( _children ):
+		if _target == "osh":
+			_child = "osh" + ( "xy", "xz", "yz" )[_index]
+		else:
+			_child = _target + _axis.lower()
+		kOutputAttributes[_short + _axis.lower()] = kOutputAttributes[_long + _axis] = _child
+
+# the decomposeMatrix outputs in radians, rt4x4MatrixToTRS gives degrees
+kRotateAttributes = ( "or", "orx", "ory", "orz", "outputRotate", "outputRotateX", "outputRotateY", "outputRotateZ" )
+kDegreesToRadians = math.pi / 180.0
+
+kConversionFactor = ( "cf", "conversionFactor" )
+
+# the multMatrix of a chain may only be listed here besides the chain
+kUtilityList = "defaultRenderUtilityList"
+
+_indexPattern = re.compile( r"^(.*)\[(\d+)(?::(\d+))?\]$" )
+
+
+# the attribute of a plug without its node, "node.tg[0].tt" gives "tg[0].tt"
+def plugAttribute(plug):
+	return plug.split( ".", 1 )[1]
+
+def plugNode(plug):
+	return plug.split( ".", 1 )[0]
+
+
+# a fourByFourMatrix, the multMatrix and the decomposeMatrix they feed, skipped is
+# the reason a chain is left alone or None
+class rtMatrixChain(object):
+
+	def __init__(self, decompose, fourByFour=None, multMatrix=None, skipped=None):
+		self.decompose = decompose
+		self.fourByFour = fourByFour
+		self.multMatrix = multMatrix
+		self.skipped = skipped
+		# unitConversion nodes added for outputRotate
+		self.conversions = 0
+
+	# the fourByFourMatrix is kept to feed inputMatrix
+	def removed(self):
+		return [ node for node in ( self.multMatrix, ) if node is not None ]
+
+
+# -----------------------------------------------------------------------------------
+# finding chains
+# -----------------------------------------------------------------------------------
+#
+# findChains() works on a graph, rtAsciiGraph for a .ma file or rtLiveGraph for the
+# open scene, with these methods:
+#   nodesOfType( typeName )          node names
+#   typeOf( node )                   the node type or None
+#   source( node, attributes )       the plug connected to the first attribute found or None
+#   outputs( node )                  ( attribute, destination plug ) of every output connection
+#   multiIndices( node, attributes ) the indices of a multi attribute that are set or connected
+#   isEditable( node )               False for referenced or locked nodes
+
+# True for a connection that only lists a node in the utility list
+def isListing(attribute, destination):
+	return attribute in ( "msg", "message" ) and plugNode( destination ).lstrip( ":" ).startswith( kUtilityList )
+
+# the chain of a decomposeMatrix or None if it is not fed by a fourByFourMatrix
+def findChain(graph, decompose):
+
+	plug = graph.source( decompose, kDecomposeInput )
+	if plug is None:
+		return None
+
+	multMatrix = None
+	node = plugNode( plug )
+	if graph.typeOf( node ) == "multMatrix" and plugAttribute( plug ) in kMultOutput:
+		multMatrix = node
+		plug = graph.source( multMatrix, ( "i[0]", "matrixIn[0]" ) )
+		if plug is None:
+			return None
+		node = plugNode( plug )
+
+	if graph.typeOf( node ) != "fourByFourMatrix" or plugAttribute( plug ) not in kFourByFourOutput:
+		return None
+	chain = rtMatrixChain( decompose, node, multMatrix )
+
+	if multMatrix is None:
+		chain.skipped = "%s feeds it directly, there is no multMatrix to remove" % node
+		return chain
+	if graph.multiIndices( multMatrix, kMultInput ) != [ 0, 1 ]:
+		chain.skipped = "%s does not multiply two matrices" % multMatrix
+		return chain
+
+	for name in [ decompose ] + chain.removed():
+		if not graph.isEditable( name ):
+			chain.skipped = "%s is referenced or locked" % name
+			return chain
+
+	# the multMatrix may only feed the decomposeMatrix
+	for attribute, target in graph.outputs( multMatrix ):
+		if plugNode( target ) != decompose and not isListing( attribute, target ):
+			chain.skipped = "%s is also connected to %s" % ( multMatrix, target )
+			return chain
+
+	for attribute, target in graph.outputs( decompose ):
+		if attribute not in kOutputAttributes:
+			chain.skipped = "%s.%s has no rt4x4MatrixToTRS output" % ( decompose, attribute )
+			return chain
+	return chain
+
+# the chains of every decomposeMatrix node, with the ones that are skipped
+def findChains(graph, decomposes=None):
+
+	if decomposes is None:
+		decomposes = graph.nodesOfType( "decomposeMatrix" )
+	chains = []
+	for decompose in decomposes:
+		chain = findChain( graph, decompose )
+		if chain is not None:
+			chains.append( chain )
+	return chains
+
+# a text report of the chains, the nodes each one removed and the totals
+def report(chains, dryRun=False):
+
+	lines = []
+	collapsed = [ chain for chain in chains if chain.skipped is None ]
+	verb = "would be replaced" if dryRun else "replaced"
+	for chain in collapsed:
+		lines.append( "%s %s by %s, removed %s" % ( chain.decompose, verb, kNodeTypeName, ", ".join( chain.removed() ) ) )
+	for chain in chains:
+		if chain.skipped is not None:
+			lines.append( "skipped %s: %s" % ( chain.decompose, chain.skipped ) )
+
+	removed = sum( [ len( chain.removed() ) for chain in collapsed ] )
+	conversions = sum( [ chain.conversions for chain in collapsed ] )
+	lines.append( "%d chains %s, %d multMatrix removed, %d unitConversion added, %d skipped" %
+			( len( collapsed ), "found" if dryRun else "collapsed", removed, conversions, len( chains ) - len( collapsed ) ) )
+	return "\n".join( lines )
+
+
+# -----------------------------------------------------------------------------------
+# Maya ASCII files
+# -----------------------------------------------------------------------------------
+
+class rtAsciiGraph(rtMayaAscii.rtMayaAsciiScene):
+
+	def __init__(self):
+		rtMayaAscii.rtMayaAsciiScene.__init__(self)
+		# ( node, attribute path ): source plug and node: [ ( attribute path, destination plug ) ]
+		self.sources = {}
+		self.destinations = {}
+		self.requires = []
+		self.lockedNodes = set()
+
+	def _open(self, path):
+		# latin-1 and newline="" give back the bytes of the file as they are
+		return open( path, "r", encoding="latin-1", newline="" )
+
+	# one pass for the nodes, all connections and the values of the chain nodes
+	def read(self, path):
+
+		keepTypes = ( "fourByFourMatrix", "multMatrix", "decomposeMatrix", "unitConversion" )
+		current = [ None ]
+
+		def keep(command):
+			if command == "setAttr":
+				node = self.nodes.get( current[0] )
+				return node is not None and node.typeName in keepTypes
+			return command in ( "createNode", "select", "connectAttr", "requires", "lockNode" )
+
+		stream = self._open( path )
+		try:
+			for command, text in rtMayaAscii.readStatements( stream, keep ):
+				if text is None:
+					continue
+				words = rtMayaAscii.splitStatement( text )
+				if command == "createNode":
+					name = rtMayaAscii.flagValue( words, ( "-n", "-name" ) )
+					current[0] = name
+					if name is not None:
+						self.nodes[name] = rtMayaAscii.rtMayaAsciiNode( name, words[1], rtMayaAscii.flagValue( words, ( "-p", "-parent" ) ) )
+				elif command == "select":
+					selected = [ word for word in words[1:] if not word.startswith( "-" ) ]
+					current[0] = selected[0] if selected else None
+				elif command == "setAttr":
+					self._setAttr( self.nodes.get( current[0] ), words[1:] )
+				elif command == "connectAttr":
+					plugs = connectPlugs( words )
+					if plugs is not None:
+						source, destination = [ self.nodeName( plugNode( plug ) ) + "." + plugAttribute( plug ) for plug in plugs ]
+						self.sources[ ( plugNode( destination ), plugAttribute( destination ) ) ] = source
+						self.destinations.setdefault( plugNode( source ), [] ).append( ( plugAttribute( source ), destination ) )
+				elif command == "requires":
+					self.requires.append( words[1:] )
+				elif command == "lockNode":
+					locked = rtMayaAscii.flagValue( words, ( "-l", "-lock" ), "1" ) not in ( "0", "off", "no", "false" )
+					if locked and current[0] is not None:
+						self.lockedNodes.add( current[0] )
+		finally:
+			stream.close()
+
+	def typeOf(self, node):
+		node = self.node( node )
+		if node is None:
+			return None
+		return node.typeName
+
+	def source(self, node, attributes):
+		for attribute in attributes:
+			plug = self.sources.get( ( node, attribute ) )
+			if plug is not None:
+				return plug
+		return None
+
+	def outputs(self, node):
+		return self.destinations.get( node, [] )
+
+	def multiIndices(self, node, attributes):
+		indices = set()
+		for ( destination, attribute ) in self.sources:
+			match = _indexPattern.match( attribute )
+			if destination == node and match is not None and match.group(1) in attributes:
+				indices.add( int( match.group(2) ) )
+		for attribute in attributes:
+			indices.update( self.nodes[node].arrays.get( attribute, {} ).keys() )
+		return sorted( indices )
+
+	# nodes without a createNode in the file come from references
+	def isEditable(self, node):
+		return node in self.nodes and node not in self.lockedNodes
+
+# the source and destination plugs of a connectAttr statement split in words or None
+def connectPlugs(words):
+	plugs = []
+	index = 1
+	while index < len( words ):
+		word = words[index]
+		if word in ( "-l", "-lock", "-rd", "-referenceDest" ):
+			index += 2
+			continue
+		if not word.startswith( "-" ):
+			plugs.append( word )
+		index += 1
+	if len( plugs ) < 2 or "." not in plugs[0] or "." not in plugs[1]:
+		return None
+	return plugs[0], plugs[1]
+
+# the words of a saved matrix as text for a setAttr statement, an "xform" matrix
+# keeps its quoted type word
+def matrixText(words):
+	text = []
+	for word in words:
+		try:
+			float( word )
+			text.append( word )
+		except ValueError:
+			text.append( '"%s"' % word )
+	return '-type "matrix" ' + " ".join( text )
+
+# the statements that set up the rt4x4MatrixToTRS node of a chain from the saved
+# values of the chain, as setAttr text
+def chainSetAttrs(graph, chain):
+
+	statements = []
+	if graph.source( chain.multMatrix, ( "i[1]", "matrixIn[1]" ) ) is None:
+		multMatrix = graph.nodes[ chain.multMatrix ]
+		for name in kMultInput:
+			words = multMatrix.arrays.get( name, {} ).get( 1 )
+			if words:
+				statements.append( 'setAttr ".pim" %s' % matrixText( words ) )
+				break
+
+	if graph.source( chain.decompose, kDecomposeRotateOrder ) is None:
+		words = graph.nodes[ chain.decompose ].value( kDecomposeRotateOrder )
+		if words is not None:
+			statements.append( 'setAttr ".ero" %s' % " ".join( words ) )
+	return statements
+
+# a node name that is not in the file yet
+def freeName(graph, base, used):
+	index = 1
+	while "%s%d" % ( base, index ) in graph.nodes or "%s%d" % ( base, index ) in used:
+		index += 1
+	name = "%s%d" % ( base, index )
+	used.add( name )
+	return name
+
+# rewrite a Maya ASCII file with the chains collapsed, the chains come from
+# findChains() on the graph read from the same file
+def rewriteFile(graph, chains, path, output):
+
+	chains = [ chain for chain in chains if chain.skipped is None ]
+	decomposes = dict( [ ( chain.decompose, chain ) for chain in chains ] )
+	removed = set()
+	for chain in chains:
+		removed.update( chain.removed() )
+
+	# outputRotate connections either go to a unitConversion, whose factor now also
+	# converts degrees to radians, or get a new unitConversion
+	folded = {}
+	converted = {}
+	newConversions = {}
+	used = set()
+	for chain in chains:
+		for attribute, destination in graph.outputs( chain.decompose ):
+			if attribute not in kRotateAttributes:
+				continue
+			node = plugNode( destination )
+			if graph.typeOf( node ) == "unitConversion":
+				words = graph.nodes[node].value( kConversionFactor )
+				factor = float( words[0] ) if words else 1.0
+				folded[node] = factor * kDegreesToRadians
+			else:
+				name = freeName( graph, "unitConversion", used )
+				converted[ ( attribute, destination ) ] = name
+				newConversions.setdefault( chain.decompose, [] ).append( name )
+				chain.conversions += 1
+
+	hasPlugin = [ words for words in graph.requires if words and words[0] == kPluginName ]
+	requiresLeft = len( graph.requires )
+
+	stream = graph._open( path )
+	newline = "\n"
+	try:
+		first = stream.readline()
+		if first.endswith( "\r\n" ):
+			newline = "\r\n"
+		stream.seek( 0 )
+
+		result = open( output, "w", encoding="latin-1", newline="" )
+		try:
+			current = None
+			for command, text, leading, body in rtMayaAscii.readChunks( stream ):
+				if command is None:
+					result.write( leading )
+					continue
+
+				words = None
+				if command in ( "createNode", "select", "connectAttr" ) or ( command == "setAttr" and ( current in decomposes or current in folded ) ):
+					words = rtMayaAscii.splitStatement( text )
+
+				if command == "requires":
+					requiresLeft -= 1
+					result.write( leading + body )
+					if requiresLeft == 0 and chains and not hasPlugin:
+						result.write( '%srequires "%s" "1.0";' % ( newline, kPluginName ) )
+						hasPlugin = True
+					continue
+
+				if command == "createNode":
+					current = rtMayaAscii.flagValue( words, ( "-n", "-name" ) )
+					if current in removed:
+						result.write( dropped( leading ) )
+						continue
+					# a file without requires statements gets one before its first node
+					if chains and not hasPlugin:
+						head = dropped( leading )
+						result.write( '%s%srequires "%s" "1.0";' % ( head, newline, kPluginName ) )
+						leading = leading[len( head ):]
+						hasPlugin = True
+					if current in decomposes:
+						for name in newConversions.get( current, () ):
+							result.write( '%screateNode unitConversion -n "%s";%s\tsetAttr ".cf" %r;' % ( newline, name, newline, kDegreesToRadians ) )
+						result.write( leading + re.sub( r"^createNode\s+decomposeMatrix\b", "createNode " + kNodeTypeName, body ) )
+						for statement in chainSetAttrs( graph, decomposes[current] ):
+							result.write( "%s\t%s;" % ( newline, statement ) )
+						continue
+					result.write( leading + body )
+					if current in folded:
+						result.write( '%s\tsetAttr ".cf" %r;' % ( newline, folded[current] ) )
+					continue
+
+				if command == "select":
+					selected = [ word for word in words[1:] if not word.startswith( "-" ) ]
+					current = selected[0] if selected else None
+
+				elif command in ( "setAttr", "addAttr", "rename", "lockNode" ):
+					if current in removed:
+						result.write( dropped( leading ) )
+						continue
+					if command == "setAttr" and words is not None:
+						attribute = [ word for word in words[1:] if not word.startswith( "-" ) ][:1]
+						attribute = attribute[0].lstrip( "." ) if attribute else None
+						if current in decomposes and attribute in kDecomposeInput + kDecomposeRotateOrder:
+							result.write( dropped( leading ) )
+							continue
+						if current in folded and attribute in kConversionFactor:
+							result.write( dropped( leading ) )
+							continue
+
+				elif command == "connectAttr":
+					plugs = connectPlugs( words )
+					if plugs is not None:
+						statements = rewriteConnection( graph, decomposes, removed, converted, plugs, words )
+						if statements is not None:
+							if not statements:
+								result.write( dropped( leading ) )
+								continue
+							result.write( leading + statements[0] + ";" )
+							for statement in statements[1:]:
+								result.write( newline + statement + ";" )
+							continue
+
+				result.write( leading + body )
+		finally:
+			result.close()
+	finally:
+		stream.close()
+
+# the blanks and comments before a statement that is dropped, without the line break
+# and indentation of the statement itself
+def dropped(leading):
+	end = max( leading.rfind( "\n" ), 0 )
+	if end and leading[end - 1] == "\r":
+		end -= 1
+	return leading[:end]
+
+# the connectAttr statements that replace one touching a chain, an empty list to
+# drop it or None to keep it as it is
+def rewriteConnection(graph, decomposes, removed, converted, plugs, words):
+
+	source, destination = [ graph.nodeName( plugNode( plug ) ) + "." + plugAttribute( plug ) for plug in plugs ]
+	sourceNode, sourceAttribute = plugNode( source ), plugAttribute( source )
+	destinationNode, destinationAttribute = plugNode( destination ), plugAttribute( destination )
+	flags = [ word for word in words[1:] if word not in plugs ]
+
+	def connect(source, destination):
+		return " ".join( [ "connectAttr", '"%s"' % source, '"%s"' % destination ] + flags )
+
+	# the links inside a chain and the utility list memberships of the removed nodes
+	if sourceNode in removed:
+		return []
+
+	# the fourByFourMatrix feeds inputMatrix in place of the multMatrix
+	if destinationNode in removed:
+		if destinationAttribute in ( "i[0]", "matrixIn[0]" ):
+			return [ connect( plugs[0], "%s.imat" % chainOf( decomposes, destinationNode ) ) ]
+		elif destinationAttribute in ( "i[1]", "matrixIn[1]" ):
+			return [ connect( plugs[0], "%s.pim" % chainOf( decomposes, destinationNode ) ) ]
+		return []
+
+	if destinationNode in decomposes and destinationAttribute in kDecomposeRotateOrder:
+		return [ connect( plugs[0], "%s.ero" % destinationNode ) ]
+
+	if sourceNode in decomposes:
+		target = "%s.%s" % ( plugs[0].split( ".", 1 )[0], kOutputAttributes[sourceAttribute] )
+		conversion = converted.get( ( sourceAttribute, destination ) )
+		if conversion is not None:
+			return [ connect( target, "%s.i" % conversion ), connect( "%s.o" % conversion, plugs[1] ) ]
+		return [ connect( target, plugs[1] ) ]
+	return None
+
+# the decomposeMatrix of the chain a removed node belongs to
+def chainOf(decomposes, node):
+	for decompose, chain in decomposes.items():
+		if node in chain.removed():
+			return decompose
+	return None
+
+# collapse the chains of a .ma file into output, or only report them with dryRun,
+# returns the chains
+def optimizeFile(path, output=None, dryRun=False):
+
+	graph = rtAsciiGraph()
+	graph.read( path )
+	chains = findChains( graph )
+	if not dryRun:
+		if output is None:
+			raise ValueError( "an output file is needed" )
+		# write next to the output first so the input can be rewritten in place
+		temporary = output + ".tmp"
+		try:
+			rewriteFile( graph, chains, path, temporary )
+			os.replace( temporary, output )
+		finally:
+			if os.path.exists( temporary ):
+				os.remove( temporary )
+	return chains
+
+
+# -----------------------------------------------------------------------------------
+# the open Maya scene
+# -----------------------------------------------------------------------------------
+
+class rtLiveGraph(object):
+
+	def __init__(self):
+		import maya.cmds
+		self.cmds = maya.cmds
+
+	def nodesOfType(self, typeName):
+		return self.cmds.ls( type=typeName ) or []
+
+	def typeOf(self, node):
+		if not self.cmds.objExists( node ):
+			return None
+		return self.cmds.nodeType( node )
+
+	def source(self, node, attributes):
+		for attribute in attributes:
+			if not self.cmds.objExists( "%s.%s" % ( node, attribute ) ):
+				continue
+			plugs = self.cmds.listConnections( "%s.%s" % ( node, attribute ), source=True, destination=False, plugs=True,
+								skipConversionNodes=False )
+			if plugs:
+				return plugs[0]
+		return None
+
+	def outputs(self, node):
+		pairs = self.cmds.listConnections( node, source=False, destination=True, connections=True, plugs=True,
+							skipConversionNodes=False ) or []
+		return [ ( plugAttribute( pairs[index] ), pairs[index + 1] ) for index in range( 0, len( pairs ), 2 ) ]
+
+	def multiIndices(self, node, attributes):
+		return sorted( self.cmds.getAttr( "%s.%s" % ( node, attributes[-1] ), multiIndices=True ) or [] )
+
+	def isEditable(self, node):
+		if self.cmds.referenceQuery( node, isNodeReferenced=True ):
+			return False
+		return not self.cmds.lockNode( node, query=True, lock=True )[0]
+
+	# replace a chain by a rt4x4MatrixToTRS node with the name of its decomposeMatrix
+	def collapse(self, chain):
+
+		cmds = self.cmds
+		name = chain.decompose
+		node = cmds.createNode( kNodeTypeName, name=name + "_optimized" )
+
+		cmds.connectAttr( chain.fourByFour + ".output", node + ".inputMatrix" )
+
+		plug = self.source( chain.multMatrix, ( "matrixIn[1]", ) )
+		if plug is not None:
+			cmds.connectAttr( plug, node + ".parentInverseMatrix" )
+		else:
+			cmds.setAttr( node + ".parentInverseMatrix", *cmds.getAttr( chain.multMatrix + ".matrixIn[1]" ), type="matrix" )
+
+		if cmds.attributeQuery( "inputRotateOrder", node=name, exists=True ):
+			plug = self.source( name, ( "inputRotateOrder", ) )
+			if plug is not None:
+				cmds.connectAttr( plug, node + ".eulerRotateOrder" )
+			else:
+				cmds.setAttr( node + ".eulerRotateOrder", cmds.getAttr( name + ".inputRotateOrder" ) )
+
+		# maya puts a unitConversion between outputRotate and angle attributes by itself,
+		# the ones already there get a factor for degrees
+		for attribute, destination in self.outputs( name ):
+			target = "%s.%s" % ( node, kOutputAttributes[attribute] )
+			if attribute in kRotateAttributes:
+				conversion = plugNode( destination )
+				if cmds.nodeType( conversion ) == "unitConversion":
+					factor = cmds.getAttr( conversion + ".conversionFactor" )
+					cmds.setAttr( conversion + ".conversionFactor", factor * kDegreesToRadians )
+				else:
+					chain.conversions += 1
+			cmds.disconnectAttr( "%s.%s" % ( name, attribute ), destination )
+			cmds.connectAttr( target, destination, force=True )
+
+		cmds.delete( [ name ] + chain.removed() )
+		cmds.rename( node, name )
+
+# collapse the chains of the open scene, decomposes limits it to some decomposeMatrix
+# nodes, dryRun only reports them, prints and returns the report
+def optimizeScene(decomposes=None, dryRun=False):
+
+	graph = rtLiveGraph()
+	cmds = graph.cmds
+	if not dryRun and kNodeTypeName not in ( cmds.allNodeTypes() or [] ):
+		raise RuntimeError( "load %s before optimizing the scene" % kPluginName )
+
+	chains = findChains( graph, decomposes )
+	if not dryRun:
+		cmds.undoInfo( openChunk=True, chunkName="rt4x4MatrixToTRS_optimize" )
+		try:
+			for chain in chains:
+				if chain.skipped is None:
+					graph.collapse( chain )
+		finally:
+			cmds.undoInfo( closeChunk=True )
+
+	text = report( chains, dryRun )
+	sys.stdout.write( text + "\n" )
+	return text
+
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Replace the fourByFourMatrix + decomposeMatrix networks of a Maya ASCII scene by rt4x4MatrixToTRS nodes." )
+	parser.add_argument( "scene", help="the .ma file" )
+	parser.add_argument( "-o", "--output", help="the optimized .ma file, it can be the scene itself" )
+	parser.add_argument( "--dry-run", action="store_true", help="only report the chains" )
+	args = parser.parse_args( argv )
+
+	if args.output is None and not args.dry_run:
+		parser.error( "an output file is needed, use -o or --dry-run" )
+	try:
+		chains = optimizeFile( args.scene, args.output, args.dry_run )
+	except ( IOError, ValueError ) as error:
+		parser.error( str( error ) )
+	sys.stdout.write( report( chains, args.dry_run ) + "\n" )
+	return 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,129 @@
+# -----------------------------------------------------------------------------------
+# rt4x4MatrixToTRS_stress
+#
+# Checks that rt4x4MatrixToTRS nodes give the same results when many of them are
+# computed at once, the way the parallel evaluation manager runs kParallel nodes.
+#
+# A few hundred nodes are created on the stand-in OpenMaya in mayaStandIn, each
+# is computed once on its own for the reference values, then every node is
+# dirtied and computed again from a thread pool for a number of rounds. Any value
+# that differs from the reference or any exception is reported. Like the
+# evaluation manager a node is only computed by one thread at a time, different
+# nodes run on different threads and the shared cache is used by all of them.
+#
+# usage: python rt4x4MatrixToTRS_stress.py [--nodes 300] [--rounds 20] [--threads 8]
+# -----------------------------------------------------------------------------------
+
+import os
+import sys
+import random
+import argparse
+import concurrent.futures
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "mayaStandIn" ) )
+import standInScene
+
+import rtMatrixCache
+import rt4x4MatrixToTRS
+import rt4x4MatrixToTRSApi2
+
+kOutputs = ( "outputTranslate", "outputRotate", "outputScale" )
+
+kCacheModes = ( ( "cache off", rtMatrixCache.kCacheOff ),
+		( "node cache", rtMatrixCache.kCacheNode ),
+		( "shared cache", rtMatrixCache.kCacheShared ) )
+
+
+# nodes with random inputs, every other one reads inputMatrix, the seeds repeat
+# so nodes share entries in the shared cache
+def buildNodes(module, count, cacheMode):
+
+	standInScene.loadPlugin( module )
+	try:
+		nodes = [ standInScene.createNode( module.kMatrixUtilNodeTypeName, "stress%d" % i ) for i in range( count ) ]
+	finally:
+		standInScene.unloadPlugin( module )
+
+	for i, node in enumerate( nodes ):
+		generator = random.Random( i % 24 )
+		values = [ generator.uniform( -2.0, 2.0 ) for j in range(16) ]
+		api = standInScene.apiModule( node )
+		if i % 2:
+			standInScene.setAttr( node, "inputMatrix", api.MMatrix( [ values[0:4], values[4:8], values[8:12], values[12:16] ] ) )
+			standInScene.connectAttr( node, "inputMatrix" )
+		else:
+			for index, value in enumerate( values ):
+				standInScene.setAttr( node, "in%d%d" % ( index // 4, index % 4 ), value )
+		standInScene.setAttr( node, "eulerRotateOrder", generator.randint( 0, 5 ) )
+		standInScene.setAttr( node, "normalize", bool( generator.randint( 0, 1 ) ) )
+		standInScene.setAttr( node, "offsetTranslate", ( generator.uniform( -1.0, 1.0 ), 0.0, 0.0 ) )
+		standInScene.setAttr( node, "cacheMode", cacheMode )
+		standInScene.setAttr( node, "cacheSize", 4 )
+		for output in kOutputs:
+			standInScene.connectAttr( node, output )
+	return nodes
+
+# dirty a node and pull its outputs in a random order, returns the output values
+def evaluate(node, seed):
+
+	standInScene.dirty( node )
+	order = list( kOutputs )
+	random.Random( seed ).shuffle( order )
+	dataBlock = node._standInBlock
+	for output in order:
+		if not dataBlock.isClean( standInScene.attributeObject( node, output ) ):
+			standInScene.computePlug( node, output )
+	return tuple( [ standInScene.getAttr( node, output ) for output in kOutputs ] )
+
+# compute every node from a thread pool for a number of rounds, returns
+# ( evaluations, mismatches, errors )
+def stress(nodes, rounds, threads):
+
+	reference = [ evaluate( node, 0 ) for node in nodes ]
+
+	evaluations = 0
+	mismatches = 0
+	errors = []
+	with concurrent.futures.ThreadPoolExecutor( max_workers=threads ) as pool:
+		for r in range( rounds ):
+			futures = dict( [ ( pool.submit( evaluate, node, r * len( nodes ) + i ), i ) for i, node in enumerate( nodes ) ] )
+			for future in concurrent.futures.as_completed( futures ):
+				evaluations += 1
+				try:
+					result = future.result()
+				except Exception as error:
+					errors.append( "%s: %r" % ( nodes[ futures[future] ].name(), error ) )
+					continue
+				if result != reference[ futures[future] ]:
+					mismatches += 1
+	return evaluations, mismatches, errors
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Compute many rt4x4MatrixToTRS nodes at once on the stand-in OpenMaya and check the results." )
+	parser.add_argument( "--nodes", type=int, default=300, help="nodes per run" )
+	parser.add_argument( "--rounds", type=int, default=20, help="times every node is computed from the pool" )
+	parser.add_argument( "--threads", type=int, default=8, help="thread pool size" )
+	args = parser.parse_args( argv )
+
+	# switch threads as often as possible so the nodes interleave
+	sys.setswitchinterval( 1.0e-6 )
+
+	failed = False
+	sys.stdout.write( "%-10s %-14s %12s %12s %8s\n" % ( "api", "cacheMode", "evaluations", "mismatches", "errors" ) )
+	for label, module in ( ( "API 1.0", rt4x4MatrixToTRS ), ( "API 2.0", rt4x4MatrixToTRSApi2 ) ):
+		for cacheLabel, cacheMode in kCacheModes:
+			rtMatrixCache.sharedCache.clear()
+			rtMatrixCache.sharedCache.resize( 16 )
+			nodes = buildNodes( module, args.nodes, cacheMode )
+			evaluations, mismatches, errors = stress( nodes, args.rounds, args.threads )
+			sys.stdout.write( "%-10s %-14s %12d %12d %8d\n" % ( label, cacheLabel, evaluations, mismatches, len( errors ) ) )
+			for error in errors[:5]:
+				sys.stdout.write( "    %s\n" % error )
+			failed = failed or mismatches or errors
+
+	rtMatrixCache.sharedCache.resize( rtMatrixCache.kDefaultSharedCacheSize )
+	return 1 if failed else 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,90 @@
+# -----------------------------------------------------------------------------------
+# rtMatrixCache
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# A bounded least recently used cache for the rt4x4MatrixToTRS decomposition.
+#
+# When the timeline is scrubbed or upstream nodes are dirtied without changing
+# their values compute() is asked for the same inputs again. The node looks the
+# inputs up here first and only decomposes the matrix on a miss.
+#
+# Each node can own a cache ( cacheMode Node ) or all nodes can share the one
+# below ( cacheMode Shared ). Hits and misses are counted on every cache.
+#
+#   import rtMatrixCache
+#   rtMatrixCache.sharedCache.resize( 10000 )
+#   print( rtMatrixCache.sharedCache.stats() )
+# -----------------------------------------------------------------------------------
+
+import threading
+import collections
+
+# values of the cacheMode enum attribute
+kCacheOff = 0
+kCacheNode = 1
+kCacheShared = 2
+
+kDefaultNodeCacheSize = 256
+kDefaultSharedCacheSize = 4096
+
+
+class rtMatrixCache(object):
+
+	def __init__(self, maxSize=kDefaultNodeCacheSize):
+		self.maxSize = max( 1, int(maxSize) )
+		self.hits = 0
+		self.misses = 0
+		self._entries = collections.OrderedDict()
+		self._lock = threading.Lock()
+
+	def __len__(self):
+		return len( self._entries )
+
+	# the cached value for a key or None, a hit makes the key the most recently used
+	def get(self, key):
+		with self._lock:
+			value = self._entries.get( key )
+			if value is None:
+				self.misses += 1
+				return None
+			# popped and added again to be the most recently used, OrderedDict
+			# has no move_to_end() in the Python 2 of older Maya versions
+			del self._entries[key]
+			self._entries[key] = value
+			self.hits += 1
+			return value
+
+	# add a value, the least recently used keys are dropped past maxSize
+	def put(self, key, value):
+		with self._lock:
+			self._entries.pop( key, None )
+			self._entries[key] = value
+			self._trim()
+
+	def resize(self, maxSize):
+		with self._lock:
+			self.maxSize = max( 1, int(maxSize) )
+			self._trim()
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+
+	def resetCounters(self):
+		with self._lock:
+			self.hits = 0
+			self.misses = 0
+
+	def stats(self):
+		with self._lock:
+			return { "hits": self.hits, "misses": self.misses, "size": len( self._entries ), "maxSize": self.maxSize }
+
+	# drop the least recently used keys past maxSize, the lock is held by the caller
+	def _trim(self):
+		while len( self._entries ) > self.maxSize:
+			self._entries.popitem( last=False )
+
+
+# the cache used by every node with cacheMode set to Shared
+sharedCache = rtMatrixCache( kDefaultSharedCacheSize )
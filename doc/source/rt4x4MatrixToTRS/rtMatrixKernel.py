@@ -0,0 +1,732 @@
+# -----------------------------------------------------------------------------------
+# rtMatrixKernel
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# The math behind the rt4x4MatrixToTRS node with no dependency on Maya, so it can be
+# profiled, batched and run on machines without a Maya license.
+#
+# A matrix goes through the same steps as in the node:
+#   normalize the rotation rows (optional), multiply by the parentInverseMatrix,
+#   decompose into translate, rotate and scale, reorder the euler rotation and add
+#   the TRS offsets.
+#
+# The decomposition follows MTransformationMatrix: the rows of the upper 3x3 are
+# orthogonalized X first, then Y, then Z so that matrix = scale * shear * rotate
+# (row vectors, the Maya convention). A negative determinant is moved into the scale.
+# Rotations are returned in degrees like the outputRotate attribute of the node.
+#
+# The polar decomposition mode takes the rotation from the polar decomposition
+# matrix = stretch * rotate, the rotation closest to the matrix. With sheared input it
+# does not lean towards the X axis like the orthogonalized rows do. It is closed form,
+# the stretch is the square root of matrix * transpose(matrix) built from its
+# invariants, there is no iteration. The stretch is symmetric, its diagonal is the
+# scale and its lower values divided by the scale of their row are the shear, so
+# scale and shear rebuild the stretch and not the scale * shear of the other mode.
+#
+# matrixToTRS() works on a single matrix in plain Python, decompose() does the same
+# math with numpy on one matrix or on a contiguous (N,4,4) array of matrices. The
+# rt4x4MatrixToTRS node keeps MTransformationMatrix for its transformationMatrix mode
+# and only calls this for the polar mode. Neither the negative determinant rule nor
+# the euler angles per rotate order have been checked against Maya itself yet, only
+# against the stand-in OpenMaya which follows the same steps, see
+# rt4x4MatrixToTRS_golden.py.
+#
+# filterEulerArray() keeps the euler angles of consecutive frames continuous, the
+# angles of each frame are unwrapped against the frame before like an euler filter.
+#
+# hierarchyMatrices() turns the local matrices of a joint chain or any other tree into
+# world matrices in a few batched products, ready for decompose().
+#
+# trsToMatrix() and compose() go the other way for the rt4x4TRSToMatrix nodes,
+# matrix = scale * shear * rotate with the translation in the last row, then times
+# the parentMatrix, or stretch * rotate for the polar decomposition mode. Decomposing
+# the result in the same mode gives back the same translate, rotate, scale and shear.
+# -----------------------------------------------------------------------------------
+
+import math
+
+# numpy is imported the first time a vectorized function runs, so loading the plugin,
+# whose node decomposes one matrix at a time in plain Python, never pays for it
+numpy = None
+
+# rotate orders, the same values as MEulerRotation.RotationOrder and the
+# eulerRotateOrder enum on the node
+kXYZ = 0
+kYZX = 1
+kZXY = 2
+kXZY = 3
+kYXZ = 4
+kZYX = 5
+
+# the axis rotated first, second and third for each rotate order and if
+# that axis order is an even permutation of xyz
+kRotateOrderAxes = ( (0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0) )
+kRotateOrderEven = ( True, True, True, False, False, False )
+
+# below this cos of the middle angle the rotation is treated as gimbal locked
+kGimbalTolerance = 1.0e-10
+
+# values of the decompositionMode enum attribute
+kDecomposeTransformationMatrix = 0
+kDecomposePolar = 1
+
+# a matrix with a volume below this fraction of the cube of its size has no
+# polar rotation, the orthogonalized rows are used instead
+kPolarTolerance = 1.0e-12
+
+kIdentity = ( (1.0, 0.0, 0.0, 0.0),
+		(0.0, 1.0, 0.0, 0.0),
+		(0.0, 0.0, 1.0, 0.0),
+		(0.0, 0.0, 0.0, 1.0) )
+
+
+# -----------------------------------------------------------------------------------
+# single matrix functions, plain Python
+# -----------------------------------------------------------------------------------
+
+# create a 4x4 matrix ( tuple of rows ) from the 16 matrixIn values
+# the user option normalize forces the rotation vectors to be of unit length
+def buildMatrix(values, normalize=False):
+
+	rows = [ list(values[0:4]), list(values[4:8]), list(values[8:12]), list(values[12:16]) ]
+
+	if normalize:
+		for row in rows[:3]:
+			length = math.sqrt( row[0] * row[0] + row[1] * row[1] + row[2] * row[2] )
+			# like MVector.normalize() a zero length vector is left alone
+			if length > 0.0:
+				row[0] = row[0] / length
+				row[1] = row[1] / length
+				row[2] = row[2] / length
+
+	return rows
+
+# multiply two 4x4 matrices, a * b
+def multMatrix(a, b):
+
+	result = []
+	for i in range(4):
+		ai0, ai1, ai2, ai3 = a[i]
+		result.append( [ ai0 * b[0][j] + ai1 * b[1][j] + ai2 * b[2][j] + ai3 * b[3][j] for j in range(4) ] )
+	return result
+
+# multiply a row vector of 4 values by a 4x4 matrix, row * matrix
+def multRow(row, matrix):
+
+	r0, r1, r2, r3 = row
+	return [ r0 * matrix[0][j] + r1 * matrix[1][j] + r2 * matrix[2][j] + r3 * matrix[3][j] for j in range(4) ]
+
+# the translation of a matrix
+def getTranslation(matrix):
+
+	return ( matrix[3][0], matrix[3][1], matrix[3][2] )
+
+# split the upper 3x3 of a matrix into scale, shear and an orthonormal rotation
+# returns ( scale, shear, rotation rows ) where shear is ( xy, xz, yz )
+def getScaleShearRotation(matrix):
+
+	x0, x1, x2 = matrix[0][0], matrix[0][1], matrix[0][2]
+	y0, y1, y2 = matrix[1][0], matrix[1][1], matrix[1][2]
+	z0, z1, z2 = matrix[2][0], matrix[2][1], matrix[2][2]
+
+	# X axis
+	sx = math.sqrt( x0 * x0 + x1 * x1 + x2 * x2 )
+	if sx > 0.0:
+		x0, x1, x2 = x0 / sx, x1 / sx, x2 / sx
+
+	# Y axis, made orthogonal to X
+	xy = x0 * y0 + x1 * y1 + x2 * y2
+	y0, y1, y2 = y0 - xy * x0, y1 - xy * x1, y2 - xy * x2
+	sy = math.sqrt( y0 * y0 + y1 * y1 + y2 * y2 )
+	if sy > 0.0:
+		y0, y1, y2 = y0 / sy, y1 / sy, y2 / sy
+		xy = xy / sy
+
+	# Z axis, made orthogonal to X and Y
+	xz = x0 * z0 + x1 * z1 + x2 * z2
+	yz = y0 * z0 + y1 * z1 + y2 * z2
+	z0, z1, z2 = z0 - xz * x0 - yz * y0, z1 - xz * x1 - yz * y1, z2 - xz * x2 - yz * y2
+	sz = math.sqrt( z0 * z0 + z1 * z1 + z2 * z2 )
+	if sz > 0.0:
+		z0, z1, z2 = z0 / sz, z1 / sz, z2 / sz
+		xz = xz / sz
+		yz = yz / sz
+
+	# a negative determinant is a mirror, move it into the scale
+	det = x0 * ( y1 * z2 - y2 * z1 ) - x1 * ( y0 * z2 - y2 * z0 ) + x2 * ( y0 * z1 - y1 * z0 )
+	if det < 0.0:
+		sx, sy, sz = -sx, -sy, -sz
+		x0, x1, x2 = -x0, -x1, -x2
+		y0, y1, y2 = -y0, -y1, -y2
+		z0, z1, z2 = -z0, -z1, -z2
+
+	return ( sx, sy, sz ), ( xy, xz, yz ), ( ( x0, x1, x2 ), ( y0, y1, y2 ), ( z0, z1, z2 ) )
+
+# the eigenvalues of a symmetric 3x3 matrix given by its six values, largest first
+def _symmetricEigenvalues(c00, c11, c22, c01, c02, c12):
+
+	q = ( c00 + c11 + c22 ) / 3.0
+	offDiagonal = c01 * c01 + c02 * c02 + c12 * c12
+	p = math.sqrt( ( ( c00 - q ) ** 2 + ( c11 - q ) ** 2 + ( c22 - q ) ** 2 + 2.0 * offDiagonal ) / 6.0 )
+	if p == 0.0:
+		return q, q, q
+
+	b00, b11, b22 = ( c00 - q ) / p, ( c11 - q ) / p, ( c22 - q ) / p
+	b01, b02, b12 = c01 / p, c02 / p, c12 / p
+	r = ( b00 * ( b11 * b22 - b12 * b12 ) - b01 * ( b01 * b22 - b12 * b02 ) + b02 * ( b01 * b12 - b11 * b02 ) ) / 2.0
+	phi = math.acos( min( 1.0, max( -1.0, r ) ) ) / 3.0
+
+	e0 = q + 2.0 * p * math.cos( phi )
+	e2 = q + 2.0 * p * math.cos( phi + 2.0 * math.pi / 3.0 )
+	return e0, 3.0 * q - e0 - e2, e2
+
+# ( R + transpose(inverse(R)) ) / 2 for a nearly orthogonal 3x3 matrix, the
+# transposed inverse is the cofactor matrix over the determinant
+def _polishRotation(r):
+
+	cofactors = [ [ r[(i + 1) % 3][(j + 1) % 3] * r[(i + 2) % 3][(j + 2) % 3] - r[(i + 1) % 3][(j + 2) % 3] * r[(i + 2) % 3][(j + 1) % 3]
+			for j in range(3) ] for i in range(3) ]
+	det = r[0][0] * cofactors[0][0] + r[0][1] * cofactors[0][1] + r[0][2] * cofactors[0][2]
+	return [ [ 0.5 * ( r[i][j] + cofactors[i][j] / det ) for j in range(3) ] for i in range(3) ]
+
+# like getScaleShearRotation() but the rotation is the polar rotation of the matrix
+# and the scale and shear describe the stretch, see composeMatrix()
+# returns ( scale, shear, rotation rows ) where shear is ( xy, xz, yz )
+def getPolarScaleShearRotation(matrix):
+
+	a = [ matrix[0][:3], matrix[1][:3], matrix[2][:3] ]
+
+	# C = A * transpose(A), the dot products of the rows
+	c00 = a[0][0] * a[0][0] + a[0][1] * a[0][1] + a[0][2] * a[0][2]
+	c11 = a[1][0] * a[1][0] + a[1][1] * a[1][1] + a[1][2] * a[1][2]
+	c22 = a[2][0] * a[2][0] + a[2][1] * a[2][1] + a[2][2] * a[2][2]
+	c01 = a[0][0] * a[1][0] + a[0][1] * a[1][1] + a[0][2] * a[1][2]
+	c02 = a[0][0] * a[2][0] + a[0][1] * a[2][1] + a[0][2] * a[2][2]
+	c12 = a[1][0] * a[2][0] + a[1][1] * a[2][1] + a[1][2] * a[2][2]
+
+	det = a[0][0] * ( a[1][1] * a[2][2] - a[1][2] * a[2][1] ) - a[0][1] * ( a[1][0] * a[2][2] - a[1][2] * a[2][0] ) \
+		+ a[0][2] * ( a[1][0] * a[2][1] - a[1][1] * a[2][0] )
+
+	# invariants of the stretch U = sqrt(C) from the eigenvalues of C
+	l0, l1, l2 = [ math.sqrt( max( 0.0, value ) ) for value in _symmetricEigenvalues( c00, c11, c22, c01, c02, c12 ) ]
+	i1 = l0 + l1 + l2
+	i2 = l0 * l1 + l1 * l2 + l0 * l2
+	i3 = abs( det )
+	if i3 <= kPolarTolerance * i1 * i1 * i1:
+		return getScaleShearRotation( matrix )
+
+	# U = ( -C^2 + ( i1^2 - i2 ) C + i1 i3 I ) / ( i1 i2 - i3 )
+	# inverse(U) = ( C - i1 U + i2 I ) / i3
+	c = ( ( c00, c01, c02 ), ( c01, c11, c12 ), ( c02, c12, c22 ) )
+	k = i1 * i1 - i2
+	d = i1 * i2 - i3
+	inverse = []
+	for i in range(3):
+		row = []
+		for j in range(3):
+			cc = c[i][0] * c[0][j] + c[i][1] * c[1][j] + c[i][2] * c[2][j]
+			identity = 1.0 if i == j else 0.0
+			u = ( -cc + k * c[i][j] + i1 * i3 * identity ) / d
+			row.append( ( c[i][j] - i1 * u + i2 * identity ) / i3 )
+		inverse.append( row )
+
+	# rotation = inverse(U) * A
+	rotation = [ [ inverse[i][0] * a[0][j] + inverse[i][1] * a[1][j] + inverse[i][2] * a[2][j] for j in range(3) ] for i in range(3) ]
+
+	# the invariant formula loses digits on badly scaled matrices, one fixed
+	# Newton step ( R + transpose(inverse(R)) ) / 2 takes them back
+	rotation = _polishRotation( rotation )
+
+	# the stretch U = A * transpose(rotation), made symmetric again after the
+	# Newton step, its diagonal is the scale and the rest the shear
+	u = [ [ a[i][0] * rotation[j][0] + a[i][1] * rotation[j][1] + a[i][2] * rotation[j][2] for j in range(3) ] for i in range(3) ]
+	sx, sy, sz = u[0][0], u[1][1], u[2][2]
+	shear = ( 0.5 * ( u[1][0] + u[0][1] ) / sy, 0.5 * ( u[2][0] + u[0][2] ) / sz, 0.5 * ( u[2][1] + u[1][2] ) / sz )
+
+	# a negative determinant is a mirror, move it into the scale
+	if det < 0.0:
+		sx, sy, sz = -sx, -sy, -sz
+		rotation = [ [ -value for value in row ] for row in rotation ]
+
+	return ( sx, sy, sz ), shear, tuple( [ tuple( row ) for row in rotation ] )
+
+# the scale, shear and rotation rows of a matrix for a decompositionMode
+def splitMatrix(matrix, decompositionMode=kDecomposeTransformationMatrix):
+
+	if decompositionMode == kDecomposePolar:
+		return getPolarScaleShearRotation( matrix )
+	return getScaleShearRotation( matrix )
+
+# euler angles in radians ( x, y, z ) of an orthonormal rotation for the rotate order
+def getEulerRotation(rotation, rotateOrder=kXYZ):
+
+	i, j, k = kRotateOrderAxes[rotateOrder]
+	if kRotateOrderEven[rotateOrder]:
+		sign = 1.0
+	else:
+		sign = -1.0
+
+	cosMiddle = math.sqrt( rotation[i][i] * rotation[i][i] + rotation[i][j] * rotation[i][j] )
+	middle = math.atan2( -sign * rotation[i][k], cosMiddle )
+	if cosMiddle > kGimbalTolerance:
+		first = math.atan2( sign * rotation[j][k], rotation[k][k] )
+		last = math.atan2( sign * rotation[i][j], rotation[i][i] )
+	else:
+		# gimbal lock, put all of the rotation on the first axis
+		first = math.atan2( -sign * rotation[k][j], rotation[j][j] )
+		last = 0.0
+
+	angles = [ 0.0, 0.0, 0.0 ]
+	angles[i] = first
+	angles[j] = middle
+	angles[k] = last
+	return angles
+
+# the rotation rows for euler angles in radians ( x, y, z ) and a rotate order,
+# the inverse of getEulerRotation()
+def getRotationMatrix(angles, rotateOrder=kXYZ):
+
+	rotation = [ [ 1.0, 0.0, 0.0 ], [ 0.0, 1.0, 0.0 ], [ 0.0, 0.0, 1.0 ] ]
+	for axis in kRotateOrderAxes[rotateOrder]:
+		c = math.cos( angles[axis] )
+		s = math.sin( angles[axis] )
+		a, b = ( axis + 1 ) % 3, ( axis + 2 ) % 3
+		# rotation = rotation * axisRotation, only the columns a and b change
+		for row in rotation:
+			row[a], row[b] = row[a] * c - row[b] * s, row[a] * s + row[b] * c
+	return rotation
+
+# the ( x, y, z, w ) quaternion of orthonormal rotation rows, like MTransformationMatrix.rotation()
+def getQuaternion(rotation):
+
+	m = rotation
+	trace = m[0][0] + m[1][1] + m[2][2]
+	if trace > 0.0:
+		s = 0.5 / math.sqrt( trace + 1.0 )
+		return ( ( m[1][2] - m[2][1] ) * s, ( m[2][0] - m[0][2] ) * s, ( m[0][1] - m[1][0] ) * s, 0.25 / s )
+
+	# build from the largest diagonal value so the square root stays away from zero
+	if m[0][0] > m[1][1] and m[0][0] > m[2][2]:
+		s = 2.0 * math.sqrt( 1.0 + m[0][0] - m[1][1] - m[2][2] )
+		return ( 0.25 * s, ( m[1][0] + m[0][1] ) / s, ( m[2][0] + m[0][2] ) / s, ( m[1][2] - m[2][1] ) / s )
+	if m[1][1] > m[2][2]:
+		s = 2.0 * math.sqrt( 1.0 + m[1][1] - m[0][0] - m[2][2] )
+		return ( ( m[1][0] + m[0][1] ) / s, 0.25 * s, ( m[2][1] + m[1][2] ) / s, ( m[2][0] - m[0][2] ) / s )
+	s = 2.0 * math.sqrt( 1.0 + m[2][2] - m[0][0] - m[1][1] )
+	return ( ( m[2][0] + m[0][2] ) / s, ( m[2][1] + m[1][2] ) / s, 0.25 * s, ( m[0][1] - m[1][0] ) / s )
+
+# the 3x3 that multiplies the rotation rows for a scale, shear ( xy, xz, yz ) and
+# decompositionMode, scale * shear is lower triangular and the polar stretch is the
+# same values mirrored to be symmetric
+def _scaleShearRows(scale, shear, decompositionMode=kDecomposeTransformationMatrix):
+
+	xy, xz, yz = shear
+	sx, sy, sz = scale
+	if decompositionMode == kDecomposePolar:
+		return ( ( sx, sy * xy, sz * xz ), ( sy * xy, sy, sz * yz ), ( sz * xz, sz * yz, sz ) )
+	return ( ( sx, 0.0, 0.0 ), ( sy * xy, sy, 0.0 ), ( sz * xz, sz * yz, sz ) )
+
+# a 4x4 matrix from a translation, rotation rows, scale and shear ( xy, xz, yz ),
+# the inverse of splitMatrix() for the same decompositionMode
+def composeMatrix(translate, rotation, scale, shear=(0.0, 0.0, 0.0), decompositionMode=kDecomposeTransformationMatrix):
+
+	stretch = _scaleShearRows( scale, shear, decompositionMode )
+	rows = [ [ stretch[r][0] * rotation[0][i] + stretch[r][1] * rotation[1][i] + stretch[r][2] * rotation[2][i] for i in range(3) ]
+		for r in range(3) ]
+	return [ rows[0] + [ 0.0 ], rows[1] + [ 0.0 ], rows[2] + [ 0.0 ],
+		[ translate[0], translate[1], translate[2], 1.0 ] ]
+
+# the full rt4x4TRSToMatrix pipeline for a single transform, the inverse of matrixToTRS()
+# rotate is in degrees, parentMatrix a 4x4 matrix or None
+# returns the 4x4 matrix as a list of rows
+def trsToMatrix(translate, rotate, scale, shear=(0.0, 0.0, 0.0), rotateOrder=kXYZ, parentMatrix=None,
+		offsetTranslate=(0.0, 0.0, 0.0), offsetRotate=(0.0, 0.0, 0.0), offsetScale=(0.0, 0.0, 0.0),
+		decompositionMode=kDecomposeTransformationMatrix):
+
+	trans = [ translate[i] + offsetTranslate[i] for i in range(3) ]
+	angles = [ math.radians( rotate[i] + offsetRotate[i] ) for i in range(3) ]
+	scale = [ scale[i] + offsetScale[i] for i in range(3) ]
+
+	matrix = composeMatrix( trans, getRotationMatrix( angles, rotateOrder ), scale, shear, decompositionMode )
+	if parentMatrix is not None:
+		matrix = multMatrix( matrix, parentMatrix )
+	return matrix
+
+# a matrix with the TRS offsets of the node applied on top of it, offsetScale added to
+# a unit scale and offsetRotate, in degrees for the rotate order, act in the local space
+# of the matrix like a child transform and offsetTranslate is added to its translation
+# like it is to outputTranslate. With zero offsets it is the same matrix
+# returns the 4x4 matrix as a list of rows
+def offsetMatrix(matrix, rotateOrder=kXYZ, offsetTranslate=(0.0, 0.0, 0.0), offsetRotate=(0.0, 0.0, 0.0),
+		offsetScale=(0.0, 0.0, 0.0)):
+
+	result = [ list( row ) for row in matrix ]
+	if offsetRotate[0] or offsetRotate[1] or offsetRotate[2] or offsetScale[0] or offsetScale[1] or offsetScale[2]:
+		angles = [ math.radians( offsetRotate[i] ) for i in range(3) ]
+		offset = composeMatrix( ( 0.0, 0.0, 0.0 ), getRotationMatrix( angles, rotateOrder ), [ 1.0 + offsetScale[i] for i in range(3) ] )
+		result = multMatrix( offset, result )
+	result[3] = [ matrix[3][0] + offsetTranslate[0], matrix[3][1] + offsetTranslate[1], matrix[3][2] + offsetTranslate[2], matrix[3][3] ]
+	return result
+
+# the full node pipeline for a single matrix
+# values is the 16 floats of matrixIn, parentInverse a 4x4 matrix or None
+# returns ( translate, rotate in degrees, scale ) with the offsets added
+def matrixToTRS(values, parentInverse=None, rotateOrder=kXYZ, normalize=False,
+		offsetTranslate=(0.0, 0.0, 0.0), offsetRotate=(0.0, 0.0, 0.0), offsetScale=(0.0, 0.0, 0.0),
+		decompositionMode=kDecomposeTransformationMatrix):
+
+	matrix = buildMatrix(values, normalize)
+	if parentInverse is not None:
+		matrix = multMatrix(matrix, parentInverse)
+
+	trans = getTranslation(matrix)
+	scale, shear, rotation = splitMatrix(matrix, decompositionMode)
+	rot = getEulerRotation(rotation, rotateOrder)
+
+	return ( ( trans[0] + offsetTranslate[0], trans[1] + offsetTranslate[1], trans[2] + offsetTranslate[2] ),
+		( math.degrees(rot[0]) + offsetRotate[0], math.degrees(rot[1]) + offsetRotate[1], math.degrees(rot[2]) + offsetRotate[2] ),
+		( scale[0] + offsetScale[0], scale[1] + offsetScale[1], scale[2] + offsetScale[2] ) )
+
+
+# -----------------------------------------------------------------------------------
+# vectorized functions, numpy
+# every function takes one matrix or a stack of matrices and returns arrays with
+# the same leading shape
+# -----------------------------------------------------------------------------------
+
+def _requireNumpy():
+	global numpy
+	if numpy is None:
+		try:
+			import numpy as module
+		except ImportError:
+			raise ImportError( "rtMatrixKernel: numpy is required for the vectorized functions" )
+		numpy = module
+
+# convert 16 values, a (4,4) matrix, a flat run of N*16 values or a (N,16) / (N,4,4)
+# array to a float64 (N,4,4) array
+def asMatrixArray(matrices):
+
+	_requireNumpy()
+	matrices = numpy.ascontiguousarray( matrices, dtype=numpy.float64 )
+	if matrices.ndim == 1 and matrices.size % 16 == 0:
+		matrices = matrices.reshape( (-1, 16) )
+	if matrices.shape[-2:] != (4, 4):
+		if matrices.shape[-1] != 16:
+			raise ValueError( "rtMatrixKernel: expected matrices of 16 values, got shape %s" % (matrices.shape,) )
+		matrices = matrices.reshape( matrices.shape[:-1] + (4, 4) )
+	return matrices.reshape( (-1, 4, 4) )
+
+# normalize the rotation rows of an (N,4,4) array in place, zero rows are left alone
+def normalizeRows(matrices):
+
+	_requireNumpy()
+	lengths = numpy.sqrt( numpy.einsum( '...ij,...ij->...i', matrices[:, :3, :3], matrices[:, :3, :3] ) )
+	lengths[lengths == 0.0] = 1.0
+	matrices[:, :3, :3] /= lengths[:, :, numpy.newaxis]
+	return matrices
+
+# vectorized getScaleShearRotation(), returns (N,3) scale, (N,3) shear and (N,3,3) rotation
+def scaleShearRotationArray(matrices):
+
+	_requireNumpy()
+	x = matrices[:, 0, :3].copy()
+	y = matrices[:, 1, :3].copy()
+	z = matrices[:, 2, :3].copy()
+
+	sx = numpy.sqrt( numpy.einsum( 'ij,ij->i', x, x ) )
+	x /= numpy.where( sx > 0.0, sx, 1.0 )[:, numpy.newaxis]
+
+	xy = numpy.einsum( 'ij,ij->i', x, y )
+	y -= xy[:, numpy.newaxis] * x
+	sy = numpy.sqrt( numpy.einsum( 'ij,ij->i', y, y ) )
+	divY = numpy.where( sy > 0.0, sy, 1.0 )
+	y /= divY[:, numpy.newaxis]
+	xy /= divY
+
+	xz = numpy.einsum( 'ij,ij->i', x, z )
+	yz = numpy.einsum( 'ij,ij->i', y, z )
+	z -= xz[:, numpy.newaxis] * x + yz[:, numpy.newaxis] * y
+	sz = numpy.sqrt( numpy.einsum( 'ij,ij->i', z, z ) )
+	divZ = numpy.where( sz > 0.0, sz, 1.0 )
+	z /= divZ[:, numpy.newaxis]
+	xz /= divZ
+	yz /= divZ
+
+	rotation = numpy.stack( (x, y, z), axis=1 )
+	scale = numpy.stack( (sx, sy, sz), axis=1 )
+
+	mirrored = numpy.linalg.det( rotation ) < 0.0
+	if mirrored.any():
+		scale[mirrored] *= -1.0
+		rotation[mirrored] *= -1.0
+
+	return scale, numpy.stack( (xy, xz, yz), axis=1 ), rotation
+
+# vectorized getPolarScaleShearRotation(), returns (N,3) scale, (N,3) shear and (N,3,3) rotation
+def polarScaleShearRotationArray(matrices):
+
+	_requireNumpy()
+	a = matrices[:, :3, :3]
+	c = numpy.einsum( 'nij,nkj->nik', a, a )
+	det = numpy.linalg.det( a )
+
+	# eigenvalues of C, the same closed form as _symmetricEigenvalues()
+	c00, c11, c22 = c[:, 0, 0], c[:, 1, 1], c[:, 2, 2]
+	c01, c02, c12 = c[:, 0, 1], c[:, 0, 2], c[:, 1, 2]
+	q = ( c00 + c11 + c22 ) / 3.0
+	p = numpy.sqrt( ( ( c00 - q ) ** 2 + ( c11 - q ) ** 2 + ( c22 - q ) ** 2 + 2.0 * ( c01 * c01 + c02 * c02 + c12 * c12 ) ) / 6.0 )
+	divP = numpy.where( p > 0.0, p, 1.0 )
+	b = ( c - q[:, numpy.newaxis, numpy.newaxis] * numpy.eye(3) ) / divP[:, numpy.newaxis, numpy.newaxis]
+	phi = numpy.arccos( numpy.clip( numpy.linalg.det( b ) / 2.0, -1.0, 1.0 ) ) / 3.0
+	e0 = numpy.where( p > 0.0, q + 2.0 * p * numpy.cos( phi ), q )
+	e2 = numpy.where( p > 0.0, q + 2.0 * p * numpy.cos( phi + 2.0 * math.pi / 3.0 ), q )
+	l = numpy.sqrt( numpy.maximum( numpy.stack( (e0, 3.0 * q - e0 - e2, e2), axis=1 ), 0.0 ) )
+
+	i1 = l.sum( axis=1 )
+	i2 = l[:, 0] * l[:, 1] + l[:, 1] * l[:, 2] + l[:, 0] * l[:, 2]
+	i3 = numpy.abs( det )
+	singular = i3 <= kPolarTolerance * i1 * i1 * i1
+
+	with numpy.errstate( divide='ignore', invalid='ignore' ):
+		# U and inverse(U) from the invariants, rotation = inverse(U) * A
+		identity = numpy.eye(3)
+		u = ( -numpy.matmul( c, c ) + ( i1 * i1 - i2 )[:, numpy.newaxis, numpy.newaxis] * c
+			+ ( i1 * i3 )[:, numpy.newaxis, numpy.newaxis] * identity ) / ( i1 * i2 - i3 )[:, numpy.newaxis, numpy.newaxis]
+		inverse = ( c - i1[:, numpy.newaxis, numpy.newaxis] * u + i2[:, numpy.newaxis, numpy.newaxis] * identity ) / i3[:, numpy.newaxis, numpy.newaxis]
+		rotation = numpy.matmul( inverse, a )
+
+		# one Newton step, the rows of the cofactor matrix are cross products of the rows
+		cofactors = numpy.stack( ( numpy.cross( rotation[:, 1], rotation[:, 2] ),
+					numpy.cross( rotation[:, 2], rotation[:, 0] ),
+					numpy.cross( rotation[:, 0], rotation[:, 1] ) ), axis=1 )
+		rotationDet = numpy.einsum( 'ij,ij->i', rotation[:, 0], cofactors[:, 0] )
+		rotation = 0.5 * ( rotation + cofactors / rotationDet[:, numpy.newaxis, numpy.newaxis] )
+
+		# scale and shear from the symmetric stretch A * transpose(rotation)
+		u = numpy.einsum( 'nij,nkj->nik', a, rotation )
+		u = 0.5 * ( u + numpy.swapaxes( u, 1, 2 ) )
+		scale = numpy.stack( (u[:, 0, 0], u[:, 1, 1], u[:, 2, 2]), axis=1 )
+		shear = numpy.stack( (u[:, 1, 0] / u[:, 1, 1], u[:, 2, 0] / u[:, 2, 2], u[:, 2, 1] / u[:, 2, 2]), axis=1 )
+
+	mirrored = det < 0.0
+	if mirrored.any():
+		scale[mirrored] *= -1.0
+		rotation[mirrored] *= -1.0
+
+	if singular.any():
+		scale[singular], shear[singular], rotation[singular] = scaleShearRotationArray( matrices[singular] )
+
+	return scale, shear, rotation
+
+# vectorized splitMatrix()
+def splitMatrixArray(matrices, decompositionMode=kDecomposeTransformationMatrix):
+
+	_requireNumpy()
+	if decompositionMode == kDecomposePolar:
+		return polarScaleShearRotationArray( matrices )
+	return scaleShearRotationArray( matrices )
+
+# vectorized getEulerRotation(), returns (N,3) angles in radians
+def eulerRotationArray(rotation, rotateOrder=kXYZ):
+
+	_requireNumpy()
+	i, j, k = kRotateOrderAxes[rotateOrder]
+	if kRotateOrderEven[rotateOrder]:
+		sign = 1.0
+	else:
+		sign = -1.0
+
+	cosMiddle = numpy.sqrt( rotation[:, i, i] * rotation[:, i, i] + rotation[:, i, j] * rotation[:, i, j] )
+	locked = cosMiddle <= kGimbalTolerance
+
+	angles = numpy.empty( (rotation.shape[0], 3) )
+	angles[:, j] = numpy.arctan2( -sign * rotation[:, i, k], cosMiddle )
+	angles[:, i] = numpy.where( locked,
+		numpy.arctan2( -sign * rotation[:, k, j], rotation[:, j, j] ),
+		numpy.arctan2( sign * rotation[:, j, k], rotation[:, k, k] ) )
+	angles[:, k] = numpy.where( locked, 0.0, numpy.arctan2( sign * rotation[:, i, j], rotation[:, i, i] ) )
+	return angles
+
+# vectorized getRotationMatrix(), (N,3) angles in radians to (N,3,3) rotations
+def rotationMatrixArray(angles, rotateOrder=kXYZ):
+
+	_requireNumpy()
+	angles = numpy.asarray( angles, dtype=numpy.float64 ).reshape( (-1, 3) )
+	rotation = numpy.tile( numpy.eye(3), ( angles.shape[0], 1, 1 ) )
+	for axis in kRotateOrderAxes[rotateOrder]:
+		c = numpy.cos( angles[:, axis] )[:, numpy.newaxis]
+		s = numpy.sin( angles[:, axis] )[:, numpy.newaxis]
+		a, b = ( axis + 1 ) % 3, ( axis + 2 ) % 3
+		columnA = rotation[:, :, a].copy()
+		rotation[:, :, a] = columnA * c - rotation[:, :, b] * s
+		rotation[:, :, b] = columnA * s + rotation[:, :, b] * c
+	return rotation
+
+# the full node pipeline for one matrix or an array of matrices
+# matrices can be anything asMatrixArray() takes
+# returns ( translate, rotate in degrees, scale ) as (N,3) float64 arrays
+def decompose(matrices, parentInverse=None, rotateOrder=kXYZ, normalize=False,
+		offsetTranslate=(0.0, 0.0, 0.0), offsetRotate=(0.0, 0.0, 0.0), offsetScale=(0.0, 0.0, 0.0),
+		decompositionMode=kDecomposeTransformationMatrix):
+
+	matrices = asMatrixArray(matrices)
+	if normalize:
+		matrices = normalizeRows( matrices.copy() )
+	if parentInverse is not None:
+		matrices = numpy.matmul( matrices, numpy.asarray( parentInverse, dtype=numpy.float64 ).reshape( (-1, 4, 4) ) )
+
+	trans = matrices[:, 3, :3] + numpy.asarray( offsetTranslate, dtype=numpy.float64 )
+	scale, shear, rotation = splitMatrixArray(matrices, decompositionMode)
+	rot = numpy.degrees( eulerRotationArray(rotation, rotateOrder) ) + numpy.asarray( offsetRotate, dtype=numpy.float64 )
+	scale += numpy.asarray( offsetScale, dtype=numpy.float64 )
+
+	return trans, rot, scale
+
+# the world matrices of a hierarchy, matrices are the local matrices of its transforms
+# and parents the index of the parent of each one, negative for a root, so that
+# world = local * world of the parent. It is a prefix product over the tree done by
+# pointer jumping, every round multiplies each pending world matrix by the one of the
+# ancestor it has reached and doubles the distance to it, a chain of N joints takes
+# log2(N) batched products instead of N. Raises ValueError for a parent out of range
+# or a cycle
+# returns an (N,4,4) float64 array
+def hierarchyMatrices(matrices, parents):
+
+	world = asMatrixArray(matrices).copy()
+	count = world.shape[0]
+	ancestor = numpy.asarray( parents, dtype=numpy.int64 ).reshape( -1 )
+	if ancestor.shape[0] != count:
+		raise ValueError( "rtMatrixKernel: %d parent indices for %d matrices" % ( ancestor.shape[0], count ) )
+	if numpy.any( ancestor >= count ):
+		raise ValueError( "rtMatrixKernel: parent index %d is out of range" % ancestor.max() )
+	ancestor = numpy.where( ancestor < 0, -1, ancestor )
+
+	for jump in range( count.bit_length() + 1 ):
+		pending = numpy.nonzero( ancestor >= 0 )[0]
+		if not pending.size:
+			return world
+		reached = ancestor[pending]
+		world[pending] = numpy.matmul( world[pending], world[reached] )
+		ancestor[pending] = ancestor[reached]
+	raise ValueError( "rtMatrixKernel: the hierarchy has a cycle" )
+
+# -----------------------------------------------------------------------------------
+# euler continuity
+# decompose() gives every frame the euler angles closest to zero, which flip by a
+# whole turn at +-180 and between the two solutions of a rotation near gimbal lock.
+# These give each frame the solution closest to the frame before, so baked curves
+# come out continuous without an euler filter pass over every curve afterwards.
+# The nodes have no such option, a node keeps nothing from one evaluation to the
+# next, so its outputs only depend on its inputs and the frame.
+# -----------------------------------------------------------------------------------
+
+# the other euler angles in degrees of the same rotations, the first and last axis of
+# the rotate order turn by half a turn and the middle one is mirrored
+# returns an (N,3) array
+def alternateEulerArray(rotate, rotateOrder=kXYZ):
+
+	_requireNumpy()
+	i, j, k = kRotateOrderAxes[rotateOrder]
+	alternate = numpy.array( rotate, dtype=numpy.float64 ).reshape( (-1, 3) )
+	alternate[:, i] += 180.0
+	alternate[:, j] = 180.0 - alternate[:, j]
+	alternate[:, k] += 180.0
+	return alternate
+
+# which solution of rotate and how many degrees per angle take it closest to previous,
+# returns an (N,) mask of the transforms that take the alternate solution and the
+# (N,3) whole turns to add to the solution
+def _closestEuler(previous, rotate, rotateOrder):
+
+	previous = numpy.asarray( previous, dtype=numpy.float64 ).reshape( (-1, 3) )
+	rotate = numpy.asarray( rotate, dtype=numpy.float64 ).reshape( (-1, 3) )
+	alternate = alternateEulerArray( rotate, rotateOrder )
+	turns = 360.0 * numpy.round( ( previous - rotate ) / 360.0 )
+	alternateTurns = 360.0 * numpy.round( ( previous - alternate ) / 360.0 )
+	distance = numpy.abs( rotate + turns - previous ).sum( axis=1 )
+	alternateDistance = numpy.abs( alternate + alternateTurns - previous ).sum( axis=1 )
+	useAlternate = alternateDistance < distance
+	return useAlternate, numpy.where( useAlternate[:, numpy.newaxis], alternateTurns, turns )
+
+# euler angles in degrees of the rotations of rotate closest to previous, the angles
+# of the frame before, vectorized over N transforms
+# returns an (N,3) array
+def filterEulerStep(previous, rotate, rotateOrder=kXYZ):
+
+	_requireNumpy()
+	rotate = numpy.asarray( rotate, dtype=numpy.float64 ).reshape( (-1, 3) )
+	useAlternate, turns = _closestEuler( previous, rotate, rotateOrder )
+	return numpy.where( useAlternate[:, numpy.newaxis], alternateEulerArray( rotate, rotateOrder ), rotate ) + turns
+
+# filter consecutive frames of euler angles in degrees, rotate is (F,3) for one
+# transform or (F,N,3) for N transforms. Every frame is filtered against the filtered
+# frame before it, the first one against previous when it is given
+# returns a new array with the shape of rotate
+def filterEulerArray(rotate, rotateOrder=kXYZ, previous=None):
+
+	_requireNumpy()
+	rotate = numpy.asarray( rotate, dtype=numpy.float64 )
+	filtered = numpy.empty( rotate.shape )
+	frames = rotate.reshape( ( rotate.shape[0], -1, 3 ) )
+	output = filtered.reshape( frames.shape )
+	for frame in range( frames.shape[0] ):
+		if previous is None:
+			output[frame] = frames[frame]
+		else:
+			output[frame] = filterEulerStep( previous, frames[frame], rotateOrder )
+		previous = output[frame]
+	return filtered
+
+# move frames of euler angles in degrees that are continuous by themselves, like one
+# chunk of a bake, so that the first one continues from previous, the last frame of
+# the chunk before. Every frame takes the solution and turns of the first one, the
+# frames stay as continuous as they were. rotate is (F,3) or (F,N,3) like in
+# filterEulerArray()
+# returns a new array with the shape of rotate
+def continueEulerArray(rotate, previous, rotateOrder=kXYZ):
+
+	_requireNumpy()
+	rotate = numpy.asarray( rotate, dtype=numpy.float64 )
+	frames = rotate.reshape( ( rotate.shape[0], -1, 3 ) )
+	if not frames.shape[0]:
+		return rotate.copy()
+	useAlternate, turns = _closestEuler( previous, frames[0], rotateOrder )
+	alternate = alternateEulerArray( frames.reshape( (-1, 3) ), rotateOrder ).reshape( frames.shape )
+	moved = numpy.where( useAlternate[numpy.newaxis, :, numpy.newaxis], alternate, frames ) + turns
+	return moved.reshape( rotate.shape )
+
+# vectorized trsToMatrix(), translate, rotate in degrees, scale and shear are (N,3)
+# arrays or single values that apply to every transform, parentMatrix is one 4x4
+# matrix or one per transform
+# returns an (N,4,4) float64 array
+def compose(translate, rotate, scale, shear=None, rotateOrder=kXYZ, parentMatrix=None,
+		offsetTranslate=(0.0, 0.0, 0.0), offsetRotate=(0.0, 0.0, 0.0), offsetScale=(0.0, 0.0, 0.0),
+		decompositionMode=kDecomposeTransformationMatrix):
+
+	_requireNumpy()
+	translate = numpy.asarray( translate, dtype=numpy.float64 ).reshape( (-1, 3) ) + numpy.asarray( offsetTranslate, dtype=numpy.float64 )
+	rotate = numpy.asarray( rotate, dtype=numpy.float64 ).reshape( (-1, 3) ) + numpy.asarray( offsetRotate, dtype=numpy.float64 )
+	scale = numpy.asarray( scale, dtype=numpy.float64 ).reshape( (-1, 3) ) + numpy.asarray( offsetScale, dtype=numpy.float64 )
+	count = max( translate.shape[0], rotate.shape[0], scale.shape[0] )
+
+	# the stretch, scale * shear as in _scaleShearRows()
+	scale = numpy.broadcast_to( scale, (count, 3) )
+	stretch = numpy.zeros( (count, 3, 3) )
+	stretch[:, [0, 1, 2], [0, 1, 2]] = scale
+	if shear is not None:
+		shear = numpy.broadcast_to( numpy.asarray( shear, dtype=numpy.float64 ).reshape( (-1, 3) ), (count, 3) )
+		stretch[:, 1, 0] = scale[:, 1] * shear[:, 0]
+		stretch[:, 2, 0] = scale[:, 2] * shear[:, 1]
+		stretch[:, 2, 1] = scale[:, 2] * shear[:, 2]
+		if decompositionMode == kDecomposePolar:
+			stretch[:, 0, 1], stretch[:, 0, 2], stretch[:, 1, 2] = stretch[:, 1, 0], stretch[:, 2, 0], stretch[:, 2, 1]
+
+	matrices = numpy.zeros( (count, 4, 4) )
+	matrices[:, :3, :3] = numpy.matmul( stretch, rotationMatrixArray( numpy.radians( rotate ), rotateOrder ) )
+	matrices[:, 3, :3] = numpy.broadcast_to( translate, (count, 3) )
+	matrices[:, 3, 3] = 1.0
+	if parentMatrix is not None:
+		matrices = numpy.matmul( matrices, numpy.asarray( parentMatrix, dtype=numpy.float64 ).reshape( (-1, 4, 4) ) )
+	return matrices
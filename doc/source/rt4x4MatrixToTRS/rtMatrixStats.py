@@ -0,0 +1,186 @@
+# -----------------------------------------------------------------------------------
+# rtMatrixStats
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# Evaluation counters for the rt4x4MatrixToTRS nodes.
+#
+# Every node gets a record when it is created. While the stats are enabled each
+# compute() counts the evaluation, the time spent reading inputs, building the
+# matrix, decomposing it and writing outputs, cache hits and misses and errors.
+# While they are disabled, the default, compute() only tests one flag.
+#
+#   import rtMatrixStats
+#   rtMatrixStats.enable()
+#   # play the scene
+#   print( rtMatrixStats.report( 20 ) )
+#   rtMatrixStats.typeStats()
+#   rtMatrixStats.nodeStats()
+#   rtMatrixStats.reset()
+#   rtMatrixStats.disable()
+#
+# From MEL: python( "import rtMatrixStats; print( rtMatrixStats.report() )" );
+# -----------------------------------------------------------------------------------
+
+import time
+import weakref
+import threading
+
+# compute() stages
+kInputReads = "inputReads"
+kMatrixBuild = "matrixBuild"
+kDecomposition = "decomposition"
+kOutputWrites = "outputWrites"
+
+kStages = ( kInputReads, kMatrixBuild, kDecomposition, kOutputWrites )
+
+# the counters of a record, time is the total compute() time in seconds
+kCounters = ( "evaluations", "errors", "cacheHits", "cacheMisses", "time" )
+
+# compute() only records anything while this is True, use enable() and disable()
+enabled = False
+
+# the Python 2 of Maya 2020 and older has no perf_counter()
+try:
+	_clock = time.perf_counter
+except AttributeError:
+	_clock = time.clock
+
+
+# the counters of one node, only the compute() of its node writes to them and
+# Maya never runs compute() of one node on two threads at once so they need no lock
+class rtNodeStats(object):
+
+	def __init__(self, typeName):
+		self.typeName = typeName
+		self.reset()
+
+	def reset(self):
+		self.evaluations = 0
+		self.errors = 0
+		self.cacheHits = 0
+		self.cacheMisses = 0
+		self.time = 0.0
+		self.stageTimes = dict( [ ( stage, 0.0 ) for stage in kStages ] )
+		self._start = 0.0
+		self._last = 0.0
+
+	# start timing an evaluation
+	def begin(self):
+		self.evaluations += 1
+		self._start = self._last = _clock()
+
+	# add the time since begin() or the last lap() to a stage
+	def lap(self, stage):
+		now = _clock()
+		self.stageTimes[stage] += now - self._last
+		self._last = now
+
+	# stop timing an evaluation
+	def end(self):
+		self.time += _clock() - self._start
+
+	def asDict(self):
+		values = dict( [ ( counter, getattr( self, counter ) ) for counter in kCounters ] )
+		values.update( self.stageTimes )
+		return values
+
+
+# call function( *args, stats ) from compute(), stats is the rtNodeStats of the node
+# while the stats are enabled, the evaluation is then counted and timed and a raise
+# counted as an error, and None otherwise. Every node computes through this so they
+# all count the same way
+def measure(stats, function, *args):
+
+	if not enabled:
+		return function( *( args + ( None, ) ) )
+
+	stats.begin()
+	try:
+		return function( *( args + ( stats, ) ) )
+	except:
+		stats.errors += 1
+		raise
+	finally:
+		stats.end()
+
+
+# node -> rtNodeStats, records go away with their nodes
+_records = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+# the record of a new node, call it from the node constructor
+def register(node, typeName):
+	stats = rtNodeStats( typeName )
+	with _lock:
+		_records[node] = stats
+	return stats
+
+def enable(state=True):
+	global enabled
+	enabled = bool( state )
+
+def disable():
+	enable( False )
+
+def isEnabled():
+	return enabled
+
+# zero the counters of every node
+def reset():
+	with _lock:
+		records = list( _records.values() )
+	for stats in records:
+		stats.reset()
+
+def _items():
+	with _lock:
+		return list( _records.items() )
+
+# the counters of every node that was evaluated by node name
+def nodeStats():
+	result = {}
+	for node, stats in _items():
+		if stats.evaluations:
+			values = stats.asDict()
+			values["type"] = stats.typeName
+			result[ node.name() ] = values
+	return result
+
+# the counters of the evaluated nodes added up by node type, nodes is the number of nodes
+def typeStats():
+	result = {}
+	for node, stats in _items():
+		if not stats.evaluations:
+			continue
+		totals = result.setdefault( stats.typeName, dict( [ ( name, 0 ) for name in kCounters + kStages + ( "nodes", ) ] ) )
+		for name, value in stats.asDict().items():
+			totals[name] += value
+		totals["nodes"] += 1
+	return result
+
+# the count nodes with the highest value of a counter or stage as ( name, counters ) pairs
+def top(count=10, key="time"):
+	items = sorted( nodeStats().items(), key=lambda item: item[1][key], reverse=True )
+	return items[:count]
+
+# a text table of the per type totals and the nodes that took the most time
+def report(count=10):
+
+	lines = []
+	header = "%-32s %10s %8s %10s %10s " % ( "", "evals", "errors", "hits", "misses" ) + \
+		" ".join( [ "%13s" % stage for stage in ( "ms", ) + kStages ] )
+
+	def row(name, values):
+		return "%-32s %10d %8d %10d %10d " % ( name, values["evaluations"], values["errors"], values["cacheHits"], values["cacheMisses"] ) + \
+			" ".join( [ "%13.3f" % ( values[stage] * 1000.0 ) for stage in ( "time", ) + kStages ] )
+
+	if not enabled:
+		lines.append( "# rtMatrixStats is disabled, call rtMatrixStats.enable() to record evaluations" )
+	lines.append( header )
+	for typeName, values in sorted( typeStats().items() ):
+		lines.append( row( "%s (%d nodes)" % ( typeName, values["nodes"] ), values ) )
+	lines.append( "" )
+	for name, values in top( count ):
+		lines.append( row( name, values ) )
+	return "\n".join( lines )
@@ -0,0 +1,479 @@
+# -----------------------------------------------------------------------------------
+# rtMatrixStream
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# Streams matrices from mocap or tracking software into the matrixIn attributes of
+# rt4x4MatrixToTRS nodes. A local server reads binary frames of many matrices on a
+# background asyncio loop and keeps only the latest sample of every node, a Maya
+# timer then applies all the nodes that got a new sample in one MDGModifier per UI
+# tick instead of 16 setAttr commands per node per sample.
+#
+# In Maya:
+#   import rtMatrixStream
+#   rtMatrixStream.startLive( port=7150 )          # or path="/tmp/rtMatrixStream" for a Unix socket
+#   rtMatrixStream.liveStats()
+#   rtMatrixStream.stopLive()
+#
+# A sender, or the stand-in client used by the benchmark:
+#   client = rtMatrixStream.rtStreamClient( port=7150 )
+#   client.send( { "rt4x4MatrixToTRS1": values16, "rt4x4MatrixToTRS2": values16 } )
+#
+# The protocol, little endian:
+#   hello       "RTMS" and the protocol version as uint32, once per connection
+#   message     type as uint8, 3 pad bytes, payload length as uint32, payload
+#   bind        type 1, a channel as uint32 then the node name in utf-8
+#   samples     type 2, the send time as float64 seconds since the epoch, then per
+#               matrix its channel as uint32 and the 16 values as float64
+# A channel is bound to a node once per connection so samples do not repeat names.
+#
+# Without Maya the script benchmarks the server against the stand-in client, it
+# reports the server CPU time per sample and the time from a send to the tick
+# that picks it up for each number of streamed nodes:
+#   python rtMatrixStream.py --nodes 10 100 1000 --rate 120 --seconds 2
+# -----------------------------------------------------------------------------------
+
+import sys
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import threading
+
+kMagic = b"RTMS"
+kVersion = 1
+
+kBindMessage = 1
+kSamplesMessage = 2
+
+kDefaultHost = "127.0.0.1"
+kDefaultPort = 7150
+kDefaultInterval = 1.0 / 60.0
+
+# a larger message is refused and its connection closed
+kMaxMessageSize = 64 * 1024 * 1024
+
+_hello = struct.Struct( "<4sI" )
+_header = struct.Struct( "<BxxxI" )
+_channel = struct.Struct( "<I" )
+_sent = struct.Struct( "<d" )
+_sample = struct.Struct( "<I16d" )
+
+
+# -----------------------------------------------------------------------------------
+# the latest samples
+# -----------------------------------------------------------------------------------
+
+# the latest sample of every node, written by the server and taken by the tick
+class rtSampleStore(object):
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.latest = {}
+		# the send time of the oldest sample waiting to be taken
+		self.sentTime = None
+		self.received = 0
+		self.coalesced = 0
+		self.unbound = 0
+
+	# add the samples of a message, channels maps the channels of its connection to
+	# node names, a node that already has a sample waiting keeps only the new one
+	def putSamples(self, channels, payload):
+		sent = _sent.unpack_from( payload )[0]
+		records = _sample.iter_unpack( memoryview( payload )[_sent.size:] )
+		with self.lock:
+			latest = self.latest
+			before = len( latest )
+			count = 0
+			for record in records:
+				name = channels.get( record[0] )
+				if name is None:
+					self.unbound += 1
+					continue
+				latest[name] = record
+				count += 1
+			self.received += count
+			self.coalesced += count - ( len( latest ) - before )
+			if count and ( self.sentTime is None or sent < self.sentTime ):
+				self.sentTime = sent
+
+	# swap out the waiting samples, returns { node: ( channel, 16 values ) } and the
+	# send time of the oldest of them
+	def take(self):
+		with self.lock:
+			latest, self.latest = self.latest, {}
+			sent, self.sentTime = self.sentTime, None
+		return latest, sent
+
+	def stats(self):
+		with self.lock:
+			return { "received": self.received, "coalesced": self.coalesced, "unbound": self.unbound, "waiting": len( self.latest ) }
+
+
+# -----------------------------------------------------------------------------------
+# the server
+# -----------------------------------------------------------------------------------
+
+# a local TCP or Unix socket server on its own thread and asyncio loop
+class rtStreamServer(object):
+
+	def __init__(self, store=None, host=kDefaultHost, port=kDefaultPort, path=None):
+		self.store = store or rtSampleStore()
+		self.host = host
+		self.port = port
+		self.path = path
+		self.address = None
+		self.connections = 0
+		self.errors = []
+		self.loop = None
+		self.thread = None
+		self._server = None
+		self._cpuStart = 0.0
+
+	# start listening, returns once the socket is open. Port 0 picks a free port,
+	# the one used is in address
+	def start(self):
+		if self.thread is not None:
+			raise RuntimeError( "rtStreamServer is already running" )
+		started = threading.Event()
+		failure = []
+
+		def run():
+			loop = asyncio.new_event_loop()
+			asyncio.set_event_loop( loop )
+			self.loop = loop
+			try:
+				self._server = loop.run_until_complete( self._listen() )
+				self._cpuStart = time.thread_time()
+			except Exception as error:
+				failure.append( error )
+				started.set()
+				loop.close()
+				return
+			started.set()
+			try:
+				loop.run_forever()
+			finally:
+				self._server.close()
+				loop.run_until_complete( self._server.wait_closed() )
+				loop.close()
+
+		self.thread = threading.Thread( target=run, name="rtMatrixStream" )
+		self.thread.daemon = True
+		self.thread.start()
+		started.wait()
+		if failure:
+			self.thread.join()
+			self.thread = None
+			raise failure[0]
+		return self
+
+	def _listen(self):
+		if self.path is not None:
+			self.address = self.path
+			return asyncio.start_unix_server( self._serve, path=self.path )
+		return self._listenTcp()
+
+	async def _listenTcp(self):
+		server = await asyncio.start_server( self._serve, self.host, self.port )
+		self.address = server.sockets[0].getsockname()[:2]
+		return server
+
+	def stop(self):
+		if self.thread is None:
+			return
+		self.loop.call_soon_threadsafe( self.loop.stop )
+		self.thread.join()
+		self.thread = None
+
+	# the CPU time spent by the server thread since it started, in seconds
+	def cpuTime(self):
+		if self.thread is None:
+			return 0.0
+		future = asyncio.run_coroutine_threadsafe( self._cpuTime(), self.loop )
+		return future.result()
+
+	async def _cpuTime(self):
+		return time.thread_time() - self._cpuStart
+
+	async def _serve(self, reader, writer):
+		self.connections += 1
+		channels = {}
+		try:
+			magic, version = _hello.unpack( await reader.readexactly( _hello.size ) )
+			if magic != kMagic or version != kVersion:
+				raise ValueError( "not a version %d rtMatrixStream client" % kVersion )
+			while True:
+				kind, length = _header.unpack( await reader.readexactly( _header.size ) )
+				if length > kMaxMessageSize:
+					raise ValueError( "a message of %d bytes is too large" % length )
+				payload = await reader.readexactly( length )
+				if kind == kSamplesMessage:
+					if ( length - _sent.size ) % _sample.size:
+						raise ValueError( "a samples message of %d bytes" % length )
+					self.store.putSamples( channels, payload )
+				elif kind == kBindMessage:
+					channels[_channel.unpack_from( payload )[0]] = payload[_channel.size:].decode( "utf-8" )
+				else:
+					raise ValueError( "unknown message type %d" % kind )
+		except asyncio.IncompleteReadError:
+			pass
+		except ( ValueError, UnicodeDecodeError, struct.error ) as error:
+			self.errors.append( str( error ) )
+		finally:
+			self.connections -= 1
+			writer.close()
+
+
+# -----------------------------------------------------------------------------------
+# the client
+# -----------------------------------------------------------------------------------
+
+# a blocking client, what a sender does and the stand-in for one in tests
+class rtStreamClient(object):
+
+	def __init__(self, host=kDefaultHost, port=kDefaultPort, path=None):
+		if path is not None:
+			self.socket = socket.socket( socket.AF_UNIX, socket.SOCK_STREAM )
+			self.socket.connect( path )
+		else:
+			self.socket = socket.create_connection( ( host, port ) )
+			self.socket.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+		self.channels = {}
+		self.socket.sendall( _hello.pack( kMagic, kVersion ) )
+
+	def close(self):
+		self.socket.close()
+
+	# bind a channel to every name that does not have one yet
+	def bind(self, names):
+		messages = []
+		for name in names:
+			if name not in self.channels:
+				channel = len( self.channels )
+				self.channels[name] = channel
+				payload = _channel.pack( channel ) + name.encode( "utf-8" )
+				messages.append( _header.pack( kBindMessage, len( payload ) ) + payload )
+		if messages:
+			self.socket.sendall( b"".join( messages ) )
+
+	# send one sample for each node of samples, { node: 16 values } or a list of
+	# ( node, 16 values ), sent is the send time, now by default
+	def send(self, samples, sent=None):
+		if isinstance( samples, dict ):
+			samples = samples.items()
+		samples = list( samples )
+		self.bind( [ name for name, values in samples ] )
+		channels = self.channels
+		payload = [ _sent.pack( time.time() if sent is None else sent ) ]
+		payload.extend( [ _sample.pack( channels[name], *values ) for name, values in samples ] )
+		size = sum( [ len( part ) for part in payload ] )
+		self.socket.sendall( _header.pack( kSamplesMessage, size ) + b"".join( payload ) )
+
+
+# -----------------------------------------------------------------------------------
+# Maya
+# -----------------------------------------------------------------------------------
+
+# the matrixIn children of the streamed nodes, applied in one MDGModifier
+class rtNodeInputs(object):
+
+	def __init__(self):
+		import maya.api.OpenMaya
+		self.OpenMaya = maya.api.OpenMaya
+		# node: ( MObjectHandle, the 16 matrixIn child plugs ) or None for a node
+		# that was not found, looked up again when the scene changes
+		self.nodes = {}
+		self.missing = set()
+
+	def plugs(self, name):
+		entry = self.nodes.get( name )
+		if entry is not None and entry[0].isValid():
+			return entry[1]
+		OpenMaya = self.OpenMaya
+		try:
+			selection = OpenMaya.MSelectionList()
+			selection.add( name )
+			node = selection.getDependNode( 0 )
+			matrixIn = OpenMaya.MFnDependencyNode( node ).findPlug( "matrixIn", False )
+		except RuntimeError:
+			if name not in self.missing:
+				self.missing.add( name )
+				sys.stderr.write( "# Warning: rtMatrixStream: no node %s with a matrixIn attribute\n" % name )
+			self.nodes.pop( name, None )
+			return None
+		self.missing.discard( name )
+		plugs = [ matrixIn.child( index ) for index in range( 16 ) ]
+		self.nodes[name] = ( OpenMaya.MObjectHandle( node ), plugs )
+		return plugs
+
+	# set the 16 matrixIn values of every node of samples and let Maya evaluate once
+	def apply(self, samples):
+		modifier = self.OpenMaya.MDGModifier()
+		count = 0
+		for name, record in samples.items():
+			plugs = self.plugs( name )
+			if plugs is None:
+				continue
+			for index in range( 16 ):
+				modifier.newPlugValueFloat( plugs[index], record[index + 1] )
+			count += 1
+		if count:
+			modifier.doIt()
+		return count
+
+	# forget the looked up nodes, after a new scene is opened
+	def reset(self):
+		self.nodes.clear()
+		self.missing.clear()
+
+
+# a server plus the Maya timer that applies its samples
+class rtLiveStream(object):
+
+	def __init__(self, server, interval=kDefaultInterval):
+		import maya.api.OpenMaya
+		self.OpenMaya = maya.api.OpenMaya
+		self.server = server
+		self.inputs = rtNodeInputs()
+		self.interval = interval
+		self.ticks = 0
+		self.applied = 0
+		self.latency = 0.0
+		self.callback = None
+
+	def start(self):
+		self.server.start()
+		self.callback = self.OpenMaya.MTimerMessage.addTimerCallback( self.interval, self.tick )
+		return self
+
+	def stop(self):
+		if self.callback is not None:
+			self.OpenMaya.MMessage.removeCallback( self.callback )
+			self.callback = None
+		self.server.stop()
+
+	def tick(self, elapsedTime=None, lastTime=None, clientData=None):
+		samples, sent = self.server.store.take()
+		if not samples:
+			return
+		try:
+			self.applied += self.inputs.apply( samples )
+		except RuntimeError as error:
+			sys.stderr.write( "# Warning: rtMatrixStream: %s\n" % error )
+		self.ticks += 1
+		self.latency = max( time.time() - sent, 0.0 )
+
+	def stats(self):
+		stats = self.server.store.stats()
+		stats.update( { "ticks": self.ticks, "applied": self.applied, "latency": self.latency,
+				"connections": self.server.connections, "address": self.server.address } )
+		return stats
+
+
+_live = None
+
+# start streaming into the open scene, a server on port or on the Unix socket path
+# and a timer applying the latest samples every interval seconds
+def startLive(port=kDefaultPort, host=kDefaultHost, path=None, interval=kDefaultInterval):
+	global _live
+	stopLive()
+	_live = rtLiveStream( rtStreamServer( host=host, port=port, path=path ), interval ).start()
+	return _live
+
+def stopLive():
+	global _live
+	if _live is not None:
+		_live.stop()
+		_live = None
+
+# the counters of the live stream, received and coalesced samples, ticks, nodes
+# applied and the age of the oldest sample of the last tick in seconds
+def liveStats():
+	return _live.stats() if _live is not None else None
+
+
+# -----------------------------------------------------------------------------------
+# benchmark
+# -----------------------------------------------------------------------------------
+
+# stream nodeCount nodes at rate frames per second for seconds, taking the samples
+# every interval like the Maya timer, returns a dictionary of the results
+def benchmark(nodeCount, rate=120.0, seconds=2.0, interval=kDefaultInterval, path=None):
+
+	server = rtStreamServer( port=0, path=path ).start()
+	try:
+		if path is not None:
+			client = rtStreamClient( path=path )
+		else:
+			client = rtStreamClient( port=server.address[1] )
+		names = [ "rt4x4MatrixToTRS%d" % ( index + 1 ) for index in range( nodeCount ) ]
+		client.bind( names )
+		frames = [ [ ( name, [ float( index ) ] * 15 + [ 1.0 ] ) for index, name in enumerate( names ) ] ]
+
+		done = threading.Event()
+		latencies = []
+		applied = [ 0 ]
+		def ticker():
+			while not done.is_set():
+				time.sleep( interval )
+				samples, sent = server.store.take()
+				if samples:
+					latencies.append( time.time() - sent )
+					applied[0] += len( samples )
+		thread = threading.Thread( target=ticker )
+		thread.start()
+
+		sentFrames = 0
+		start = time.time()
+		while time.time() - start < seconds:
+			client.send( frames[0] )
+			sentFrames += 1
+			delay = start + sentFrames / rate - time.time()
+			if delay > 0.0:
+				time.sleep( delay )
+		client.close()
+
+		# wait for the server to read everything that was sent
+		expected = sentFrames * nodeCount
+		deadline = time.time() + 10.0
+		while server.store.stats()["received"] < expected and time.time() < deadline:
+			time.sleep( 0.01 )
+		done.set()
+		thread.join()
+		cpu = server.cpuTime()
+	finally:
+		server.stop()
+
+	stats = server.store.stats()
+	latencies.sort()
+	return { "nodes": nodeCount, "frames": sentFrames, "samples": stats["received"], "coalesced": stats["coalesced"],
+		"applied": applied[0], "cpuPerSample": cpu / max( stats["received"], 1 ),
+		"latencyMedian": latencies[len( latencies ) // 2] if latencies else 0.0,
+		"latencyWorst": latencies[-1] if latencies else 0.0 }
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Benchmark the rtMatrixStream server with the stand-in client, without Maya." )
+	parser.add_argument( "--nodes", type=int, nargs="+", default=[ 10, 100, 1000 ], help="numbers of streamed nodes" )
+	parser.add_argument( "--rate", type=float, default=120.0, help="frames of all the nodes sent per second" )
+	parser.add_argument( "--seconds", type=float, default=2.0, help="time streamed per node count" )
+	parser.add_argument( "--interval", type=float, default=kDefaultInterval, help="seconds between ticks" )
+	parser.add_argument( "--unix", metavar="PATH", help="use a Unix socket at PATH instead of TCP" )
+	args = parser.parse_args( argv )
+
+	sys.stdout.write( "%8s %8s %10s %10s %10s %14s %14s %14s\n" % ( "nodes", "frames", "samples", "coalesced", "applied",
+				"cpu us/sample", "latency ms", "worst ms" ) )
+	for nodeCount in args.nodes:
+		try:
+			result = benchmark( nodeCount, args.rate, args.seconds, args.interval, args.unix )
+		except ( IOError, OSError ) as error:
+			parser.error( str( error ) )
+		sys.stdout.write( "%8d %8d %10d %10d %10d %14.2f %14.2f %14.2f\n" % ( result["nodes"], result["frames"], result["samples"],
+					result["coalesced"], result["applied"], result["cpuPerSample"] * 1.0e6,
+					result["latencyMedian"] * 1.0e3, result["latencyWorst"] * 1.0e3 ) )
+	return 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,542 @@
+# -----------------------------------------------------------------------------------
+# rtMayaAscii
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# A streaming reader for Maya ASCII (.ma) files that works without Maya.
+#
+# The file is read one line at a time and split into MEL statements. Statements
+# that are not asked for are skipped without being stored, so the large setAttr
+# blocks of meshes never sit in memory. A scene is read in two passes:
+#
+#   scan()  keeps the nodes, their parents, the connections and the units
+#   load()  keeps the setAttr values of the nodes that are needed
+#
+#   import rtMayaAscii
+#   scene = rtMayaAscii.rtMayaAsciiScene()
+#   scene.scan( "rt4x4MatrixToTRS_example.ma" )
+#   nodes = scene.nodesOfType( "rt4x4MatrixToTRS" )
+#   scene.load( "rt4x4MatrixToTRS_example.ma", scene.upstream( nodes ) )
+#
+# rtAnimCurve evaluates the time based animCurve nodes (animCurveTL, TA, TU and
+# TT) on an array of frames. Step, linear, flat, spline, clamped, plateau and
+# auto tangents are evaluated, fixed and weighted tangents are treated as spline.
+# -----------------------------------------------------------------------------------
+
+import re
+import math
+import shlex
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+# file units to Maya's internal units, centimeters and radians
+kLinearUnits = { "mm": 0.1, "millimeter": 0.1, "cm": 1.0, "centimeter": 1.0, "m": 100.0, "meter": 100.0,
+		"km": 100000.0, "kilometer": 100000.0, "in": 2.54, "inch": 2.54, "ft": 30.48, "foot": 30.48,
+		"yd": 91.44, "yard": 91.44, "mi": 160934.4, "mile": 160934.4 }
+kAngleUnits = { "deg": math.pi / 180.0, "degree": math.pi / 180.0, "rad": 1.0, "radian": 1.0,
+		"min": math.pi / 10800.0, "angMinute": math.pi / 10800.0, "sec": math.pi / 648000.0, "angSecond": math.pi / 648000.0 }
+
+# setAttr flags and the number of arguments they take
+kSetAttrFlags = { "-k": 1, "-keyable": 1, "-l": 1, "-lock": 1, "-cb": 1, "-channelBox": 1, "-ca": 1, "-caching": 1,
+		"-s": 1, "-size": 1, "-type": 1, "-av": 0, "-alteredValue": 0, "-c": 0, "-clamp": 0 }
+
+# animCurve tangent types as saved in the kit and kot attributes
+kTangentGlobal = 0
+kTangentFixed = 1
+kTangentLinear = 2
+kTangentFlat = 3
+kTangentSmooth = 4
+kTangentStep = 5
+kTangentSlow = 6
+kTangentFast = 7
+kTangentClamped = 8
+kTangentPlateau = 9
+kTangentStepNext = 10
+kTangentAuto = 11
+
+# animCurve pre and post infinity types
+kInfinityConstant = 0
+kInfinityLinear = 1
+kInfinityCycle = 3
+kInfinityCycleRelative = 4
+kInfinityOscillate = 5
+
+_indexPattern = re.compile( r"^(.*)\[(\d+)(?::(\d+))?\]$" )
+
+
+# -----------------------------------------------------------------------------------
+# statements
+# -----------------------------------------------------------------------------------
+
+# split the lines of a .ma file into MEL statements, yields ( command, text )
+# keep( command ) is called when a statement starts, text is None for the statements
+# it returns False for, they are scanned for their end but not stored
+def readStatements(lines, keep):
+
+	parts = None
+	command = None
+	inString = False
+	for line in lines:
+		position = 0
+		length = len( line )
+		while position < length:
+			if command is None:
+				# between statements, skip blanks and comment lines
+				while position < length and line[position] in " \t\r\n":
+					position += 1
+				if position >= length or line.startswith( "//", position ):
+					break
+				end = position
+				while end < length and line[end] not in " \t\r\n;":
+					end += 1
+				command = line[position:end]
+				parts = [] if keep( command ) else None
+
+			# look for the ; that ends the statement outside of a string
+			end = -1
+			if not inString and '"' not in line[position:]:
+				end = line.find( ";", position )
+			else:
+				index = position
+				while index < length:
+					character = line[index]
+					if inString:
+						if character == "\\":
+							index += 1
+						elif character == '"':
+							inString = False
+					elif character == '"':
+						inString = True
+					elif character == ";":
+						end = index
+						break
+					index += 1
+
+			if end < 0:
+				if parts is not None:
+					parts.append( line[position:] )
+				break
+
+			if parts is not None:
+				parts.append( line[position:end] )
+				yield command, "".join( parts )
+			else:
+				yield command, None
+			command = None
+			parts = None
+			position = end + 1
+
+# split the lines of a .ma file into chunks that add up to the file, for rewriting it,
+# yields ( command, text, leading, body ) where leading is the blanks and comments
+# before the statement, body the statement up to and with its ; and text the body
+# without the ; like readStatements(), whatever follows the last statement comes
+# as a chunk with command, text and body set to None
+def readChunks(lines):
+
+	leading = []
+	parts = None
+	command = None
+	inString = False
+	for line in lines:
+		position = 0
+		length = len( line )
+		while position < length:
+			if command is None:
+				start = position
+				while position < length and line[position] in " \t\r\n":
+					position += 1
+				if position >= length or line.startswith( "//", position ):
+					leading.append( line[start:] )
+					break
+				leading.append( line[start:position] )
+				end = position
+				while end < length and line[end] not in " \t\r\n;":
+					end += 1
+				command = line[position:end]
+				parts = []
+
+			end = -1
+			if not inString and '"' not in line[position:]:
+				end = line.find( ";", position )
+			else:
+				index = position
+				while index < length:
+					character = line[index]
+					if inString:
+						if character == "\\":
+							index += 1
+						elif character == '"':
+							inString = False
+					elif character == '"':
+						inString = True
+					elif character == ";":
+						end = index
+						break
+					index += 1
+
+			if end < 0:
+				parts.append( line[position:] )
+				break
+
+			parts.append( line[position:end] )
+			text = "".join( parts )
+			yield command, text, "".join( leading ), text + ";"
+			command = None
+			parts = None
+			leading = []
+			position = end + 1
+
+	if parts is not None:
+		leading.extend( parts )
+	if leading:
+		yield None, None, "".join( leading ), None
+
+# split a statement into its words, strings lose their quotes
+def splitStatement(text):
+	lexer = shlex.shlex( text, posix=True )
+	lexer.whitespace_split = True
+	lexer.commenters = ""
+	return list( lexer )
+
+# the value of a flag in a list of words or a default
+def flagValue(words, flags, default=None):
+	for index, word in enumerate( words[:-1] ):
+		if word in flags:
+			return words[index + 1]
+	return default
+
+# split a plug like "node.attr" or "|group|node.parent.child" into ( node, attribute )
+# the attribute is the last part of the plug path
+def splitPlug(plug):
+	node, attribute = plug.split( ".", 1 )
+	return node, attribute.rsplit( ".", 1 )[-1]
+
+# the float value of a saved word, yes / no / on / off are booleans
+def toFloat(word):
+	lowered = word.lower()
+	if lowered in ( "yes", "on", "true" ):
+		return 1.0
+	if lowered in ( "no", "off", "false" ):
+		return 0.0
+	return float( word )
+
+
+# -----------------------------------------------------------------------------------
+# scene
+# -----------------------------------------------------------------------------------
+
+class rtMayaAsciiNode(object):
+
+	def __init__(self, name, typeName, parent=None):
+		self.name = name
+		self.typeName = typeName
+		self.parent = parent
+		# attribute: ( type, words ) and for multi attributes attribute: { index: words }
+		self.values = {}
+		self.arrays = {}
+
+	# the saved words of the first attribute name found or None
+	def value(self, names):
+		for name in names:
+			if name in self.values:
+				return self.values[name][1]
+		return None
+
+	# the saved elements of a multi attribute as a list of ( index, words ) in index order
+	def arrayValues(self, name):
+		return sorted( self.arrays.get( name, {} ).items() )
+
+
+class rtMayaAsciiScene(object):
+
+	def __init__(self):
+		self.nodes = {}
+		# ( node, attribute ) of a destination: source plug
+		self.connections = {}
+		self.linearUnit = "cm"
+		self.angleUnit = "deg"
+		self.timeUnit = "film"
+
+	def _open(self, path):
+		return open( path, "r", encoding="utf-8", errors="replace" )
+
+	# first pass, the nodes, connections and units
+	def scan(self, path):
+
+		commands = ( "createNode", "connectAttr", "currentUnit" )
+		stream = self._open( path )
+		try:
+			for command, text in readStatements( stream, lambda command: command in commands ):
+				if text is None:
+					continue
+				words = splitStatement( text )
+				if command == "createNode":
+					name = flagValue( words, ( "-n", "-name" ) )
+					if name is not None:
+						self.nodes[name] = rtMayaAsciiNode( name, words[1], flagValue( words, ( "-p", "-parent" ) ) )
+				elif command == "connectAttr":
+					plugs = [ word for word in words[1:] if not word.startswith( "-" ) ]
+					if len( plugs ) >= 2 and "." in plugs[0] and "." in plugs[1]:
+						node, attribute = splitPlug( plugs[1] )
+						self.connections[ ( self.nodeName( node ), attribute ) ] = plugs[0]
+						# elements of compound multis like tg[1].tt are also kept by their path
+						path = plugs[1].split( ".", 1 )[1]
+						if path != attribute:
+							self.connections[ ( self.nodeName( node ), path ) ] = plugs[0]
+				elif command == "currentUnit":
+					self.linearUnit = flagValue( words, ( "-l", "-linear" ), self.linearUnit )
+					self.angleUnit = flagValue( words, ( "-a", "-angle" ), self.angleUnit )
+					self.timeUnit = flagValue( words, ( "-t", "-time" ), self.timeUnit )
+		finally:
+			stream.close()
+
+	# second pass, the setAttr values of the named nodes
+	def load(self, path, names):
+
+		names = set( names )
+		current = [ None ]
+
+		def keep(command):
+			if command == "setAttr":
+				return current[0] in names
+			return command in ( "createNode", "select" )
+
+		stream = self._open( path )
+		try:
+			for command, text in readStatements( stream, keep ):
+				if text is None:
+					continue
+				words = splitStatement( text )
+				if command == "createNode":
+					current[0] = flagValue( words, ( "-n", "-name" ) )
+				elif command == "select":
+					selected = [ word for word in words[1:] if not word.startswith( "-" ) ]
+					current[0] = selected[0] if selected else None
+				elif command == "setAttr":
+					self._setAttr( self.nodes.get( current[0] ), words[1:] )
+		finally:
+			stream.close()
+
+	# store the words of a setAttr statement on a node
+	def _setAttr(self, node, words):
+
+		if node is None:
+			return
+		typeName = None
+		positional = []
+		index = 0
+		while index < len( words ):
+			word = words[index]
+			if word in kSetAttrFlags:
+				if word == "-type":
+					typeName = words[index + 1]
+				index += kSetAttrFlags[word] + 1
+				continue
+			positional.append( word )
+			index += 1
+		if not positional:
+			return
+
+		attribute = positional[0].lstrip( "." )
+		values = positional[1:]
+		match = _indexPattern.match( attribute )
+		if match is None:
+			node.values[attribute] = ( typeName, values )
+			return
+
+		# a multi attribute element or a range of elements
+		name, first, last = match.group(1), int( match.group(2) ), match.group(3)
+		last = first if last is None else int( last )
+		count = last - first + 1
+		size = max( 1, len( values ) // count )
+		elements = node.arrays.setdefault( name, {} )
+		for i in range( count ):
+			elements[first + i] = values[i * size:( i + 1 ) * size]
+
+	# a node name from a plug node, DAG paths use their last part
+	def nodeName(self, name):
+		if name in self.nodes or "|" not in name:
+			return name
+		return name.rsplit( "|", 1 )[-1]
+
+	def node(self, name):
+		return self.nodes.get( self.nodeName( name ) )
+
+	def nodesOfType(self, typeName):
+		return [ node.name for node in self.nodes.values() if node.typeName == typeName ]
+
+	# the source plug connected to the first of the attribute names found on a node or None
+	def source(self, name, attributes):
+		for attribute in attributes:
+			plug = self.connections.get( ( name, attribute ) )
+			if plug is not None:
+				return plug
+		return None
+
+	# the names of the nodes upstream of some nodes and their DAG parents, the
+	# nodes themselves are included
+	def upstream(self, names):
+
+		sources = {}
+		for ( destination, attribute ), plug in self.connections.items():
+			sources.setdefault( destination, [] ).append( self.nodeName( plug.split( ".", 1 )[0] ) )
+
+		found = set()
+		pending = list( names )
+		while pending:
+			name = pending.pop()
+			if name in found or name not in self.nodes:
+				continue
+			found.add( name )
+			pending.extend( sources.get( name, () ) )
+			parent = self.nodes[name].parent
+			if parent is not None:
+				pending.append( self.nodeName( parent ) )
+		return found
+
+	# the unit factor of the values saved on an animCurve node
+	def curveUnitFactor(self, typeName):
+		if typeName == "animCurveTL":
+			return kLinearUnits.get( self.linearUnit, 1.0 )
+		if typeName == "animCurveTA":
+			return kAngleUnits.get( self.angleUnit, 1.0 )
+		return 1.0
+
+
+# -----------------------------------------------------------------------------------
+# animation curves
+# -----------------------------------------------------------------------------------
+
+class rtAnimCurve(object):
+
+	def __init__(self, times, values, inTypes=None, outTypes=None, preInfinity=kInfinityConstant, postInfinity=kInfinityConstant):
+		if numpy is None:
+			raise ImportError( "rtMayaAscii: numpy is required to evaluate animation curves" )
+		self.times = numpy.asarray( times, dtype=numpy.float64 )
+		self.values = numpy.asarray( values, dtype=numpy.float64 )
+		count = len( self.times )
+		self.inTypes = numpy.asarray( inTypes if inTypes is not None else [ kTangentClamped ] * count, dtype=numpy.int32 )
+		self.outTypes = numpy.asarray( outTypes if outTypes is not None else [ kTangentClamped ] * count, dtype=numpy.int32 )
+		self.preInfinity = preInfinity
+		self.postInfinity = postInfinity
+		self.inSlopes, self.outSlopes = self._slopes()
+
+	# build a curve from an animCurve node of a scene, the values are scaled by factor
+	@classmethod
+	def fromNode(cls, node, factor=1.0):
+
+		keys = []
+		for index, words in node.arrayValues( "ktv" ):
+			keys.append( ( toFloat( words[0] ), toFloat( words[1] ) * factor ) )
+
+		def tangents(name):
+			types = dict( [ ( index, int( toFloat( words[0] ) ) ) for index, words in node.arrayValues( name ) if words ] )
+			return [ types.get( index, kTangentClamped ) for index in range( len( keys ) ) ]
+
+		def infinity(names):
+			words = node.value( names )
+			return int( toFloat( words[0] ) ) if words else kInfinityConstant
+
+		return cls( [ key[0] for key in keys ], [ key[1] for key in keys ], tangents( "kit" ), tangents( "kot" ),
+			infinity( ( "pre", "preInfinity" ) ), infinity( ( "pst", "postInfinity" ) ) )
+
+	# the in and out slope of every key from its tangent types
+	def _slopes(self):
+
+		t, v = self.times, self.values
+		count = len( t )
+		if count < 2:
+			zeros = numpy.zeros( count )
+			return zeros, zeros.copy()
+
+		secants = numpy.diff( v ) / numpy.diff( t )
+		before = numpy.concatenate( ( secants[:1], secants ) )
+		after = numpy.concatenate( ( secants, secants[-1:] ) )
+
+		spline = numpy.empty( count )
+		spline[0], spline[-1] = secants[0], secants[-1]
+		spline[1:-1] = ( v[2:] - v[:-2] ) / ( t[2:] - t[:-2] )
+
+		# clamped keeps a key flat when a neighbour has the same value
+		tolerance = 1.0e-9 * ( 1.0 + numpy.abs( v ) )
+		clamped = spline.copy()
+		flatNeighbour = numpy.zeros( count, dtype=bool )
+		flatNeighbour[1:] |= numpy.abs( numpy.diff( v ) ) <= tolerance[1:]
+		flatNeighbour[:-1] |= numpy.abs( numpy.diff( v ) ) <= tolerance[:-1]
+		clamped[flatNeighbour] = 0.0
+
+		# plateau and auto are flat on peaks and never overshoot the neighbours
+		plateau = spline.copy()
+		extreme = numpy.zeros( count, dtype=bool )
+		extreme[1:-1] = ( v[1:-1] - v[:-2] ) * ( v[2:] - v[1:-1] ) <= 0.0
+		extreme[0] = extreme[-1] = True
+		plateau[extreme] = 0.0
+		limit = 3.0 * numpy.minimum( numpy.abs( before ), numpy.abs( after ) )
+		plateau = numpy.clip( plateau, -limit, limit )
+
+		def slopes(types, linear):
+			result = spline.copy()
+			result[types == kTangentLinear] = linear[types == kTangentLinear]
+			result[types == kTangentFlat] = 0.0
+			result[types == kTangentClamped] = clamped[types == kTangentClamped]
+			auto = ( types == kTangentPlateau ) | ( types == kTangentAuto )
+			result[auto] = plateau[auto]
+			return result
+
+		return slopes( self.inTypes, before ), slopes( self.outTypes, after )
+
+	# the curve value at an array of frames
+	def evaluate(self, frames):
+
+		frames = numpy.asarray( frames, dtype=numpy.float64 )
+		t, v = self.times, self.values
+		count = len( t )
+		if count == 0:
+			return numpy.zeros( frames.shape )
+		if count == 1:
+			return numpy.full( frames.shape, v[0] )
+
+		first, last = t[0], t[-1]
+		span = last - first
+		x = frames.copy()
+		offset = numpy.zeros( frames.shape )
+
+		# map the frames outside of the keys back onto the curve
+		for mask, infinity, before in ( ( frames < first, self.preInfinity, True ), ( frames > last, self.postInfinity, False ) ):
+			if not mask.any() or infinity in ( kInfinityConstant, kInfinityLinear ) or span <= 0.0:
+				continue
+			cycles = numpy.floor( ( frames[mask] - first ) / span )
+			local = frames[mask] - first - cycles * span
+			if infinity == kInfinityOscillate:
+				local = numpy.where( numpy.mod( cycles, 2.0 ) != 0.0, span - local, local )
+			elif infinity == kInfinityCycleRelative:
+				offset[mask] = cycles * ( v[-1] - v[0] )
+			x[mask] = first + local
+
+		x = numpy.clip( x, first, last )
+		segment = numpy.clip( numpy.searchsorted( t, x, side="right" ) - 1, 0, count - 2 )
+		t0, t1 = t[segment], t[segment + 1]
+		v0, v1 = v[segment], v[segment + 1]
+		dt = t1 - t0
+		u = ( x - t0 ) / dt
+
+		# cubic hermite between the keys
+		u2 = u * u
+		u3 = u2 * u
+		result = ( 2.0 * u3 - 3.0 * u2 + 1.0 ) * v0 + ( u3 - 2.0 * u2 + u ) * self.outSlopes[segment] * dt \
+			+ ( -2.0 * u3 + 3.0 * u2 ) * v1 + ( u3 - u2 ) * self.inSlopes[segment + 1] * dt
+
+		outType = self.outTypes[segment]
+		result = numpy.where( outType == kTangentStep, numpy.where( u < 1.0, v0, v1 ), result )
+		result = numpy.where( outType == kTangentStepNext, numpy.where( u > 0.0, v1, v0 ), result )
+
+		# linear infinity continues the slope of the first or last key
+		if self.preInfinity == kInfinityLinear:
+			result = numpy.where( frames < first, v[0] + self.inSlopes[0] * ( frames - first ), result )
+		if self.postInfinity == kInfinityLinear:
+			result = numpy.where( frames > last, v[-1] + self.outSlopes[-1] * ( frames - last ), result )
+
+		return result + offset
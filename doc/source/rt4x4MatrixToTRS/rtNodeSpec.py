@@ -0,0 +1,776 @@
+# -----------------------------------------------------------------------------------
+# rtNodeSpec
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# The attributes of every node of the rt4x4MatrixToTRS plugins as data. The plugins
+# create their attributes from these tables in one loop instead of a page of create
+# and set calls per node, and the API 1.0 and API 2.0 versions of rt4x4MatrixToTRS
+# share the same table so they can not drift apart. createAttributes() builds the
+# attributes of a table with either OpenMaya module and rtMatrixToTRSCompute is the
+# compute of rt4x4MatrixToTRS, shared by its API 1.0 and API 2.0 versions.
+#
+# Nothing here imports maya, the layout of a node can be read and checked anywhere:
+#   python rtNodeSpec.py              # print every node and check it
+#   python rtNodeSpec.py --node rt4x4TRSToMatrix
+# it exits with 1 when a table has a problem, a repeated name or an output that
+# nothing affects for example.
+#
+# Only flags that differ from the Maya defaults are set when an attribute is created,
+# every attribute is readable, writable and storable and not keyable unless the
+# table says otherwise, which keeps the calls into Maya at plugin load to a minimum.
+# -----------------------------------------------------------------------------------
+
+import sys
+import math
+import struct
+import argparse
+
+import rtMatrixKernel
+import rtMatrixCache
+import rtMatrixStats
+
+# attribute kinds
+kFloat = "float"
+kDouble = "double"
+kBoolean = "boolean"
+kInt = "int"
+# a float3 point with X, Y and Z children
+kPoint = "point"
+# a numeric compound of its children, like shear
+kNumericCompound = "numericCompound"
+kCompound = "compound"
+# a double matrix
+kMatrix = "matrix"
+kEnum = "enum"
+kString = "string"
+kVectorArray = "vectorArray"
+kIntArray = "intArray"
+# per particle arrays like the inputPoints of an instancer
+kArrayAttrs = "arrayAttrs"
+kTime = "time"
+
+kNumericKinds = ( kFloat, kDouble, kBoolean, kInt )
+kKinds = kNumericKinds + ( kPoint, kNumericCompound, kCompound, kMatrix, kEnum, kString, kVectorArray, kIntArray, kArrayAttrs, kTime )
+
+kRotateOrderFields = ( ( "XYZ", 0 ), ( "YZX", 1 ), ( "ZXY", 2 ), ( "XZY", 3 ), ( "YXZ", 4 ), ( "ZYX", 5 ) )
+
+
+# one attribute of a node, member is the name of the class variable that holds it
+class rtAttribute(object):
+
+	def __init__(self, member, kind, longName, shortName, default=None, output=False, keyable=False,
+			children=(), childrenMember=None, fields=(), minimum=None, array=False,
+			usesArrayDataBuilder=False, deleteOnDisconnect=False, usedAsFilename=False):
+		self.member = member
+		self.kind = kind
+		self.longName = longName
+		self.shortName = shortName
+		self.default = default
+		self.output = output
+		self.keyable = keyable
+		self.children = tuple( children )
+		self.childrenMember = childrenMember
+		self.fields = tuple( fields )
+		self.minimum = minimum
+		self.array = array
+		self.usesArrayDataBuilder = usesArrayDataBuilder
+		self.deleteOnDisconnect = deleteOnDisconnect
+		self.usedAsFilename = usedAsFilename
+
+	def __repr__(self):
+		return "<rtAttribute %s>" % self.longName
+
+	# the flags set on top of the Maya defaults
+	def flags(self):
+		flags = []
+		if self.output:
+			flags.extend( [ "readOnly", "notStorable" ] )
+		if self.keyable:
+			flags.append( "keyable" )
+		for name in ( "array", "usesArrayDataBuilder", "deleteOnDisconnect", "usedAsFilename" ):
+			if getattr( self, name ):
+				flags.append( name )
+		if self.minimum is not None:
+			flags.append( "min=%s" % self.minimum )
+		return flags
+
+# an input attribute, keyable unless keyable is False
+def inputAttribute(member, kind, longName, shortName, default=None, keyable=True, **options):
+	return rtAttribute( member, kind, longName, shortName, default, keyable=keyable, **options )
+
+# an output attribute, neither writable nor storable
+def outputAttribute(member, kind, longName, shortName, default=None, **options):
+	return rtAttribute( member, kind, longName, shortName, default, output=True, **options )
+
+
+# the attributes and dependencies of a node type, affects is a list of
+# ( inputs, outputs ) members where every input affects every output
+class rtNodeSpec(object):
+
+	def __init__(self, typeName, typeId, attributes, affects, classification="utility/general"):
+		self.typeName = typeName
+		self.typeId = typeId
+		self.classification = classification
+		self.attributes = tuple( attributes )
+		self.affectsGroups = tuple( affects )
+
+		# the pairs are expanded once here, without repeats and in table order
+		self.affects = []
+		seen = set()
+		for inputs, outputs in self.affectsGroups:
+			for output in outputs:
+				for attribute in inputs:
+					if ( attribute, output ) not in seen:
+						seen.add( ( attribute, output ) )
+						self.affects.append( ( attribute, output ) )
+
+	def __repr__(self):
+		return "<rtNodeSpec %s>" % self.typeName
+
+	# every attribute with the children before their parents, the order they are created in
+	def allAttributes(self):
+		found = []
+		def visit(attribute):
+			for child in attribute.children:
+				visit( child )
+			found.append( attribute )
+		for attribute in self.attributes:
+			visit( attribute )
+		return found
+
+	def attribute(self, member):
+		for attribute in self.allAttributes():
+			if attribute.member == member:
+				return attribute
+		return None
+
+
+# -----------------------------------------------------------------------------------
+# the node tables
+# -----------------------------------------------------------------------------------
+
+def rotateOrderAttribute():
+	return inputAttribute( "eulRotateOrder", kEnum, "eulerRotateOrder", "ero", rtMatrixKernel.kXYZ, keyable=False,
+				fields=kRotateOrderFields )
+
+# transformationMatrix: the rotation of the orthogonalized rows like MTransformationMatrix
+# polar: the rotation of the polar decomposition, closest to a sheared matrix, with
+# the scale and shear of its symmetric stretch
+def decompositionModeAttribute():
+	return inputAttribute( "decompositionMode", kEnum, "decompositionMode", "dcm", rtMatrixKernel.kDecomposeTransformationMatrix,
+				keyable=False, fields=( ( "transformationMatrix", rtMatrixKernel.kDecomposeTransformationMatrix ),
+							( "polar", rtMatrixKernel.kDecomposePolar ) ) )
+
+def offsetAttributes():
+	return [ inputAttribute( "offset_t", kPoint, "offsetTranslate", "oft" ),
+		inputAttribute( "offset_r", kPoint, "offsetRotate", "ofr" ),
+		inputAttribute( "offset_s", kPoint, "offsetScale", "ofs" ) ]
+
+# a numeric compound of XY, XZ and YZ floats named like the shear of a transform
+def shearAttribute(member, longName, shortName, output):
+	create = outputAttribute if output else inputAttribute
+	children = [ create( "%s%s" % ( member, axes ), kFloat, longName + axes, shortName + axes.lower(), 0.0 )
+			for axes in ( "XY", "XZ", "YZ" ) ]
+	return create( member, kNumericCompound, longName, shortName, children=children )
+
+# rt4x4MatrixToTRS, the 16 floats in00 to in33 or inputMatrix decomposed to translate,
+# rotate, scale and shear
+matrixInChildren = [ inputAttribute( "in%d%d" % ( row, column ), kFloat, "in%d%d" % ( row, column ), "i%d%d" % ( row, column ),
+			1.0 if row == 3 and column == 3 else 0.0 ) for row in range(4) for column in range(4) ]
+
+quaternionChildren = [ outputAttribute( "out_quat" + axis, kDouble, "outputQuaternion" + axis, "oq" + axis.lower(), default )
+			for axis, default in ( ( "X", 0.0 ), ( "Y", 0.0 ), ( "Z", 0.0 ), ( "W", 1.0 ) ) ]
+
+# the translation only reads the last row of the matrix and the rotation, scale and
+# shear the first three, so setting one channel dirties only the outputs it reaches,
+# matrixIn itself affects nothing so a change of one child does not dirty them all
+translateInputs = ( "inputMatrix", "in30", "in31", "in32", "in33", "parentInverseMatrix" )
+rotateRowInputs = ( "inputMatrix", ) + tuple( [ "in%d%d" % ( row, column ) for row in range(3) for column in range(4) ] ) + \
+		( "normalize", "parentInverseMatrix" )
+rotateInputs = rotateRowInputs + ( "decompositionMode", )
+
+matrixToTRS = rtNodeSpec( "rt4x4MatrixToTRS", 0x87105, [
+		inputAttribute( "normalize", kBoolean, "normalize", "n", False ),
+		rotateOrderAttribute(),
+		decompositionModeAttribute(),
+		inputAttribute( "parentInverseMatrix", kMatrix, "parentInverseMatrix", "pim" ),
+		# a double matrix input used instead of matrixIn when it is connected
+		inputAttribute( "inputMatrix", kMatrix, "inputMatrix", "imat", keyable=False ),
+		inputAttribute( "matrixIn", kCompound, "matrixIn", "mi", keyable=False, children=matrixInChildren, childrenMember="matrixInChildren" ),
+		] + offsetAttributes() + [
+		# Off: always decompose, Node: a cache per node, Shared: one cache for all nodes
+		inputAttribute( "cacheMode", kEnum, "cacheMode", "cm", rtMatrixCache.kCacheOff, keyable=False,
+				fields=( ( "Off", rtMatrixCache.kCacheOff ), ( "Node", rtMatrixCache.kCacheNode ), ( "Shared", rtMatrixCache.kCacheShared ) ) ),
+		inputAttribute( "cacheSize", kInt, "cacheSize", "csz", rtMatrixCache.kDefaultNodeCacheSize, keyable=False, minimum=1 ),
+		outputAttribute( "out_t", kPoint, "outputTranslate", "ot" ),
+		outputAttribute( "out_r", kPoint, "outputRotate", "or" ),
+		outputAttribute( "out_s", kPoint, "outputScale", "os" ),
+		shearAttribute( "out_sh", "outputShear", "osh", output=True ),
+		# the matrix times parentInverseMatrix with the offsets applied on top, and as a
+		# world matrix, that matrix under the parent of parentInverseMatrix
+		outputAttribute( "out_matrix", kMatrix, "outputMatrix", "omat" ),
+		outputAttribute( "out_worldMatrix", kMatrix, "outputWorldMatrix", "owm" ),
+		# the rotation with its offset as a quaternion
+		outputAttribute( "out_quat", kCompound, "outputQuaternion", "oq", children=quaternionChildren, childrenMember="out_quatChildren" ),
+	], [
+		( translateInputs + ( "offset_t", ), ( "out_t", ) ),
+		( rotateInputs + ( "eulRotateOrder", "offset_r" ), ( "out_r", ) ),
+		( rotateInputs + ( "offset_s", ), ( "out_s", ) ),
+		( rotateInputs, ( "out_sh", ) ),
+		# the matrix outputs are the matrix itself, not a decomposition of it, with the
+		# offsets on top, the quaternion is the rotation, the rotate order reaches them
+		# through offsetRotate
+		( translateInputs + rotateRowInputs + ( "eulRotateOrder", "offset_t", "offset_r", "offset_s" ), ( "out_matrix", "out_worldMatrix" ) ),
+		( rotateInputs + ( "eulRotateOrder", "offset_r" ), ( "out_quat", ) ),
+	] )
+
+# rt4x4MatrixArrayToTRS, every matrix of the inputMatrix multi attribute decomposed
+matrixArrayToTRS = rtNodeSpec( "rt4x4MatrixArrayToTRS", 0x87106, [
+		inputAttribute( "normalize", kBoolean, "normalize", "n", False ),
+		rotateOrderAttribute(),
+		decompositionModeAttribute(),
+		inputAttribute( "parentInverseMatrix", kMatrix, "parentInverseMatrix", "pim" ),
+		inputAttribute( "inputMatrix", kMatrix, "inputMatrix", "imat", keyable=False, array=True, deleteOnDisconnect=True ),
+		# the logical index of the parent of every inputMatrix, -1 for a root, when it
+		# is set the inputs are local matrices and the outputs are of the world matrices,
+		# solved in a few batched products over the whole hierarchy. The joints can be
+		# connected in any order, a parent that is not connected is an error
+		inputAttribute( "parentIndex", kIntArray, "parentIndex", "pix", keyable=False ),
+		outputAttribute( "out_t", kVectorArray, "outputTranslate", "ot" ),
+		outputAttribute( "out_r", kVectorArray, "outputRotate", "or" ),
+		outputAttribute( "out_s", kVectorArray, "outputScale", "os" ),
+		# position, rotation, scale and id per input matrix for the inputPoints of an instancer.
+		# The id is the logical index, so an instance keeps it when other matrices are
+		# disconnected, and the rotation is in degrees in eulerRotateOrder. It is computed
+		# on its own, a node that only drives an instancer never builds the vector arrays
+		outputAttribute( "out_points", kArrayAttrs, "outputPoints", "opts" ),
+	], [
+		( ( "inputMatrix", "parentIndex", "normalize", "parentInverseMatrix" ), ( "out_t", "out_r", "out_s", "out_points" ) ),
+		( ( "decompositionMode", ), ( "out_r", "out_s", "out_points" ) ),
+		( ( "eulRotateOrder", ), ( "out_r", "out_points" ) ),
+	] )
+
+# rt4x4TRSToMatrix, translate, rotate, scale and shear composed to a matrix
+composeInputs = ( "in_t", "in_r", "in_s", "in_sh", "offset_t", "offset_r", "offset_s", "eulRotateOrder", "parentMatrix" )
+
+trsToMatrix = rtNodeSpec( "rt4x4TRSToMatrix", 0x87107, [
+		inputAttribute( "in_t", kPoint, "inputTranslate", "it" ),
+		inputAttribute( "in_r", kPoint, "inputRotate", "ir" ),
+		inputAttribute( "in_s", kPoint, "inputScale", "is", ( 1.0, 1.0, 1.0 ) ),
+		shearAttribute( "in_sh", "inputShear", "ish", output=False ),
+		] + offsetAttributes() + [
+		rotateOrderAttribute(),
+		# the matrix is multiplied by the parentMatrix, identity by default
+		inputAttribute( "parentMatrix", kMatrix, "parentMatrix", "pm" ),
+		outputAttribute( "out_matrix", kMatrix, "outputMatrix", "omat" ),
+		# the 16 floats of the matrix, laid out like matrixIn on rt4x4MatrixToTRS
+		outputAttribute( "matrixOut", kCompound, "matrixOut", "mo", childrenMember="matrixOutChildren",
+				children=[ outputAttribute( "out%d%d" % ( row, column ), kFloat, "out%d%d" % ( row, column ), "o%d%d" % ( row, column ),
+							1.0 if row == column else 0.0 ) for row in range(4) for column in range(4) ] ),
+	], [
+		( composeInputs, ( "out_matrix", "matrixOut" ) ),
+	] )
+
+# rt4x4TRSArrayToMatrix, the vector arrays of rt4x4MatrixArrayToTRS composed to matrices
+trsArrayToMatrix = rtNodeSpec( "rt4x4TRSArrayToMatrix", 0x87108, [
+		inputAttribute( "in_t", kVectorArray, "inputTranslate", "it", keyable=False ),
+		inputAttribute( "in_r", kVectorArray, "inputRotate", "ir", keyable=False ),
+		inputAttribute( "in_s", kVectorArray, "inputScale", "is", keyable=False ),
+		inputAttribute( "in_sh", kVectorArray, "inputShear", "ish", keyable=False ),
+		rotateOrderAttribute(),
+		inputAttribute( "parentMatrix", kMatrix, "parentMatrix", "pm" ),
+		outputAttribute( "out_matrix", kMatrix, "outputMatrix", "omat", array=True, usesArrayDataBuilder=True ),
+	], [
+		( ( "in_t", "in_r", "in_s", "in_sh", "eulRotateOrder", "parentMatrix" ), ( "out_matrix", ) ),
+	] )
+
+# rt4x4TRSCacheReader, one node of a rtTRSCache file played back, connect
+# time1.outTime to time
+trsCacheReader = rtNodeSpec( "rt4x4TRSCacheReader", 0x87109, [
+		inputAttribute( "cacheFile", kString, "cacheFile", "cf", keyable=False, usedAsFilename=True ),
+		inputAttribute( "cacheNode", kString, "cacheNode", "cn", keyable=False ),
+		inputAttribute( "time", kTime, "time", "tm", 0.0 ),
+		outputAttribute( "out_t", kPoint, "outputTranslate", "ot" ),
+		outputAttribute( "out_r", kPoint, "outputRotate", "or" ),
+		outputAttribute( "out_s", kPoint, "outputScale", "os" ),
+	], [
+		( ( "cacheFile", "cacheNode", "time" ), ( "out_t", "out_r", "out_s" ) ),
+	] )
+
+kNodeSpecs = ( matrixToTRS, matrixArrayToTRS, trsToMatrix, trsArrayToMatrix, trsCacheReader )
+
+
+# -----------------------------------------------------------------------------------
+# creating the attributes
+# -----------------------------------------------------------------------------------
+#
+# Both plugins create their attributes here, OpenMaya is the maya.OpenMaya or the
+# maya.api.OpenMaya module of the plugin. API 1.0 sets the flags of an attribute
+# with setter calls and API 2.0 with properties of the same name.
+
+# the function sets and data types of one OpenMaya module
+class rtAttributeFactory(object):
+
+	def __init__(self, OpenMaya):
+		self.OpenMaya = OpenMaya
+		self.newAPI = OpenMaya.__name__.startswith( "maya.api." )
+		self.functionSets = ( OpenMaya.MFnNumericAttribute(), OpenMaya.MFnEnumAttribute(), OpenMaya.MFnMatrixAttribute(),
+				OpenMaya.MFnCompoundAttribute(), OpenMaya.MFnTypedAttribute(), OpenMaya.MFnUnitAttribute() )
+		self.numericTypes = { kFloat: OpenMaya.MFnNumericData.kFloat, kDouble: OpenMaya.MFnNumericData.kDouble,
+				kBoolean: OpenMaya.MFnNumericData.kBoolean, kInt: OpenMaya.MFnNumericData.kInt }
+		self.dataTypes = { kString: OpenMaya.MFnData.kString, kVectorArray: OpenMaya.MFnData.kVectorArray,
+				kIntArray: OpenMaya.MFnData.kIntArray, kArrayAttrs: OpenMaya.MFnData.kDynArrayAttrs }
+
+	# set a flag like writable on the attribute of a function set
+	def setFlag(self, fnAttr, name, value):
+		if self.newAPI:
+			setattr( fnAttr, name, value )
+		else:
+			getattr( fnAttr, "set" + name[0].upper() + name[1:] )( value )
+
+	# create an attribute of a node table and its children and store them on
+	# nodeClass, only the flags that differ from the Maya defaults are set
+	def create(self, nodeClass, spec):
+
+		OpenMaya = self.OpenMaya
+		nAttr, eAttr, nMAttr, cAttr, tAttr, uAttr = self.functionSets
+		children = [ self.create( nodeClass, child ) for child in spec.children ]
+
+		kind = spec.kind
+		if kind in self.numericTypes:
+			fnAttr = nAttr
+			attribute = nAttr.create( spec.longName, spec.shortName, self.numericTypes[kind], spec.default )
+		elif kind == kPoint:
+			fnAttr = nAttr
+			attribute = nAttr.createPoint( spec.longName, spec.shortName )
+			if spec.default is not None:
+				if self.newAPI:
+					nAttr.default = spec.default
+				else:
+					nAttr.setDefault( *spec.default )
+		elif kind == kNumericCompound:
+			fnAttr = nAttr
+			attribute = nAttr.create( spec.longName, spec.shortName, *children )
+		elif kind == kCompound:
+			fnAttr = cAttr
+			attribute = cAttr.create( spec.longName, spec.shortName )
+			for child in children:
+				cAttr.addChild( child )
+		elif kind == kMatrix:
+			fnAttr = nMAttr
+			attribute = nMAttr.create( spec.longName, spec.shortName, OpenMaya.MFnMatrixAttribute.kDouble )
+		elif kind == kEnum:
+			fnAttr = eAttr
+			attribute = eAttr.create( spec.longName, spec.shortName, spec.default )
+			for name, value in spec.fields:
+				eAttr.addField( name, value )
+		elif kind in self.dataTypes:
+			fnAttr = tAttr
+			attribute = tAttr.create( spec.longName, spec.shortName, self.dataTypes[kind] )
+		elif kind == kTime:
+			fnAttr = uAttr
+			attribute = uAttr.create( spec.longName, spec.shortName, OpenMaya.MFnUnitAttribute.kTime, spec.default )
+		else:
+			raise ValueError( "%s: unknown attribute kind %s" % ( spec.longName, kind ) )
+
+		if spec.output:
+			self.setFlag( fnAttr, "writable", False )
+			self.setFlag( fnAttr, "storable", False )
+		if spec.keyable:
+			self.setFlag( fnAttr, "keyable", True )
+		if spec.minimum is not None:
+			fnAttr.setMin( spec.minimum )
+		if spec.array:
+			self.setFlag( fnAttr, "array", True )
+		if spec.usesArrayDataBuilder:
+			self.setFlag( fnAttr, "usesArrayDataBuilder", True )
+		if spec.deleteOnDisconnect:
+			self.setFlag( fnAttr, "disconnectBehavior", OpenMaya.MFnAttribute.kDelete )
+		if spec.usedAsFilename:
+			self.setFlag( fnAttr, "usedAsFilename", True )
+
+		setattr( nodeClass, spec.member, attribute )
+		if spec.childrenMember:
+			setattr( nodeClass, spec.childrenMember, tuple( children ) )
+		return attribute
+
+# create, add and set up the dependencies of the attributes of a node table with
+# the OpenMaya module of the plugin
+def createAttributes(nodeClass, spec, OpenMaya):
+
+	factory = rtAttributeFactory( OpenMaya )
+	for attribute in spec.attributes:
+		nodeClass.addAttribute( factory.create( nodeClass, attribute ) )
+	for attribute, output in spec.affects:
+		nodeClass.attributeAffects( getattr( nodeClass, attribute ), getattr( nodeClass, output ) )
+
+
+# -----------------------------------------------------------------------------------
+# the rt4x4MatrixToTRS compute
+# -----------------------------------------------------------------------------------
+#
+# The API 1.0 and API 2.0 rt4x4MatrixToTRS nodes both derive from rtMatrixToTRSCompute
+# and share its compute. Each plugin only adds the calls that differ between the two
+# APIs:
+#   isPending( dataBlock, attribute )    True if a dirty output is going to be computed
+#   isConnected( attribute )             True if the plug of an input or one of its
+#                                        children is connected
+#   inputValue( dataBlock, attribute )   the input MDataHandle
+#   inputFloats( dataBlock, attributes ) the values of float inputs
+#   matrixToList( matrix )               the rows of an MMatrix
+#   setOutput( dataBlock, attribute, value, offset=None )
+#   setMatrix( dataBlock, attribute, rows )
+#   decomposeMatrix( rows, mode, rotateOrder, needRotation )
+#                                        the scale, rotation and shear of the first
+#                                        three rows with MTransformationMatrix
+# unchangedOutputs() also reads the data block of the node through MPxNode.forceCache().
+# The attributes are the class variables created from the matrixToTRS table.
+
+# a double rounded to the float of a float output
+def _float32(value):
+	return struct.unpack( "f", struct.pack( "f", value ) )[0]
+
+# takes the place of the plugin in computeOutputs() to collect the values it would
+# write as ( attribute, values ) pairs, rounded the way the outputs store them
+class rtOutputRecorder(object):
+
+	def __init__(self, quaternion):
+		self.quaternion = quaternion
+		self.values = []
+
+	def setOutput(self, dataBlock, attribute, value, offset=None):
+		if offset is not None:
+			value = [ _float32( component ) + offsetComponent for component, offsetComponent in
+					zip( value, ( offset.x, offset.y, offset.z ) ) ]
+		self.values.append( ( attribute, [ _float32( component ) for component in value ] ) )
+
+	def setMatrix(self, dataBlock, attribute, rows):
+		self.values.append( ( attribute, [ list( row ) for row in rows ] ) )
+
+	def setQuaternion(self, dataBlock, quat):
+		self.values.append( ( self.quaternion, list( quat ) ) )
+
+
+class rtMatrixToTRSCompute(object):
+
+	# the outputs in the order of the compute flags of computeOutputs()
+	def outputAttributes(self):
+		return ( self.out_t, self.out_r, self.out_s, self.out_sh, self.out_matrix, self.out_worldMatrix, self.out_quat )
+
+	# compute the output plug, with its children already taken to the compound, and
+	# the other outputs that are pending. Returns False for a plug that is not an
+	# output so the plugin can hand it back to Maya
+	def computePlug(self, plug, dataBlock):
+
+		# only the requested output is computed
+		outputs = [ plug == attribute for attribute in self.outputAttributes() ]
+		if not any( outputs ):
+			return False
+
+		# other outputs that are dirty and connected will be asked for next,
+		# compute them in this pass so they share the work
+		computeT, computeR, computeS, computeSh, computeM, computeW, computeQ = outputs
+		computeT = computeT or self.isPending( dataBlock, self.out_t )
+		computeR = computeR or self.isPending( dataBlock, self.out_r )
+		computeS = computeS or self.isPending( dataBlock, self.out_s )
+		computeSh = computeSh or self.isPending( dataBlock, self.out_sh )
+		computeM = computeM or self.isPending( dataBlock, self.out_matrix )
+		computeW = computeW or self.isPending( dataBlock, self.out_worldMatrix )
+		computeQ = computeQ or self.isPending( dataBlock, self.out_quat )
+		outputs = ( computeT, computeR, computeS, computeSh, computeM, computeW, computeQ )
+
+		rtMatrixStats.measure( self.stats, self.computeOutputs, dataBlock, outputs )
+		return True
+
+	# compute the requested outputs, outputs are the compute flags of outputTranslate,
+	# outputRotate, outputScale, outputShear, outputMatrix, outputWorldMatrix and
+	# outputQuaternion, stats is the node rtNodeStats while rtMatrixStats is enabled
+	# and None otherwise. The values go to the setOutput(), setMatrix() and
+	# setQuaternion() of writer, the node itself by default
+	def computeOutputs(self, dataBlock, outputs, stats, writer=None):
+
+		computeT, computeR, computeS, computeSh, computeM, computeW, computeQ = outputs
+		writer = writer or self
+
+		# the matrix outputs are the matrix itself with the offsets on top, they read both
+		# parts of it but need no decomposition, the quaternion comes from the rotation
+		needMatrix = computeM or computeW
+		needT = computeT or needMatrix
+		needR = computeR or computeQ
+		needRows = needR or computeS or computeSh or needMatrix
+
+		pInvMatrix = self.inputValue( dataBlock, self.parentInverseMatrix ).asMatrix()
+		pInvMatrix_value = self.matrixToList( pInvMatrix )
+
+		# a connected inputMatrix is read with one handle and no float conversion,
+		# otherwise the matrix comes from the 16 matrixIn floats
+		matrixRows = None
+		if self.isConnected( self.inputMatrix ):
+			matrixRows = self.matrixToList( self.inputValue( dataBlock, self.inputMatrix ).asMatrix() )
+
+		# the translation only depends on the last row of the matrix
+		if needT:
+			if matrixRows is None:
+				translateRow = self.inputFloats( dataBlock, self.translateRow )
+			else:
+				translateRow = matrixRows[3]
+			offset_t_value = self.inputValue( dataBlock, self.offset_t ).asFloatVector()
+			if stats is not None:
+				stats.lap( rtMatrixStats.kInputReads )
+
+			trans = rtMatrixKernel.multRow( translateRow, pInvMatrix_value )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kMatrixBuild )
+
+			if computeT:
+				writer.setOutput( dataBlock, self.out_t, trans, offset_t_value )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kOutputWrites )
+
+		# the first three rows, decomposed or put back together with the translation
+		if needRows:
+			if matrixRows is None:
+				rotateRows = self.inputFloats( dataBlock, self.rotateRows )
+			else:
+				rotateRows = matrixRows[0] + matrixRows[1] + matrixRows[2]
+			normalize_value = self.inputValue( dataBlock, self.normalize ).asBool()
+			# Note there is a Maya Python bug with enum attributes
+			# you must use MDataHandle.asShort() to get the proper value
+			rotOrder_value = self.inputValue( dataBlock, self.eulRotateOrder ).asShort()
+			if needR or needMatrix:
+				offset_r_value = self.inputValue( dataBlock, self.offset_r ).asFloatVector()
+			if computeS or needMatrix:
+				offset_s_value = self.inputValue( dataBlock, self.offset_s ).asFloatVector()
+			if stats is not None:
+				stats.lap( rtMatrixStats.kInputReads )
+
+		# rotation, scale and shear share the decomposition of the first three rows
+		if needR or computeS or computeSh:
+			mode_value = self.inputValue( dataBlock, self.decompositionMode ).asShort()
+			scale, rot, shear = self.decomposeRows( dataBlock, rotateRows, pInvMatrix_value, normalize_value, rotOrder_value,
+								mode_value, needR, stats )
+
+			if computeR:
+				writer.setOutput( dataBlock, self.out_r, rot, offset_r_value )
+			if computeS:
+				writer.setOutput( dataBlock, self.out_s, scale, offset_s_value )
+			if computeSh:
+				writer.setOutput( dataBlock, self.out_sh, shear )
+
+			# the quaternion is the final rotation with its offset
+			if computeQ:
+				angles = [ math.radians( rot[i] + offset_r_value[i] ) for i in range(3) ]
+				writer.setQuaternion( dataBlock, rtMatrixKernel.getQuaternion( rtMatrixKernel.getRotationMatrix( angles, rotOrder_value ) ) )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kOutputWrites )
+
+		# outputMatrix is the matrix times parentInverseMatrix with the offsets applied on
+		# top, outputWorldMatrix puts it back under the parent of parentInverseMatrix
+		if needMatrix:
+			final = rtMatrixKernel.buildMatrix( rotateRows + translateRow, normalize_value )
+			final = [ rtMatrixKernel.multRow( row, pInvMatrix_value ) for row in final[:3] ] + [ trans ]
+			local = rtMatrixKernel.offsetMatrix( final, rotOrder_value, offset_t_value, offset_r_value, offset_s_value )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kMatrixBuild )
+			if computeM:
+				writer.setMatrix( dataBlock, self.out_matrix, local )
+			if computeW:
+				writer.setMatrix( dataBlock, self.out_worldMatrix, rtMatrixKernel.multMatrix( local, self.matrixToList( pInvMatrix.inverse() ) ) )
+			if stats is not None:
+				stats.lap( rtMatrixStats.kOutputWrites )
+
+	# decompose the first three matrix rows into scale, euler rotation in degrees and shear
+	# the rotation is only extracted when needed unless the result goes into a cache
+	# the translation is never cached, it costs less than building the cache key
+	def decomposeRows(self, dataBlock, rotateRows, pInvMatrix_value, normalize_value, rotOrder_value, mode_value, needRotation, stats=None):
+
+		cache = self.getCache( dataBlock )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kInputReads )
+		if cache is not None:
+			key = ( tuple( rotateRows ), tuple( [ tuple( row ) for row in pInvMatrix_value ] ), normalize_value, rotOrder_value, mode_value )
+			result = cache.get( key )
+			if result is not None:
+				if stats is not None:
+					stats.cacheHits += 1
+					stats.lap( rtMatrixStats.kDecomposition )
+				return result
+			if stats is not None:
+				stats.cacheMisses += 1
+			needRotation = True
+
+		matrix = rtMatrixKernel.buildMatrix( rotateRows + [ 0.0, 0.0, 0.0, 1.0 ], normalize_value )
+		matrix = [ rtMatrixKernel.multRow( row, pInvMatrix_value ) for row in matrix[:3] ]
+		if stats is not None:
+			stats.lap( rtMatrixStats.kMatrixBuild )
+		scale, rot, shear = self.decomposeMatrix( matrix, mode_value, rotOrder_value, needRotation )
+
+		if cache is not None:
+			cache.put( key, ( scale, rot, shear ) )
+		if stats is not None:
+			stats.lap( rtMatrixStats.kDecomposition )
+		return scale, rot, shear
+
+	# the scale, euler rotation in degrees or None and shear of the rows of a matrix
+	# with rtMatrixKernel, the plugins use it for the polar mode that Maya does not have
+	def decomposeKernel(self, matrix, mode_value, rotOrder_value, needRotation):
+
+		scale, shear, rotation = rtMatrixKernel.splitMatrix( matrix, mode_value )
+		rot = None
+		if needRotation:
+			rot = [ math.degrees( angle ) for angle in rtMatrixKernel.getEulerRotation( rotation, rotOrder_value ) ]
+		return scale, rot, shear
+
+	# the outputs of attributes, a list of clean outputs that would get dirty, whose
+	# values a change of the inputs leaves as they are. They are computed again from
+	# the data block of the node and compared with the values it holds, which the
+	# setDependentsDirty() of the plugins does for a value that was set on a node
+	# without connected inputs, a setAttr or a change in the Attribute Editor. With a
+	# connected input nothing is computed, reading it would evaluate the nodes upstream
+	# in the middle of dirty propagation and animated inputs change on every frame
+	def unchangedOutputs(self, attributes):
+
+		for spec in matrixToTRS.attributes:
+			if not spec.output and self.isConnected( getattr( self, spec.member ) ):
+				return []
+
+		dataBlock = self.forceCache()
+		clean = [ attribute for attribute in attributes if dataBlock.isClean( attribute ) ]
+		if not clean:
+			return []
+		outputs = [ any( [ attribute == output for attribute in clean ] ) for output in self.outputAttributes() ]
+
+		recorder = rtOutputRecorder( self.out_quat )
+		self.computeOutputs( dataBlock, outputs, None, recorder )
+
+		unchanged = []
+		for attribute, value in recorder.values:
+			if attribute == self.out_matrix or attribute == self.out_worldMatrix:
+				current = self.matrixToList( dataBlock.outputValue( attribute ).asMatrix() )
+			elif attribute == self.out_quat:
+				current = [ dataBlock.outputValue( child ).asDouble() for child in self.out_quatChildren ]
+			else:
+				vector = dataBlock.outputValue( attribute ).asFloatVector()
+				current = [ vector.x, vector.y, vector.z ]
+			if current == value:
+				unchanged.append( attribute )
+		return unchanged
+
+	# the cache picked by the cacheMode attribute or None
+	def getCache(self, dataBlock):
+
+		cacheMode_value = self.inputValue( dataBlock, self.cacheMode ).asShort()
+		if cacheMode_value == rtMatrixCache.kCacheOff:
+			return None
+		if cacheMode_value == rtMatrixCache.kCacheShared:
+			return rtMatrixCache.sharedCache
+
+		cacheSize_value = self.inputValue( dataBlock, self.cacheSize ).asInt()
+		if self.cache.maxSize != cacheSize_value:
+			self.cache.resize( cacheSize_value )
+		return self.cache
+
+	# set the four children of outputQuaternion
+	def setQuaternion(self, dataBlock, quat):
+		for attribute, value in zip( self.out_quatChildren, quat ):
+			outputHandle = dataBlock.outputValue( attribute )
+			outputHandle.setDouble( value )
+			outputHandle.setClean()
+		dataBlock.outputValue( self.out_quat ).setClean()
+
+
+# -----------------------------------------------------------------------------------
+# checking
+# -----------------------------------------------------------------------------------
+
+# the problems of a node table as a list of strings, empty when it is fine
+def check(spec):
+
+	problems = []
+	members = {}
+	names = {}
+	for attribute in spec.allAttributes():
+		if attribute.kind not in kKinds:
+			problems.append( "%s: unknown kind %s" % ( attribute.longName, attribute.kind ) )
+		for table, key in ( ( members, attribute.member ), ( names, attribute.longName ), ( names, attribute.shortName ) ):
+			if key in table:
+				problems.append( "%s: %s is used twice" % ( attribute.longName, key ) )
+			table[key] = attribute
+		if ( attribute.kind in ( kCompound, kNumericCompound ) ) != bool( attribute.children ):
+			problems.append( "%s: only compound attributes have children" % attribute.longName )
+		if attribute.kind == kNumericCompound and len( attribute.children ) not in ( 2, 3 ):
+			problems.append( "%s: a numeric compound has 2 or 3 children" % attribute.longName )
+		if attribute.kind == kEnum and attribute.default not in [ value for name, value in attribute.fields ]:
+			problems.append( "%s: the default is not a field" % attribute.longName )
+		if attribute.output and attribute.keyable:
+			problems.append( "%s: an output can not be keyable" % attribute.longName )
+		for child in attribute.children:
+			if child.output != attribute.output:
+				problems.append( "%s: %s is not an %s like its parent" % ( attribute.longName, child.longName, "output" if attribute.output else "input" ) )
+
+	for attribute, output in spec.affects:
+		for member in ( attribute, output ):
+			if member not in members:
+				problems.append( "affects: no attribute %s" % member )
+		if output in members and not members[output].output:
+			problems.append( "affects: %s is not an output" % output )
+		if attribute in members and members[attribute].output:
+			problems.append( "affects: %s is an output" % attribute )
+
+	affected = set( [ output for attribute, output in spec.affects ] )
+	for attribute in spec.attributes:
+		if attribute.output and attribute.member not in affected:
+			problems.append( "%s: nothing affects it" % attribute.longName )
+	return problems
+
+# the layout of a node as text, one attribute per line and the affects pairs
+def describe(spec):
+
+	lines = [ "%s 0x%x %s" % ( spec.typeName, spec.typeId, spec.classification ) ]
+	def visit(attribute, depth):
+		default = "" if attribute.default is None else " = %r" % ( attribute.default, )
+		flags = attribute.flags()
+		lines.append( "%s%s %s %s%s%s" % ( "  " * depth, attribute.longName, attribute.shortName, attribute.kind, default,
+						" [%s]" % ", ".join( flags ) if flags else "" ) )
+		for child in attribute.children:
+			visit( child, depth + 1 )
+	for attribute in spec.attributes:
+		visit( attribute, 1 )
+
+	lines.append( "  affects:" )
+	for inputs, outputs in spec.affectsGroups:
+		names = []
+		for member in inputs:
+			name = spec.attribute( member ).longName if spec.attribute( member ) else member
+			if name not in names:
+				names.append( name )
+		for output in outputs:
+			attribute = spec.attribute( output )
+			lines.append( "    %s <- %s" % ( attribute.longName if attribute else output, ", ".join( names ) ) )
+	return "\n".join( lines )
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser( description="Print and check the attribute layout of the rt4x4MatrixToTRS plugin nodes." )
+	parser.add_argument( "--node", action="append", dest="nodes", help="a node type to print, all of them by default" )
+	args = parser.parse_args( argv )
+
+	specs = dict( [ ( spec.typeName, spec ) for spec in kNodeSpecs ] )
+	for name in args.nodes or []:
+		if name not in specs:
+			parser.error( "no node type named %s" % name )
+
+	failed = False
+	for spec in kNodeSpecs:
+		if args.nodes and spec.typeName not in args.nodes:
+			continue
+		sys.stdout.write( describe( spec ) + "\n" )
+		for problem in check( spec ):
+			sys.stdout.write( "# Error: %s: %s\n" % ( spec.typeName, problem ) )
+			failed = True
+		sys.stdout.write( "\n" )
+	return 1 if failed else 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,303 @@
+# -----------------------------------------------------------------------------------
+# rtTRSCache
+# Author:  Ryan Trowbridge
+# Contact: admin@rtrowbridge.com
+#
+# A binary cache of baked translate, rotate and scale values that is read through
+# a memory map, so playing it back is a lookup and not a matrix decomposition.
+#
+# The file is little endian:
+#   header      magic "RTTRSCH1", version, flags, node count, frame count as uint32,
+#               first frame and frame step as float64, 40 bytes
+#   frames      one float64 per frame, increasing
+#   node table  per node the float32 index of its block as uint64, the offset and
+#               length of its name in the names as uint32
+#   names       the node names in utf-8
+#   blocks      per node 9 float32 columns of one value per frame, translateX, Y, Z,
+#               rotateX, Y, Z in degrees and scaleX, Y, Z, each block 64 byte aligned
+#
+# Flag kUniformFrames is set when the frames are first frame + index * step, a frame
+# is then found without a search. A file is opened once per process and shared by
+# every reader, the operating system shares its pages between processes.
+#
+# write() renames a new file over the old one. Windows can not replace a file that is
+# memory mapped, so write() first closes the map this process holds on the path with
+# release(), the rt4x4TRSCacheReader nodes open the new file on their next frame. A
+# process that maps the file has to release it before another one writes it again,
+# write() raises an IOError otherwise and the old file is left as it was.
+#
+#   import rtTRSCache
+#   rtTRSCache.write( "shot010.trs", results )
+#   cache = rtTRSCache.openCache( "shot010.trs" )
+#   translate, rotate, scale = cache.sample( cache.nodeIndex( "rt4x4MatrixToTRS1" ), 12.0 )
+#
+# results are ( node, frames, ( translate, rotate, scale ) ) like the ones of
+# rt4x4MatrixToTRS_evaluate.evaluateScene(), every node with the same frames.
+# -----------------------------------------------------------------------------------
+
+import io
+import os
+import sys
+import mmap
+import array
+import struct
+import bisect
+import weakref
+import threading
+
+# numpy is optional and only imported when a cache is written or read as arrays,
+# the cache reader node never needs it
+numpy = None
+_numpyImported = False
+
+def _importNumpy():
+	global numpy, _numpyImported
+	if not _numpyImported:
+		_numpyImported = True
+		try:
+			import numpy as module
+			numpy = module
+		except ImportError:
+			pass
+	return numpy
+
+kMagic = b"RTTRSCH1"
+kVersion = 1
+
+kUniformFrames = 1
+
+kChannels = ( "translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ" )
+
+_header = struct.Struct( "<8sIIIIdd" )
+_nodeEntry = struct.Struct( "<QII" )
+_frame = struct.Struct( "<d" )
+_value = struct.Struct( "<f" )
+
+kBlockAlignment = 64
+
+# the memory map can be read as native floats on little endian machines
+_nativeFloats = sys.byteorder == "little"
+
+
+# -----------------------------------------------------------------------------------
+# writing
+# -----------------------------------------------------------------------------------
+
+def _align(offset, alignment):
+	return ( offset + alignment - 1 ) // alignment * alignment
+
+# the float32 bytes of the 9 columns of a node, values are ( translate, rotate, scale )
+# each with one ( x, y, z ) per frame
+def _columnBytes(values, frameCount):
+	if _importNumpy() is not None:
+		table = numpy.concatenate( [ numpy.asarray( value, dtype=numpy.float64 ).reshape( ( frameCount, 3 ) ) for value in values ], axis=1 )
+		return numpy.ascontiguousarray( table.T, dtype="<f4" ).tobytes()
+	columns = array.array( "f" )
+	for value in values:
+		rows = [ tuple( row ) for row in value ]
+		for axis in range(3):
+			columns.extend( [ row[axis] for row in rows ] )
+	if not _nativeFloats:
+		columns.byteswap()
+	return columns.tobytes() if hasattr( columns, "tobytes" ) else columns.tostring()
+
+# write results to a cache file, the file is written next to path and renamed so
+# readers never see half a file
+def write(path, results):
+
+	if not results:
+		raise ValueError( "%s: no nodes to write" % path )
+	frames = [ float( frame ) for frame in results[0][1] ]
+	if not frames:
+		raise ValueError( "%s: no frames to write" % path )
+	for name, nodeFrames, values in results:
+		if len( nodeFrames ) != len( frames ) or any( [ float( a ) != b for a, b in zip( nodeFrames, frames ) ] ):
+			raise ValueError( "%s: %s does not have the frames of %s" % ( path, name, results[0][0] ) )
+	if any( [ b <= a for a, b in zip( frames, frames[1:] ) ] ):
+		raise ValueError( "%s: the frames do not increase" % path )
+
+	frameCount = len( frames )
+	step = ( frames[-1] - frames[0] ) / ( frameCount - 1 ) if frameCount > 1 else 1.0
+	flags = 0
+	if all( [ abs( frame - ( frames[0] + index * step ) ) <= 1.0e-6 * max( abs( step ), 1.0 ) for index, frame in enumerate( frames ) ] ):
+		flags |= kUniformFrames
+
+	names = [ result[0].encode( "utf-8" ) for result in results ]
+	namesOffset = 0
+	nameOffsets = []
+	for name in names:
+		nameOffsets.append( namesOffset )
+		namesOffset += len( name )
+
+	tableOffset = _header.size + _frame.size * frameCount
+	blockOffset = _align( tableOffset + _nodeEntry.size * len( names ) + namesOffset, kBlockAlignment )
+	blockSize = _align( 4 * len( kChannels ) * frameCount, kBlockAlignment )
+
+	temporary = path + ".tmp"
+	stream = io.open( temporary, "wb" )
+	try:
+		stream.write( _header.pack( kMagic, kVersion, flags, len( names ), frameCount, frames[0], step ) )
+		stream.write( struct.pack( "<%dd" % frameCount, *frames ) )
+		for index, name in enumerate( names ):
+			stream.write( _nodeEntry.pack( ( blockOffset + index * blockSize ) // 4, nameOffsets[index], len( name ) ) )
+		stream.write( b"".join( names ) )
+		stream.write( b"\0" * ( blockOffset - stream.tell() ) )
+		for name, nodeFrames, values in results:
+			data = _columnBytes( values, frameCount )
+			stream.write( data + b"\0" * ( blockSize - len( data ) ) )
+	finally:
+		stream.close()
+
+	release( path )
+	try:
+		_replace( temporary, path )
+	except OSError as error:
+		os.remove( temporary )
+		raise IOError( "%s: can not be replaced, it may be open in another process: %s" % ( path, error ) )
+
+# rename source over target, Python 2 has no os.replace() and its os.rename()
+# does not replace an existing file on Windows
+def _replace(source, target):
+	if hasattr( os, "replace" ):
+		os.replace( source, target )
+		return
+	if os.path.exists( target ):
+		os.remove( target )
+	os.rename( source, target )
+
+
+# -----------------------------------------------------------------------------------
+# reading
+# -----------------------------------------------------------------------------------
+
+class rtTRSCacheFile(object):
+
+	def __init__(self, path):
+
+		self.path = path
+		self.closed = False
+		stream = io.open( path, "rb" )
+		try:
+			self._map = mmap.mmap( stream.fileno(), 0, access=mmap.ACCESS_READ )
+		finally:
+			stream.close()
+
+		if len( self._map ) < _header.size:
+			self._map.close()
+			raise IOError( "%s: not a TRS cache" % path )
+		magic, version, self.flags, nodeCount, self.frameCount, self.start, self.step = _header.unpack_from( self._map, 0 )
+		if magic != kMagic or version != kVersion:
+			self._map.close()
+			raise IOError( "%s: not a version %d TRS cache" % ( path, kVersion ) )
+
+		self.frames = list( struct.unpack_from( "<%dd" % self.frameCount, self._map, _header.size ) )
+
+		tableOffset = _header.size + _frame.size * self.frameCount
+		namesOffset = tableOffset + _nodeEntry.size * nodeCount
+		self.names = []
+		self.blocks = []
+		self._indices = {}
+		for index in range( nodeCount ):
+			block, nameOffset, nameLength = _nodeEntry.unpack_from( self._map, tableOffset + index * _nodeEntry.size )
+			start = namesOffset + nameOffset
+			name = self._map[start:start + nameLength].decode( "utf-8" )
+			self.names.append( name )
+			self.blocks.append( block )
+			self._indices[name] = index
+
+		# every value is a float in this view of the map, no bytes are copied, the
+		# Python 2 of Maya 2020 and older cannot cast a memoryview and unpacks them
+		self._floats = memoryview( self._map ).cast( "f" ) if _nativeFloats and hasattr( memoryview, "cast" ) else None
+
+	# readers check closed before they sample. Arrays of nodeValues() that are still
+	# around keep the map open until they are gone
+	def close(self):
+		self.closed = True
+		if self._floats is not None:
+			self._floats.release()
+			self._floats = None
+		try:
+			self._map.close()
+		except BufferError:
+			pass
+
+	# the index of a node or None
+	def nodeIndex(self, name):
+		return self._indices.get( name )
+
+	# the index of the cached frame closest to frame, frames outside of the cache
+	# give the first or last one
+	def frameIndex(self, frame):
+		if self.flags & kUniformFrames:
+			index = int( round( ( frame - self.start ) / self.step ) ) if self.step else 0
+		else:
+			index = bisect.bisect_left( self.frames, frame )
+			if index > 0 and ( index == self.frameCount or frame - self.frames[index - 1] < self.frames[index] - frame ):
+				index -= 1
+		return min( max( index, 0 ), self.frameCount - 1 )
+
+	# the 9 values of a node at a frame index
+	def values(self, node, index):
+		first = self.blocks[node] + index
+		count = self.frameCount
+		if self._floats is not None:
+			floats = self._floats
+			return [ floats[first + column * count] for column in range( len( kChannels ) ) ]
+		return [ _value.unpack_from( self._map, 4 * ( first + column * count ) )[0] for column in range( len( kChannels ) ) ]
+
+	# translate, rotate and scale of a node at the cached frame closest to frame
+	def sample(self, node, frame):
+		values = self.values( node, self.frameIndex( frame ) )
+		return values[0:3], values[3:6], values[6:9]
+
+	# the values of a node as numpy arrays of shape (F,3) that read the file
+	# directly, returns ( frames, ( translate, rotate, scale ) )
+	def nodeValues(self, name):
+		if _importNumpy() is None:
+			raise ImportError( "rtTRSCache.nodeValues() needs numpy" )
+		index = self._indices[name]
+		columns = numpy.frombuffer( self._map, dtype="<f4", count=len( kChannels ) * self.frameCount, offset=4 * self.blocks[index] )
+		columns = columns.reshape( ( len( kChannels ), self.frameCount ) )
+		return numpy.array( self.frames ), [ columns[axis:axis + 3].T for axis in ( 0, 3, 6 ) ]
+
+
+# path: rtTRSCacheFile, files stay open while a reader holds them
+_files = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+# bumped by refresh() and release(), readers holding a file from an older generation
+# open it again
+generation = 0
+
+# the key of a path in the open files
+def _key(path):
+	return os.path.normcase( os.path.abspath( path ) )
+
+# the shared rtTRSCacheFile of a path
+def openCache(path):
+	key = _key( path )
+	with _lock:
+		cache = _files.get( key )
+		if cache is None:
+			cache = rtTRSCacheFile( key )
+			_files[key] = cache
+		return cache
+
+# close and forget the open file of a path, the next readers map it again
+def release(path):
+	global generation
+	with _lock:
+		cache = _files.pop( _key( path ), None )
+		generation += 1
+	if cache is not None:
+		cache.close()
+
+# close and forget every open file so the next readers see files that were written again
+def refresh():
+	global generation
+	with _lock:
+		caches = list( _files.values() )
+		_files.clear()
+		generation += 1
+	for cache in caches:
+		cache.close()